@@ -4,20 +4,152 @@ BESS Maintenance Optimization Web Service
 Flask API wrapper for the MaintenanceOptimizer model
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, g
 from flask_cors import CORS
-from model import MaintenanceOptimizer
+from model import ENGINES, MaintenanceOptimizer, iter_batch
+from cache import get_cache
+from jobs import QueueFullError, get_job_queue
+from metrics import CONTENT_TYPE, SIZE_BUCKETS, Registry
+from solvers import list_backends
+from datetime import datetime, timedelta, timezone
+import gzip
+import json
+import os
+import time
 import traceback
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 app = Flask(__name__)
 CORS(app)
 
+# Largest number of requests accepted by POST /optimize/batch
+MAX_BATCH_SIZE = int(os.environ.get("OPTIMIZER_MAX_BATCH", 500))
+
+# Request/response schema versions: 1 = slot-keyed dicts, 2 = dense arrays + intervals
+SCHEMA_VERSIONS = (1, 2)
+
+# JSON responses at least this large are gzip-compressed for clients that accept it
+GZIP_MIN_BYTES = 1024
+
+# Solver time budget per request in seconds: requests may ask for less, never more
+# (0 = unlimited). Keeps a hard instance from holding a worker indefinitely.
+MAX_TIME_LIMIT = float(os.environ.get("OPTIMIZER_MAX_TIME_LIMIT", 60))
+
+# Most alternative plans a request may ask for ("alternatives": k)
+MAX_ALTERNATIVES = 20
+
+# Prometheus metrics (GET /metrics)
+METRICS = Registry()
+HTTP_REQUESTS = METRICS.counter(
+    "optimizer_http_requests_total", "HTTP requests by endpoint and status code",
+    ("endpoint", "method", "status"))
+HTTP_LATENCY = METRICS.histogram(
+    "optimizer_http_request_duration_seconds", "Time to produce the response (headers for streams)",
+    ("endpoint", "method"))
+PHASE_LATENCY = METRICS.histogram(
+    "optimizer_phase_duration_seconds",
+    "Time per optimization phase (parse, prepare, build, solve, solver_*, extract, results, serialize)",
+    ("phase", "engine"))
+SOLVES = METRICS.counter(
+    "optimizer_solves_total", "Optimizations by engine, solver backend and status",
+    ("engine", "backend", "status"))
+MODEL_SIZE = METRICS.histogram(
+    "optimizer_model_size", "Model size counters (variables, constraints, nonzeros, dp_table_cells)",
+    ("counter",), buckets=SIZE_BUCKETS)
+SOLVER_NODES = METRICS.histogram(
+    "optimizer_solver_nodes", "Branch-and-bound nodes per MILP solve (when the backend reports them)",
+    ("backend",), buckets=SIZE_BUCKETS)
+SOLVER_GAP = METRICS.histogram(
+    "optimizer_solver_gap", "Relative MIP gap at the end of a solve",
+    ("backend",), buckets=(0.0, 1e-6, 1e-4, 1e-3, 0.01, 0.05, 0.1, 0.5))
+METRICS.gauge(
+    "optimizer_cache_lookups", "Result cache lookups since start, by outcome (disjoint)", ("result",),
+    callback=lambda: {(name,): get_cache().stats()[key] for name, key in (
+        ("memory_hit", "memory_hits"), ("disk_hit", "disk_hits"), ("miss", "misses"))})
+METRICS.gauge(
+    "optimizer_cache_entries", "Entries in the in-memory result cache",
+    callback=lambda: {(): get_cache().stats()["memory_entries"]})
+METRICS.gauge(
+    "optimizer_jobs", "Retained asynchronous jobs by status", ("status",),
+    callback=lambda: {(status,): count for status, count in get_job_queue().stats()["jobs"].items()})
+
+def record_optimizer_metrics(metrics: Optional[Dict], status: str):
+    """Export one optimizer's metrics() (phase timings, model size, solver stats)"""
+    if not metrics:
+        return
+    engine = metrics.get('engine') or 'none'
+    for phase, seconds in metrics.get('timings', {}).items():
+        PHASE_LATENCY.observe(seconds, phase=phase, engine=engine)
+    for counter, value in metrics.get('model', {}).items():
+        MODEL_SIZE.observe(value, counter=counter)
+    solver = metrics.get('solver', {})
+    backend = solver.get('backend', 'none')
+    for phase, seconds in (solver.get('phases') or {}).items():
+        PHASE_LATENCY.observe(seconds, phase=f"solver_{phase}", engine=engine)
+    if solver.get('nodes') is not None:
+        SOLVER_NODES.observe(solver['nodes'], backend=backend)
+    if solver.get('gap') is not None:
+        SOLVER_GAP.observe(solver['gap'], backend=backend)
+    SOLVES.inc(engine=engine, backend=backend, status=solver.get('status', status))
+
+def job_queue():
+    """The process-wide job queue, with its finished jobs exported to /metrics"""
+    queue = get_job_queue()
+    if queue.on_finish is None:
+        queue.on_finish = lambda job: record_optimizer_metrics(job.metrics, job.status)
+    return queue
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    """Count every request and observe its latency (registered first, so it runs last)"""
+    started = g.pop('request_started', None)
+    endpoint = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    HTTP_REQUESTS.inc(endpoint=endpoint, method=request.method, status=response.status_code)
+    if started is not None:
+        HTTP_LATENCY.observe(time.perf_counter() - started, endpoint=endpoint, method=request.method)
+    return response
+
+@app.after_request
+def compress_response(response):
+    """gzip JSON responses when the client sends Accept-Encoding: gzip"""
+    if (response.status_code < 200 or response.status_code >= 300
+            or response.direct_passthrough  # streamed (SSE, NDJSON)
+            or response.mimetype != 'application/json'
+            or 'Content-Encoding' in response.headers
+            or 'gzip' not in request.headers.get('Accept-Encoding', '').lower()):
+        return response
+    body = response.get_data()
+    if len(body) < GZIP_MIN_BYTES:
+        return response
+    response.set_data(gzip.compress(body, compresslevel=5))
+    response.headers['Content-Encoding'] = 'gzip'
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
     return jsonify({"status": "healthy", "service": "BESS Optimization API"})
 
+@app.route('/solvers', methods=['GET'])
+def get_solvers():
+    """List registered solver backends and whether they are available"""
+    return jsonify({"solvers": list_backends()})
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Prometheus scrape endpoint"""
+    return Response(METRICS.render(), content_type=CONTENT_TYPE)
+
+@app.route('/cache', methods=['GET'])
+def get_cache_stats():
+    """Result cache hit/miss counters"""
+    return jsonify(get_cache().stats())
+
 @app.route('/optimize', methods=['POST'])
 def optimize_maintenance():
     """
@@ -35,6 +167,26 @@ def optimize_maintenance():
             "1": 0.4,
             ...
         },
+        "maintenance_durations": [2, 1, 3],
+        "engine": "milp",           # optional: "milp" (default), "dp" or "heuristic"
+        "solver": "highs",          # optional: MILP backend, see GET /solvers
+        "time_limit": 10,           # optional: solver seconds (capped by OPTIMIZER_MAX_TIME_LIMIT)
+        "mip_gap": 0.01,            # optional: accept plans within 1% of the bound
+                                    # (for "heuristic": gap above which the MILP runs)
+        "initial_starts": [5, null, 12], # optional: MIP start (start slot per event), or "auto"
+        "alternatives": 3           # optional: also return the 3 cheapest distinct plans
+    }
+    
+    Results carry "solution_status" ("optimal", or "feasible" for the best plan
+    found within the limits), "objective_bound" and "mip_gap".
+    
+    Schema version 2 (opt-in) takes dense arrays and returns interval lists:
+    {
+        "schema_version": 2,
+        "start_ts": "2025-05-27T00:00:00Z",   # optional: timestamp of slot 0
+        "dt": 3600,                           # optional: slot length in seconds
+        "electricity_prices": [0.06, 0.05, ...],
+        "labor_costs": [0.4, 0.4, ...],
         "maintenance_durations": [2, 1, 3]
     }
     """
@@ -43,58 +195,59 @@ def optimize_maintenance():
         if not request.is_json:
             return jsonify({"error": "Request must be JSON"}), 400
         
-        data = request.get_json()
-        
-        # Extract parameters
-        electricity_prices = data.get('electricity_prices', {})
-        labor_costs = data.get('labor_costs', {})
-        maintenance_durations = data.get('maintenance_durations', [1])
-        
-        # Validate required parameters
-        if not electricity_prices:
-            return jsonify({"error": "electricity_prices is required"}), 400
-        
-        if not labor_costs:
-            return jsonify({"error": "labor_costs is required"}), 400
-        
-        # Convert string keys to integers for prices (JSON keys are strings)
-        electricity_prices = {int(k): float(v) for k, v in electricity_prices.items()}
-        labor_costs = {int(k): float(v) for k, v in labor_costs.items()}
-        
-        # Validate that both price dictionaries have the same time slots
-        elec_slots = set(electricity_prices.keys())
-        labor_slots = set(labor_costs.keys())
-        if elec_slots != labor_slots:
-            return jsonify({
-                "error": "electricity_prices and labor_costs must have the same time slots",
-                "electricity_slots": sorted(elec_slots),
-                "labor_slots": sorted(labor_slots)
-            }), 400
+        parse_started = time.perf_counter()
+        params, error = parse_optimization_request(request.get_json())
+        if error is not None:
+            return jsonify(error), 400
+        solver = params['solver']
+        PHASE_LATENCY.observe(time.perf_counter() - parse_started, phase="parse", engine=params['engine'])
         
-        # Create and run optimizer
+        # Create and run optimizer (identical requests are answered from the result cache)
         optimizer = MaintenanceOptimizer(
-            electricity_prices=electricity_prices,
-            labor_costs=labor_costs,
-            maintenance_durations=maintenance_durations
+            electricity_prices=params['electricity_prices'],
+            labor_costs=params['labor_costs'],
+            maintenance_durations=params['maintenance_durations'],
+            engine=params['engine'],
+            cache=True,
+            verbose=False
         )
         
-        optimizer.build_model()
-        success = optimizer.solve(verbose=False)
+        if isinstance(params['initial_starts'], list):
+            optimizer.plan_cost(params['initial_starts'])  # rejects infeasible plans even on cache hits
+        success = optimizer.load_cached(solver)
+        if not success:
+            optimizer.build_model()
+            success = optimizer.solve(solver=solver, time_limit=params['time_limit'], gap=params['mip_gap'],
+                                      initial_starts=params['initial_starts'])
         
         if success:
-            results = optimizer.get_results()
+            results = optimizer.get_results(schedules=params['schema_version'] < 2)
+            if params['alternatives']:
+                results['alternatives'] = optimizer.get_alternatives(params['alternatives'], solver)
+            record_optimizer_metrics(optimizer.metrics(), "success")
             
             # Convert results to JSON-serializable format
-            json_results = format_results_for_json(results)
+            serialize_started = time.perf_counter()
+            json_results = format_results(results, params)
             
-            return jsonify({
+            body = {
                 "status": "success",
+                "cached": optimizer.from_cache,
                 "results": json_results
-            })
+            }
+            if params['schema_version'] >= 2:
+                body = {"schema_version": params['schema_version'], **body}
+            response = jsonify(body)
+            PHASE_LATENCY.observe(time.perf_counter() - serialize_started, phase="serialize",
+                                  engine=optimizer.active_engine)
+            return response
         else:
+            record_optimizer_metrics(optimizer.metrics(), "failed")
             return jsonify({
                 "status": "failed",
-                "error": "Optimization failed to find a solution"
+                "error": "Optimization failed to find a solution",
+                "solver_status": optimizer.solver_stats.get('status'),
+                "time_limit": params['time_limit']
             }), 500
             
     except ValueError as e:
@@ -105,12 +258,348 @@ def optimize_maintenance():
             "traceback": traceback.format_exc()
         }), 500
 
+@app.route('/optimize/batch', methods=['POST'])
+def optimize_batch_endpoint():
+    """
+    Optimize many requests in one call, in parallel on the solver process pool.
+    
+    Payload: {"requests": [<POST /optimize payload>, ...]} (or the bare list).
+    All items are validated before any work starts. The response is NDJSON: one
+    line per item, in completion order, with the item's "index" and either
+    "results" (as in /optimize) or an "error". Invalid or failing items do not
+    affect the others.
+    """
+    if not request.is_json:
+        return jsonify({"error": "Request must be JSON"}), 400
+    
+    data = request.get_json()
+    items = data.get('requests') if isinstance(data, dict) else data
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "requests must be a non-empty list of optimization payloads"}), 400
+    if len(items) > MAX_BATCH_SIZE:
+        return jsonify({"error": f"Batch of {len(items)} requests exceeds the limit of {MAX_BATCH_SIZE}"}), 413
+    
+    # Validate everything up front; only valid items go to the workers
+    valid, invalid = [], []
+    for index, item in enumerate(items):
+        params, error = parse_optimization_request(item)
+        if error is not None:
+            invalid.append(dict(error, index=index, status="failed"))
+        else:
+            valid.append((index, params))
+    
+    def lines():
+        for line in invalid:
+            yield json.dumps(line) + "\n"
+        for position, outcome in iter_batch([params for _, params in valid]):
+            record_optimizer_metrics(outcome.get("metrics"), outcome["status"])
+            line = {"index": valid[position][0], "status": outcome["status"]}
+            if outcome["status"] == "success":
+                line["results"] = format_results(outcome["results"], valid[position][1])
+            else:
+                line["error"] = outcome["error"]
+            yield json.dumps(line) + "\n"
+    
+    return Response(lines(), mimetype='application/x-ndjson',
+                    headers={'X-Batch-Size': str(len(items)), 'X-Accel-Buffering': 'no'})
+
+@app.route('/optimize/sensitivity', methods=['POST'])
+def price_sensitivity_endpoint():
+    """
+    Per-slot price sensitivity of the optimal plan, from one DP pass.
+    
+    Same payload as POST /optimize (engine, solver and limits are ignored).
+    For every slot: "in_plan", and the price "increase" (slots in the plan) or
+    "decrease" (slots outside it) at which the optimal plan changes; null when
+    no move in that direction changes it.
+    """
+    if not request.is_json:
+        return jsonify({"error": "Request must be JSON"}), 400
+    
+    params, error = parse_optimization_request(request.get_json())
+    if error is not None:
+        return jsonify(error), 400
+    
+    try:
+        optimizer = MaintenanceOptimizer(
+            electricity_prices=params['electricity_prices'],
+            labor_costs=params['labor_costs'],
+            maintenance_durations=params['maintenance_durations'],
+            engine="dp",
+            verbose=False
+        )
+        supported, reason = optimizer.dp_supported()
+        if not supported:
+            return jsonify({"error": f"Price sensitivity needs the DP engine: {reason}"}), 413
+        optimizer.build_model()
+        if not optimizer.solve():
+            return jsonify({"status": "failed", "error": "Optimization failed to find a solution"}), 500
+        return jsonify({
+            "status": "success",
+            "total_cost": optimizer.objective_value,
+            "slots": optimizer.price_sensitivity()
+        })
+    except ValueError as e:
+        return jsonify({"error": f"Validation error: {str(e)}"}), 400
+    except Exception as e:
+        return jsonify({
+            "error": f"Internal server error: {str(e)}",
+            "traceback": traceback.format_exc()
+        }), 500
+
+def parse_optimization_request(data: Dict) -> Tuple[Optional[Dict], Optional[Dict]]:
+    """
+    Validate an optimization payload and normalize it into a run_optimization() request.
+    Returns (request, None), or (None, error body) for a 400 response.
+    """
+    if not isinstance(data, dict):
+        return None, {"error": "Request must be a JSON object"}
+    
+    schema_version = data.get('schema_version', 1)
+    if schema_version not in SCHEMA_VERSIONS:
+        return None, {"error": f"Unsupported schema_version {schema_version!r}. "
+                               f"Supported: {', '.join(map(str, SCHEMA_VERSIONS))}"}
+    
+    # Extract parameters
+    electricity_prices = data.get('electricity_prices', {})
+    labor_costs = data.get('labor_costs', {})
+    maintenance_durations = data.get('maintenance_durations', [1])
+    
+    # Validate required parameters
+    if not electricity_prices:
+        return None, {"error": "electricity_prices is required"}
+    
+    if not labor_costs:
+        return None, {"error": "labor_costs is required"}
+    
+    if (not isinstance(maintenance_durations, list) or not maintenance_durations
+            or not all(isinstance(L, int) and not isinstance(L, bool) and L > 0 for L in maintenance_durations)):
+        return None, {"error": "maintenance_durations must be a non-empty list of positive integers (slots)"}
+    
+    params = {'schema_version': schema_version}
+    if schema_version >= 2:
+        # Dense arrays: one price per slot, slot t starts at start_ts + t * dt
+        if not isinstance(electricity_prices, list) or not isinstance(labor_costs, list):
+            return None, {"error": "schema_version 2 expects electricity_prices and labor_costs as arrays"}
+        if len(electricity_prices) != len(labor_costs):
+            return None, {"error": "electricity_prices and labor_costs must have the same length",
+                          "electricity_slots": len(electricity_prices),
+                          "labor_slots": len(labor_costs)}
+        try:
+            electricity_prices = [float(v) for v in electricity_prices]
+            labor_costs = [float(v) for v in labor_costs]
+            dt = float(data.get('dt', 3600))
+            start_ts = data.get('start_ts')
+            if start_ts is not None:
+                datetime.fromisoformat(str(start_ts).replace('Z', '+00:00'))
+        except (TypeError, ValueError) as e:
+            return None, {"error": f"Validation error: {str(e)}"}
+        if dt <= 0:
+            return None, {"error": "dt must be a positive number of seconds"}
+        params.update(start_ts=start_ts, dt=dt)
+    else:
+        # Convert string keys to integers for prices (JSON keys are strings)
+        try:
+            electricity_prices = {int(k): float(v) for k, v in electricity_prices.items()}
+            labor_costs = {int(k): float(v) for k, v in labor_costs.items()}
+        except (AttributeError, TypeError, ValueError) as e:
+            return None, {"error": f"Validation error: {str(e)}"}
+        
+        # Validate that both price dictionaries have the same time slots
+        elec_slots = set(electricity_prices.keys())
+        labor_slots = set(labor_costs.keys())
+        if elec_slots != labor_slots:
+            return None, {
+                "error": "electricity_prices and labor_costs must have the same time slots",
+                "electricity_slots": sorted(elec_slots),
+                "labor_slots": sorted(labor_slots)
+            }
+    
+    engine = data.get('engine', 'milp')
+    if engine not in ENGINES:
+        return None, {"error": f"Validation error: Unknown engine '{engine}'. Choose one of: {', '.join(ENGINES)}"}
+    
+    # Optional solution-quality limits; the best plan found within them is returned
+    try:
+        time_limit = float(data['time_limit']) if data.get('time_limit') is not None else None
+        mip_gap = float(data['mip_gap']) if data.get('mip_gap') is not None else None
+    except (TypeError, ValueError) as e:
+        return None, {"error": f"Validation error: {str(e)}"}
+    if time_limit is not None and time_limit <= 0:
+        return None, {"error": "time_limit must be a positive number of seconds"}
+    if mip_gap is not None and not 0 <= mip_gap < 1:
+        return None, {"error": "mip_gap must be a fraction between 0 and 1"}
+    if MAX_TIME_LIMIT > 0:
+        time_limit = min(time_limit or MAX_TIME_LIMIT, MAX_TIME_LIMIT)
+    
+    alternatives = data.get('alternatives')
+    if alternatives is not None and (not isinstance(alternatives, int) or isinstance(alternatives, bool)
+                                     or not 1 <= alternatives <= MAX_ALTERNATIVES):
+        return None, {"error": f"alternatives must be an integer between 1 and {MAX_ALTERNATIVES}"}
+    
+    # Optional MIP start: "auto" (heuristic plan) or a start slot (or null) per event
+    initial_starts = data.get('initial_starts')
+    if initial_starts is not None and initial_starts != "auto":
+        if (not isinstance(initial_starts, list) or len(initial_starts) != len(maintenance_durations)
+                or not all(t is None or (isinstance(t, int) and not isinstance(t, bool))
+                           for t in initial_starts)):
+            return None, {"error": "initial_starts must be \"auto\" or a start slot (or null) "
+                                   "for each maintenance event"}
+    
+    params.update({
+        'electricity_prices': electricity_prices,
+        'labor_costs': labor_costs,
+        'maintenance_durations': maintenance_durations,
+        'engine': engine,
+        'solver': data.get('solver'),
+        'time_limit': time_limit,
+        'mip_gap': mip_gap,
+        'initial_starts': initial_starts,
+        'alternatives': alternatives,
+    })
+    return params, None
+
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    """
+    Queue an optimization and return immediately with its job id.
+    Same payload as POST /optimize. Poll GET /jobs/<job_id> or follow
+    GET /jobs/<job_id>/events for the outcome.
+    """
+    if not request.is_json:
+        return jsonify({"error": "Request must be JSON"}), 400
+    
+    params, error = parse_optimization_request(request.get_json())
+    if error is not None:
+        return jsonify(error), 400
+    
+    try:
+        job = job_queue().submit(params, meta={
+            key: params.get(key) for key in ('schema_version', 'start_ts', 'dt')})
+    except QueueFullError as e:
+        return jsonify({"error": f"Job queue is full: {str(e)}"}), 503
+    
+    body = job.to_dict()
+    body["status_url"] = f"/jobs/{job.job_id}"
+    body["events_url"] = f"/jobs/{job.job_id}/events"
+    return jsonify(body), 202, {"Location": body["status_url"]}
+
+def format_job(job) -> Dict:
+    """Job status plus, once it succeeded, results in the /optimize format"""
+    body = job.to_dict()
+    if job.results is not None:
+        body["results"] = format_results(job.results, job.meta)
+    return body
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Status of a queued optimization; includes results once it has succeeded"""
+    job = job_queue().get(job_id)
+    if job is None:
+        return jsonify({"error": f"Unknown or expired job '{job_id}'"}), 404
+    return jsonify(format_job(job))
+
+@app.route('/jobs/<job_id>/events', methods=['GET'])
+def stream_job_events(job_id):
+    """
+    Server-sent events for one job: a "status" event on every status change and
+    a final "result" event (same body as GET /jobs/<job_id>) when it finishes
+    """
+    queue = job_queue()
+    if queue.get(job_id) is None:
+        return jsonify({"error": f"Unknown or expired job '{job_id}'"}), 404
+    
+    def events():
+        version = -1
+        while True:
+            job = queue.wait(job_id, version, timeout=15)
+            if job is None:
+                yield "event: error\ndata: {\"error\": \"job expired\"}\n\n"
+                return
+            if job.finished:
+                yield f"event: result\ndata: {json.dumps(format_job(job))}\n\n"
+                return
+            if job.version == version:
+                yield ": keep-alive\n\n"
+                continue
+            version = job.version
+            yield f"event: status\ndata: {json.dumps(job.to_dict())}\n\n"
+    
+    return Response(events(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+def format_results(results: Dict, params: Dict) -> Dict:
+    """Results in the response schema the request asked for"""
+    if params.get('schema_version', 1) >= 2:
+        json_results = format_results_v2(results, params.get('start_ts'), params.get('dt', 3600))
+    else:
+        json_results = format_results_for_json(results)
+    if 'alternatives' in results:
+        json_results['alternatives'] = results['alternatives']
+    return json_results
+
+def format_results_v2(results: Dict, start_ts: Optional[str] = None, dt: float = 3600) -> Dict:
+    """
+    Schema v2 results: each event as a half-open slot interval [start, end) with its
+    costs, and the schedule as the list of busy intervals in time order (no per-slot
+    maps). With start_ts, intervals also carry ISO timestamps (slot t starts at
+    start_ts + t * dt seconds).
+    """
+    origin = None
+    if start_ts is not None:
+        origin = datetime.fromisoformat(str(start_ts).replace('Z', '+00:00'))
+        if origin.tzinfo is None:
+            origin = origin.replace(tzinfo=timezone.utc)
+    
+    def timestamp(slot):
+        ts = (origin + timedelta(seconds=slot * dt)).astimezone(timezone.utc)
+        return ts.isoformat().replace('+00:00', 'Z')
+    
+    events, schedule = [], []
+    for i, event in enumerate(results.get('events', [])):
+        formatted_event = {"event_id": i + 1, "duration": event.get('duration')}
+        if event.get('start_time') is not None:
+            interval = {"start": event['start_time'], "end": event['end_time'] + 1}
+            if origin is not None:
+                interval["start_ts"] = timestamp(interval["start"])
+                interval["end_ts"] = timestamp(interval["end"])
+            formatted_event.update(interval,
+                                   electricity_cost=event.get('electricity_cost', 0),
+                                   labor_cost=event.get('labor_cost', 0),
+                                   cost=event.get('total_cost', 0))
+            schedule.append({"event_id": i + 1, **interval, "cost": formatted_event["cost"]})
+        events.append(formatted_event)
+    schedule.sort(key=lambda interval: interval["start"])
+    
+    json_results = {
+        "total_cost": results.get('total_cost', 0),
+        "total_electricity_cost": results.get('total_electricity_cost', 0),
+        "total_labor_cost": results.get('total_labor_cost', 0),
+        **solution_quality(results),
+        "num_events": len(events),
+        "dt": dt,
+        "events": events,
+        "schedule": schedule,
+    }
+    if start_ts is not None:
+        json_results["start_ts"] = start_ts
+    return json_results
+
+def solution_quality(results: Dict) -> Dict:
+    """Status ('optimal' or 'feasible'), lower bound and relative gap of a plan"""
+    return {
+        "solution_status": results.get('solution_status'),
+        "objective_bound": results.get('objective_bound'),
+        "mip_gap": results.get('mip_gap'),
+    }
+
 def format_results_for_json(results: Dict) -> Dict:
     """Convert optimization results to JSON-serializable format"""
     json_results = {
         "total_cost": results.get('total_cost', 0),
         "total_electricity_cost": results.get('total_electricity_cost', 0),
         "total_labor_cost": results.get('total_labor_cost', 0),
+        **solution_quality(results),
         "num_events": len(results.get('events', [])),
         "events": [],
         "combined_schedule": results.get('combined_schedule', {})
@@ -171,9 +660,21 @@ def get_example_request():
         "maintenance_durations": [2, 1, 3]
     }
     
+    # Same request in the compact schema_version 2 form
+    num_slots = len(example["electricity_prices"])
+    example_v2 = {
+        "schema_version": 2,
+        "start_ts": "2025-05-27T00:00:00Z",
+        "dt": 3600,
+        "electricity_prices": [example["electricity_prices"][str(t)] for t in range(num_slots)],
+        "labor_costs": [example["labor_costs"][str(t)] for t in range(num_slots)],
+        "maintenance_durations": example["maintenance_durations"]
+    }
+    
     return jsonify({
         "description": "Example request payload for POST /optimize",
         "example_request": example,
+        "example_request_v2": example_v2,
         "usage": "Send this JSON payload to POST /optimize to run optimization"
     })
 
@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the MaintenanceOptimizer
+Measures how model construction time scales with the planning horizon,
+how batch throughput scales with worker processes, and (suite) sweeps horizon,
+event count, duration mix and solver backend against a JSON baseline
+
+    python benchmark.py                                   # scaling tables
+    python benchmark.py suite --save-baseline bench.json  # record a baseline
+    python benchmark.py suite --baseline bench.json       # flag regressions (exit 1)
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+from model import MaintenanceOptimizer, optimize_batch, shutdown_batch_pool
+from solvers import available_backends
+
+
+DEFAULT_HORIZONS = [24, 48, 168, 672, 2880, 10000]
+DEFAULT_DURATIONS = [2, 1, 3, 1, 4, 4, 2, 8, 1, 2, 6, 3]  # a dozen events
+
+
+def synthetic_prices(num_slots: int, seed: int = 0) -> Dict[int, float]:
+    """Daily-shaped price series with noise, keyed by slot like the API payloads"""
+    rng = random.Random(seed)
+    prices = {}
+    for t in range(num_slots):
+        hour = t % 24
+        peak = 0.10 if 17 <= hour < 21 else (0.05 if 8 <= hour < 12 else 0.0)
+        prices[t] = round(0.06 + peak + rng.uniform(-0.02, 0.02), 4)
+    return prices
+
+
+def benchmark_build(horizons: List[int] = None, durations: List[int] = None,
+                    repeats: int = 3) -> List[Dict]:
+    """
+    Time build_model() for each horizon length.
+    Returns one row per horizon with the best-of-N build time.
+    """
+    horizons = horizons or DEFAULT_HORIZONS
+    durations = durations or DEFAULT_DURATIONS
+    rows = []
+
+    for num_slots in horizons:
+        elec = synthetic_prices(num_slots, seed=1)
+        labor = synthetic_prices(num_slots, seed=2)
+        best = float('inf')
+        for _ in range(repeats):
+            optimizer = MaintenanceOptimizer(
+                electricity_prices=elec,
+                labor_costs=labor,
+                maintenance_durations=durations,
+                verbose=False
+            )
+            start = time.perf_counter()
+            optimizer.build_model()
+            best = min(best, time.perf_counter() - start)
+
+        size = num_slots * len(durations)
+        rows.append({
+            'slots': num_slots,
+            'events': len(durations),
+            'build_seconds': best,
+            'us_per_event_slot': best / size * 1e6,
+        })
+
+    return rows
+
+
+PROJECTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "docs", "control-room", "data", "static", "projects.json")
+
+
+def portfolio_requests(scenarios: int = 4, num_slots: int = 168,
+                       durations: List[int] = None) -> List[Dict]:
+    """
+    One request per battery per price scenario for the control-room portfolio
+    (projects.json), the workload optimize_batch() is meant to fan out
+    """
+    with open(PROJECTS_FILE) as f:
+        projects = json.load(f)['projects']
+    durations = durations or [2, 1, 3, 4]
+    requests = []
+    for scenario in range(scenarios):
+        elec = synthetic_prices(num_slots, seed=100 + scenario)
+        for site, project in enumerate(projects):
+            labor = synthetic_prices(num_slots, seed=200 + site)
+            for battery in project['batteries']:
+                requests.append({
+                    'electricity_prices': elec,
+                    'labor_costs': labor,
+                    'maintenance_durations': durations,
+                })
+    return requests
+
+
+def benchmark_batch(worker_counts: List[int] = None, scenarios: int = 4) -> List[Dict]:
+    """
+    Time optimize_batch() on the portfolio workload for several pool sizes
+    (workers=0 is the serial baseline)
+    """
+    cores = os.cpu_count() or 1
+    worker_counts = worker_counts or sorted({0, 1, cores})
+    requests = portfolio_requests(scenarios)
+    rows = []
+
+    for workers in worker_counts:
+        if workers:
+            optimize_batch(requests[:workers], workers=workers)  # start the pool outside the timing
+        start = time.perf_counter()
+        results = optimize_batch(requests, workers=workers)
+        elapsed = time.perf_counter() - start
+        rows.append({
+            'workers': workers,
+            'jobs': len(requests),
+            'failed': sum(r['status'] != 'success' for r in results),
+            'seconds': elapsed,
+            'jobs_per_second': len(requests) / elapsed,
+        })
+    shutdown_batch_pool()
+    return rows
+
+
+# Event duration patterns (slots) cycled to the requested event count
+DURATION_MIXES = {
+    'short': [1, 2],
+    'mixed': [2, 1, 3, 1, 4, 4, 2, 8],
+    'long': [6, 8, 12],
+}
+
+# Sweep profiles: "quick" finishes in about a minute, "full" covers 24 -> 10k slots
+# and 1 -> 50 events (hours with the command-line backends)
+PROFILES = {
+    'quick': {'horizons': [24, 168, 672], 'event_counts': [1, 5, 12], 'mixes': ['short', 'mixed']},
+    'full': {'horizons': DEFAULT_HORIZONS, 'event_counts': [1, 5, 12, 25, 50],
+             'mixes': list(DURATION_MIXES)},
+}
+
+# Cases above this many event-slots are built but not solved
+DEFAULT_SOLVE_LIMIT = 200_000
+
+# Figures compared against the baseline (lower is better for all of them)
+GATED_METRICS = ('build_seconds', 'solve_seconds', 'extract_seconds', 'peak_mib')
+
+
+def mix_durations(mix: str, events: int) -> List[int]:
+    """The first `events` durations of a mix, repeating the pattern"""
+    return list(itertools.islice(itertools.cycle(DURATION_MIXES[mix]), events))
+
+
+def case_name(engine: str, solver: Optional[str], slots: int, events: int, mix: str) -> str:
+    """Stable key of a benchmark case, used to match runs against the baseline"""
+    return f"{engine}/{solver or '-'}/slots={slots}/events={events}/mix={mix}"
+
+
+def run_case(engine: str, solver: Optional[str], num_slots: int, events: int, mix: str,
+             repeats: int = 3, solve: bool = True) -> Dict:
+    """
+    Benchmark one configuration.
+    Times are the best of `repeats` runs, taken from optimizer.metrics():
+    build = prepare + build_model, solve = solver call without extraction.
+    Peak memory is measured in one extra run under tracemalloc (Python allocations
+    only, so an external solver process is not included) so that tracing does
+    not slow down the timed runs.
+    """
+    durations = mix_durations(mix, events)
+    row = {
+        'case': case_name(engine, solver, num_slots, events, mix),
+        'engine': engine, 'solver': solver, 'slots': num_slots, 'events': events, 'mix': mix,
+    }
+    if sum(durations) > num_slots:
+        return dict(row, status='skipped', reason='events do not fit in the horizon')
+
+    elec = synthetic_prices(num_slots, seed=1)
+    labor = synthetic_prices(num_slots, seed=2)
+
+    def run_once():
+        optimizer = MaintenanceOptimizer(elec, labor, durations, engine=engine, verbose=False)
+        optimizer.build_model()
+        if solve:
+            optimizer.solve(solver=solver)
+        return optimizer
+
+    best = {}
+    for _ in range(repeats):
+        optimizer = run_once()
+        timings = optimizer.timings
+        figures = {
+            'build_seconds': timings.get('prepare', 0.0) + timings.get('build', 0.0),
+            'solve_seconds': timings['solve'] - timings.get('extract', 0.0) if 'solve' in timings else None,
+            'extract_seconds': timings.get('extract'),
+        }
+        for key, value in figures.items():
+            if value is not None:
+                best[key] = min(best.get(key, value), value)
+
+    tracemalloc.start()
+    try:
+        run_once()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    metrics = optimizer.metrics()
+    row.update(best)
+    row.update({
+        'peak_mib': peak / 2 ** 20,
+        'active_engine': metrics['engine'],
+        'status': metrics['solver'].get('status', 'built') if solve else 'built',
+        'objective': optimizer.objective_value,
+        **metrics['model'],
+    })
+    if metrics['solver'].get('nodes') is not None:
+        row['nodes'] = metrics['solver']['nodes']
+    return row
+
+
+def benchmark_suite(horizons: List[int] = None, event_counts: List[int] = None,
+                    mixes: List[str] = None, solvers: List[str] = None, include_dp: bool = True,
+                    repeats: int = 3, solve_limit: int = DEFAULT_SOLVE_LIMIT,
+                    progress=None) -> List[Dict]:
+    """
+    Sweep horizon x event count x duration mix x solver backend (plus the DP engine).
+    solvers=None uses every backend available in this process.
+    progress(row) is called after each case, e.g. to print it.
+    """
+    profile = PROFILES['quick']
+    horizons = horizons or profile['horizons']
+    event_counts = event_counts or profile['event_counts']
+    mixes = mixes or profile['mixes']
+    configs = [('milp', solver) for solver in (solvers or available_backends())]
+    if include_dp:
+        configs.append(('dp', None))
+
+    rows = []
+    for (engine, solver), num_slots, events, mix in itertools.product(configs, horizons, event_counts, mixes):
+        row = run_case(engine, solver, num_slots, events, mix, repeats=repeats,
+                       solve=num_slots * events <= solve_limit)
+        rows.append(row)
+        if progress is not None:
+            progress(row)
+    return rows
+
+
+def save_baseline(rows: List[Dict], path: str):
+    """Write suite results as a JSON baseline (with the machine it was taken on)"""
+    baseline = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'cases': {row['case']: row for row in rows},
+    }
+    with open(path, 'w') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+
+
+def load_baseline(path: str) -> Dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare_to_baseline(rows: List[Dict], baseline: Dict, tolerance: float = 0.25,
+                        min_seconds: float = 0.005, min_mib: float = 1.0) -> List[Dict]:
+    """
+    Regressions of this run against a baseline: a gated figure more than
+    `tolerance` (relative) worse than the baseline value. Differences below
+    min_seconds / min_mib are treated as noise. A case that solved in the
+    baseline but not now is a regression too.
+    """
+    regressions = []
+    for row in rows:
+        old = baseline['cases'].get(row['case'])
+        if old is None or row['status'] == 'skipped':
+            continue
+        if old.get('status') == 'Optimal' and row['status'] != 'Optimal':
+            regressions.append({'case': row['case'], 'metric': 'status',
+                                'baseline': old['status'], 'current': row['status']})
+            continue
+        for metric in GATED_METRICS:
+            before, after = old.get(metric), row.get(metric)
+            if before is None or after is None:
+                continue
+            floor = min_mib if metric == 'peak_mib' else min_seconds
+            if after > before * (1 + tolerance) and after - before > floor:
+                regressions.append({'case': row['case'], 'metric': metric, 'baseline': before,
+                                    'current': after, 'ratio': after / before if before else float('inf')})
+    return regressions
+
+
+def print_suite_row(row: Dict):
+    if row['status'] == 'skipped':
+        print(f"{row['case']:<48} skipped ({row['reason']})")
+        return
+    solve = row.get('solve_seconds')
+    print(f"{row['case']:<48} {row.get('build_seconds', 0):>9.4f} "
+          f"{solve if solve is not None else float('nan'):>9.4f} "
+          f"{row.get('extract_seconds') or 0:>9.4f} {row['peak_mib']:>9.1f}  {row['status']}")
+
+
+def run_suite(args) -> int:
+    profile = PROFILES[args.profile]
+    print(f"Benchmark suite ({args.profile} profile)")
+    print("=" * 100)
+    print(f"{'case':<48} {'build (s)':>9} {'solve (s)':>9} {'extr (s)':>9} {'peak MiB':>9}  status")
+    rows = benchmark_suite(
+        horizons=args.horizons or profile['horizons'],
+        event_counts=args.events or profile['event_counts'],
+        mixes=args.mixes or profile['mixes'],
+        solvers=args.solvers,
+        include_dp=not args.no_dp,
+        repeats=args.repeats,
+        solve_limit=args.solve_limit,
+        progress=print_suite_row,
+    )
+    shutdown_batch_pool()
+
+    if args.save_baseline:
+        save_baseline(rows, args.save_baseline)
+        print(f"\nBaseline written to {args.save_baseline}")
+    if args.baseline:
+        regressions = compare_to_baseline(rows, load_baseline(args.baseline), tolerance=args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.baseline}:")
+            for item in regressions:
+                if item['metric'] == 'status':
+                    print(f"  {item['case']}: status {item['baseline']} -> {item['current']}")
+                else:
+                    print(f"  {item['case']}: {item['metric']} {item['baseline']:.4g} -> "
+                          f"{item['current']:.4g} (x{item['ratio']:.2f})")
+            return 1
+        print(f"\nNo regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+    return 0
+
+
+def run_scaling_tables():
+    print("MaintenanceOptimizer.build_model scaling")
+    print("=" * 60)
+    rows = benchmark_build()
+    print(f"{'slots':>8} {'events':>7} {'build (s)':>11} {'us / event-slot':>16}")
+    for row in rows:
+        print(f"{row['slots']:>8} {row['events']:>7} {row['build_seconds']:>11.4f} "
+              f"{row['us_per_event_slot']:>16.2f}")
+    print("\nA flat 'us / event-slot' column means build time grows linearly with E*T.")
+
+    print("\noptimize_batch on the projects.json portfolio")
+    print("=" * 60)
+    print(f"{'workers':>8} {'jobs':>6} {'failed':>7} {'time (s)':>10} {'jobs / s':>10}")
+    for row in benchmark_batch():
+        print(f"{row['workers']:>8} {row['jobs']:>6} {row['failed']:>7} "
+              f"{row['seconds']:>10.3f} {row['jobs_per_second']:>10.1f}")
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest='command')
+    commands.add_parser('scaling', help='build-time and batch-throughput tables (default)')
+    suite = commands.add_parser('suite', help='sweep and compare against a JSON baseline')
+    suite.add_argument('--profile', choices=sorted(PROFILES), default='quick')
+    suite.add_argument('--horizons', type=int, nargs='+', help='slot counts (overrides the profile)')
+    suite.add_argument('--events', type=int, nargs='+', help='event counts (overrides the profile)')
+    suite.add_argument('--mixes', choices=sorted(DURATION_MIXES), nargs='+')
+    suite.add_argument('--solvers', nargs='+', help='MILP backends (default: all available)')
+    suite.add_argument('--no-dp', action='store_true', help='skip the DP engine')
+    suite.add_argument('--repeats', type=int, default=3)
+    suite.add_argument('--solve-limit', type=int, default=DEFAULT_SOLVE_LIMIT,
+                       help='only build (not solve) cases with more event-slots than this')
+    suite.add_argument('--baseline', help='JSON baseline to compare against')
+    suite.add_argument('--save-baseline', metavar='PATH', help='write this run as a baseline')
+    suite.add_argument('--tolerance', type=float, default=0.25,
+                       help='relative slowdown that counts as a regression (default 0.25)')
+    args = parser.parse_args(argv)
+
+    if args.command == 'suite':
+        return run_suite(args)
+    run_scaling_tables()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Result cache for optimization requests
+Content-addressed: identical (normalized) requests map to the same key, so repeated
+payloads reuse the stored plan instead of building and solving the model again
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+CACHE_KEY_VERSION = b"maintenance-plan-v1"
+
+
+def request_key(elec_prices: np.ndarray, labor_prices: np.ndarray, durations: List[int],
+                **options) -> str:
+    """
+    Canonical sha256 key of one optimization request.
+    Prices are the normalized float arrays (MaintenanceOptimizer.prepare_costs()), so
+    {"0": 0.06}, {0: 0.06} and [0.06] hash the same. options (engine, solver, ...)
+    are hashed as sorted JSON; None values are dropped.
+    """
+    digest = hashlib.sha256(CACHE_KEY_VERSION)
+    for array in (elec_prices, labor_prices):
+        array = np.ascontiguousarray(array, dtype=np.float64)
+        digest.update(len(array).to_bytes(8, "little"))
+        digest.update(array.tobytes())
+    digest.update(np.asarray(durations, dtype=np.int64).tobytes())
+    options = {name: value for name, value in options.items() if value is not None}
+    digest.update(json.dumps(options, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Two-tier cache: an in-memory LRU of max_entries items and, when disk_dir is set,
+    a directory of JSON entries trimmed (least recently used first) to
+    disk_max_bytes; values JSON cannot represent are kept in memory only. A disk
+    hit is promoted to memory. Safe to share between threads; the disk tier can
+    also be shared between processes.
+    """
+
+    def __init__(self, max_entries: int = 256, disk_dir: Optional[str] = None,
+                 disk_max_bytes: int = 256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def get(self, key: str):
+        """Cached value for key, or None on a miss"""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+
+        value = self._disk_get(key) if self.disk_dir else None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._remember(key, value)
+        return value
+
+    def put(self, key: str, value):
+        """Store value under key in memory and, if configured, on disk"""
+        with self._lock:
+            self._remember(key, value)
+        if self.disk_dir:
+            self._disk_put(key, value)
+
+    def _remember(self, key: str, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_get(self, key: str):
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+            os.utime(path)  # mark as recently used for eviction
+            return value
+        except (OSError, ValueError):
+            return None
+
+    def _disk_put(self, key: str, value):
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(value, f)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError):
+            # Values JSON cannot represent stay in the memory tier only
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+        self._evict_disk()
+
+    def _evict_disk(self):
+        """Delete least recently used files until the directory fits disk_max_bytes"""
+        entries = []
+        for name in os.listdir(self.disk_dir):
+            if not name.endswith(".json"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.disk_dir, name))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.disk_max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.disk_dir, name))
+            except OSError:
+                pass
+            total -= size
+
+    def clear(self):
+        """Drop all entries (both tiers) and reset the counters"""
+        with self._lock:
+            self._memory.clear()
+            self.hits = self.disk_hits = self.misses = 0
+        if self.disk_dir:
+            for name in os.listdir(self.disk_dir):
+                if name.endswith(".json"):
+                    try:
+                        os.remove(os.path.join(self.disk_dir, name))
+                    except OSError:
+                        pass
+
+    def stats(self) -> Dict:
+        """Hit/miss counters (hits = memory_hits + disk_hits) and tier sizes"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'memory_hits': self.hits - self.disk_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'memory_entries': len(self._memory),
+                'max_entries': self.max_entries,
+                'disk_dir': self.disk_dir,
+            }
+
+
+_default_cache = None
+
+
+def get_cache() -> ResultCache:
+    """
+    Process-wide cache shared by app.py, run_optimization() and
+    MaintenanceOptimizer(cache=True). Configured from OPTIMIZER_CACHE_ENTRIES,
+    OPTIMIZER_CACHE_DIR and OPTIMIZER_CACHE_MAX_BYTES on first use.
+    """
+    global _default_cache
+    if _default_cache is None:
+        configure_cache(
+            max_entries=int(os.environ.get("OPTIMIZER_CACHE_ENTRIES", 256)),
+            disk_dir=os.environ.get("OPTIMIZER_CACHE_DIR") or None,
+            disk_max_bytes=int(os.environ.get("OPTIMIZER_CACHE_MAX_BYTES", 256 * 1024 * 1024)),
+        )
+    return _default_cache
+
+
+def configure_cache(max_entries: int = 256, disk_dir: Optional[str] = None,
+                    disk_max_bytes: int = 256 * 1024 * 1024) -> ResultCache:
+    """Replace the shared cache (e.g. to enable the disk tier)"""
+    global _default_cache
+    _default_cache = ResultCache(max_entries, disk_dir, disk_max_bytes)
+    return _default_cache
@@ -1,27 +1,149 @@
 #!/usr/bin/env python3
-import json, os, math, datetime as dt, hashlib
+"""
+Synthetic revenue datasets (price, predicted schedule, 5-minute telemetry) for the control room
+
+    python pregenerate_revenue.py                                   # P-001..P-004, one week -> data/static
+    python pregenerate_revenue.py --projects none --synthetic 40 --batteries 8 \\
+        --start 2025-01-01T00:00:00Z --end 2026-01-01T00:00:00Z --out-dir /tmp/fleet
+
+Each project is generated by its own worker process and written as soon as it is done.
+Outputs are deterministic per key, and the defaults reproduce the original script's output
+(the checked-in static files do not match it: pretty-printed, and P-001/P-003/P-004 differ).
+--noise counter swaps the per-value SHA-256 noise for vectorized counter-based noise
+(see "Noise sources" in ../Readme.md).
+"""
+import argparse, json, os, sys, math, datetime as dt, hashlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..'))
+from revenue_loss import ScheduleIndex
 
 OUT_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'static')
-os.makedirs(OUT_DIR, exist_ok=True)
+
+# Outage profiles: scale on the number of outage episodes, and whether the recurring
+# short hiccups / maintenance slots happen at all
+OUTAGE_PROFILES = {
+    'none':   {'episodes': 0.0, 'hiccups': False},
+    'light':  {'episodes': 0.5, 'hiccups': True},
+    'normal': {'episodes': 1.0, 'hiccups': True},
+    'heavy':  {'episodes': 2.0, 'hiccups': True},
+}
+NORMAL = OUTAGE_PROFILES['normal']
+
+# --- Deterministic noise sources (stable across runs and machines) ---
+# Noise is drawn per stream (e.g. "P001:B1") and timestamp. uniform() returns a whole
+# array for a stream at once: one value per period start (epoch seconds) in `times`.
+SLOT_FMT = '%Y-%m-%dT%H:%M:%S+00:00'  # datetime.isoformat() of a UTC time
+HOUR_FMT = '%Y-%m-%dT%H'
+DAY_FMT = '%Y-%m-%d'
+HOUR_S = 3600
+DAY_S = 86400
+
+class HashNoise:
+    """
+    Legacy noise: one SHA-256 digest of a formatted key per value, e.g.
+    rand01("P001:B1:2025-09-15T03"), as the original script drew it. Keys are formatted
+    in UTC, the timezone gen_week() works in.
+    """
+    name = 'sha256'
+
+    def rand01(self, key: str) -> float:
+        h = hashlib.sha256(key.encode('utf-8')).digest()
+        x = int.from_bytes(h[:8], 'big')
+        return x / float(2**64)
+
+    def jitter(self, key: str, scale: float) -> float:
+        return (self.rand01(key) * 2.0 - 1.0) * scale
+
+    def hour_jitter(self, base_hour: int, key: str, max_shift: int = 1) -> int:
+        # shift base hour by -max_shift..+max_shift
+        shift = int(round(self.jitter(key, max_shift)))
+        return max(0, min(23, base_hour + shift))
+
+    def uniform(self, stream, times, fmt, suffix=''):
+        """rand01(f'{stream}:{time as fmt}{suffix}') for every time in `times`"""
+        return np.array([self.rand01(f"{stream}:{dt.datetime.fromtimestamp(s, dt.timezone.utc).strftime(fmt)}{suffix}")
+                         for s in np.asarray(times).tolist()], dtype=float)
+
+GOLDEN_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+
+def splitmix64(x):
+    """splitmix64 output function on a uint64 array"""
+    with np.errstate(over='ignore'):
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return x ^ (x >> np.uint64(31))
+
+class CounterNoise(HashNoise):
+    """
+    Counter-based noise: value number `counter` of a splitmix64 sequence seeded by the
+    stream, i.e. splitmix64(seed + (counter + 1) * gamma), with the timestamp in epoch
+    seconds as the counter. A whole array is a few uint64 operations, and each value
+    depends only on (stream, timestamp), not on the window or the order of draws.
+    """
+    name = 'counter'
+
+    def rand01(self, key: str) -> float:
+        return float(self.uniform(key, [0], '')[0])
+
+    def uniform(self, stream, times, fmt, suffix=''):
+        digest = hashlib.blake2b(f'{stream}|{fmt}|{suffix}'.encode('utf-8'), digest_size=8).digest()
+        seed = np.uint64(int.from_bytes(digest, 'little'))
+        counters = np.asarray(times, dtype=np.int64).astype(np.uint64)
+        with np.errstate(over='ignore'):
+            x = splitmix64(seed + (counters + np.uint64(1)) * GOLDEN_GAMMA)
+        return (x >> np.uint64(11)).astype(float) * 2.0**-53
+
+NOISE_SOURCES = {'sha256': HashNoise(), 'counter': CounterNoise()}
+LEGACY = NOISE_SOURCES['sha256']
+
+def periods(start, end, unit_s):
+    """Epoch seconds of the unit_s-aligned periods (hours, days) that overlap [start, end)"""
+    first = int(start.timestamp()) // unit_s * unit_s
+    return np.arange(first, int(end.timestamp()), unit_s, dtype=np.int64)
+
+def period_index(t, start, unit_s):
+    """Index of t's period in periods(start, ..., unit_s)"""
+    return int(t.timestamp()) // unit_s - int(start.timestamp()) // unit_s
 
 def iso(ts):
     return ts.strftime('%Y-%m-%dT%H:%M:%SZ')
 
-def gen_week(start_str, end_str, batteries, price_fn, pred_fn, actual_fn):
-    start = dt.datetime.fromisoformat(start_str.replace('Z','+00:00'))
-    end = dt.datetime.fromisoformat(end_str.replace('Z','+00:00'))
+def parse_iso(value):
+    return dt.datetime.fromisoformat(value.replace('Z','+00:00'))
+
+def parse_utc(value):
+    """parse_iso() converted to UTC (times without an offset are taken as UTC)"""
+    t = parse_iso(value)
+    return t.replace(tzinfo=dt.timezone.utc) if t.tzinfo is None else t.astimezone(dt.timezone.utc)
+
+def gen_week(start_str, end_str, batteries, price_fn, pred_fn, actual_fn, step_min=5, outages=NORMAL,
+             noise=LEGACY, key='P001', stream=False):
+    # Everything runs in UTC: timestamps are written with a 'Z' suffix, and noise keys and
+    # hour/day periods are UTC (main() converts --start/--end)
+    start = parse_utc(start_str)
+    end = parse_utc(end_str)
     price = []
+    slots = np.arange(int(start.timestamp()), int(end.timestamp()), 15*60, dtype=np.int64)
+    slot_noise = noise.uniform(key, slots, SLOT_FMT).tolist()
     t = start
-    while t < end:
+    for u in slot_noise:
         price.append({
             'ts': iso(t),
-            'price_eur_mwh': price_fn(t),
+            'price_eur_mwh': price_fn(t, u),
             'interval_min': 15
         })
         t += dt.timedelta(minutes=15)
-    pred = pred_fn(start, end, batteries)
-    actual = actual_fn(start, end, batteries, pred)
-    return {
+    pred = pred_fn(start, end, batteries, noise=noise)
+    # Rebalance energy per battery to avoid impossible RTE (>100%)
+    make_rows = lambda: actual_fn(start, end, batteries, pred, step_min=step_min, outages=outages, noise=noise)
+    if stream:
+        actual = StreamedRows(make_rows, dt_min=step_min)
+    else:
+        actual = _rebalance_energy(list(make_rows()), dt_min=step_min)
+    data = {
         'window': {'start': start_str, 'end': end_str},
         'batteries': batteries,
         'price': price,
@@ -30,144 +152,258 @@ def gen_week(start_str, end_str, batteries, price_fn, pred_fn, actual_fn):
         'pMinPct': 5,
         'slaPct': 95
     }
+    if noise is not LEGACY:
+        data['noise'] = noise.name
+    return data
+
+IDLE = { 'mode':'IDLE', 'power_kw':0 }
+
+def pred_lookup(pred):
+    """
+    pred_at(battery_id, ts): the first pred block of the battery covering ts, else IDLE.
+    Backed by a ScheduleIndex so each lookup is a bisect instead of a scan over every block.
+    """
+    index = ScheduleIndex(pred)
+    def pred_at(bid, ts):
+        row = index.lookup(bid, int(ts.timestamp() * 1000))
+        return pred[row] if row >= 0 else IDLE
+    return pred_at
+
+def outage_episodes(count_key, ep_key, count_base, count_span, dur_base, dur_span, start, end, outages=NORMAL,
+                    noise=LEGACY):
+    """
+    Outage episodes by day offset: {day: [(start_min, dur_min), ...]}.
+    Drawn per week of the window (count_base + 0..count_span-1 episodes, scaled by the
+    outage profile); week 0 uses the original keys so a one-week window is unchanged.
+    """
+    by_day = {}
+    weeks = max(1, math.ceil((end - start) / dt.timedelta(days=7)))
+    for w in range(weeks):
+        suffix = f':w{w}' if w else ''
+        count = count_base + int(noise.rand01(count_key+suffix)*count_span)
+        count = int(round(count * outages['episodes']))
+        for i in range(count):
+            key = f'{ep_key}{suffix}:ep{i}'
+            day_off = w*7 + int(noise.rand01(key)*7)
+            start_min = int(noise.rand01(key+':min')*24*60)
+            dur = dur_base + int(noise.rand01(key+':dur')*dur_span)
+            by_day.setdefault(day_off, []).append((start_min, dur))
+    return by_day
+
+def in_episode(episodes, day_idx, mins):
+    return any(m<=mins<min(m+dur, 24*60) for m,dur in episodes.get(day_idx, ()))
 
 # --- Helpers to enforce energy plausibility on actuals ---
+CHUNK_ROWS = 100_000  # telemetry rows per chunk in streaming mode
+
+class EnergyRebalancer:
+    """
+    Ensure that, per battery, discharged energy over the window does not exceed charged
+    energy: discharge or charge magnitudes are scaled down uniformly to match the smaller side.
+
+    Works on columns (battery ids, power, downtime flags) in chunks: add() every chunk to
+    sum the energy, then apply() the same chunks in the same order. Sums run in row order
+    (cumsum()[-1] is a strict left-to-right sum, unlike sum()) and scaled powers are rounded
+    half-to-even, so the result is exactly that of the original per-row loop.
+    """
+
+    def __init__(self, dt_min=5):
+        self.dt_h = dt_min / 60.0
+        self.codes = {}  # battery_id -> index into chg/dis
+        self.chg = np.zeros(0)
+        self.dis = np.zeros(0)
+        self.rows = 0
+
+    def _encode(self, battery_ids):
+        codes = self.codes
+        encoded = np.fromiter((codes.setdefault(b, len(codes)) for b in battery_ids), dtype=np.int64,
+                              count=len(battery_ids))
+        if len(codes) > len(self.chg):
+            grow = len(codes) - len(self.chg)
+            self.chg = np.append(self.chg, np.zeros(grow))
+            self.dis = np.append(self.dis, np.zeros(grow))
+        return encoded
+
+    def add(self, battery_ids, power, downtime):
+        """Pass 1: add a chunk's charged/discharged energy (power in kW, downtime rows are skipped)"""
+        codes = self._encode(battery_ids)
+        e = np.asarray(power, dtype=float) * self.dt_h
+        e[np.asarray(downtime)] = 0.0
+        order = np.argsort(codes, kind='stable')
+        bounds = np.cumsum(np.bincount(codes, minlength=len(self.chg)))
+        for code, rows in enumerate(np.split(order, bounds[:-1])):
+            if len(rows):
+                energy = e[rows]
+                self.dis[code] = np.cumsum(np.concatenate(([self.dis[code]], energy[energy > 0])))[-1]
+                self.chg[code] = np.cumsum(np.concatenate(([self.chg[code]], -energy[energy < 0])))[-1]
+        self.rows += len(codes)
+
+    def scales(self):
+        """(scale of positive power, scale of negative power) per battery code"""
+        chg, dis = self.chg, self.dis
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pos = np.where((dis > chg) & (dis > 0), np.maximum(chg / dis, 0.0), 1.0)
+            neg = np.where((chg > dis) & (chg > 0), np.maximum(dis / chg, 0.0), 1.0)
+        return pos, neg
+
+    def apply(self, battery_ids, power, downtime):
+        """
+        Pass 2: (changed, new_power) for a chunk. Non-downtime rows with non-zero power
+        change to the rounded, scaled power (int64); other rows keep their value.
+        """
+        codes = self._encode(battery_ids)
+        power = np.asarray(power, dtype=float)
+        pos, neg = self.scales()
+        changed = ~np.asarray(downtime) & (power != 0)
+        scaled = np.where(power > 0, power * pos[codes], power * neg[codes])
+        return changed, np.rint(scaled).astype(np.int64)
+
+def _power_columns(rows):
+    """(battery ids, power, downtime flags) of telemetry rows (missing power counts as 0)"""
+    return ([r['battery_id'] for r in rows],
+            [float(r.get('power_kw', 0) or 0) for r in rows],
+            np.array([r.get('mode') == 'DOWNTIME' for r in rows], dtype=bool))
+
+def _apply_rebalance(rebalancer, rows):
+    """Write rebalanced powers into the rows (in place)"""
+    changed, power = rebalancer.apply(*_power_columns(rows))
+    for i, p in zip(np.flatnonzero(changed).tolist(), power[changed].tolist()):
+        rows[i]['power_kw'] = p
+    return rows
+
 def _rebalance_energy(actual_rows, dt_min=5):
+    """Rebalance telemetry rows held in memory (modified in place and returned)"""
+    rebalancer = EnergyRebalancer(dt_min)
+    rebalancer.add(*_power_columns(actual_rows))
+    return _apply_rebalance(rebalancer, actual_rows)
+
+def _chunks(rows, size):
+    chunk = []
+    for r in rows:
+        chunk.append(r)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+class StreamedRows:
     """
-    Ensure that, per battery, weekly discharged energy does not exceed charged energy.
-    Scales discharge or charge magnitudes down uniformly to match the smaller side.
+    Rebalanced telemetry that is never held in memory at once: make_rows() is iterated twice,
+    first to sum the energy per battery, then to yield rebalanced chunks (e.g. for writing).
+    len() is known after the first pass.
     """
-    from collections import defaultdict
-    dt_h = dt_min / 60.0
-    totals = defaultdict(lambda: {'chg': 0.0, 'dis': 0.0})
-    for r in actual_rows:
-        p = float(r.get('power_kw', 0) or 0)
-        if r.get('mode') == 'DOWNTIME' or p == 0:
-            continue
-        e = p * dt_h
-        if e > 0:
-            totals[r['battery_id']]['dis'] += e
-        elif e < 0:
-            totals[r['battery_id']]['chg'] += (-e)
-    # Compute scale factors
-    scale = { bid: {'pos': 1.0, 'neg': 1.0} for bid in totals.keys() }
-    for bid, t in totals.items():
-        chg, dis = t['chg'], t['dis']
-        if dis > chg and dis > 0:
-            scale[bid]['pos'] = max(chg / dis, 0.0)
-        elif chg > dis and chg > 0:
-            scale[bid]['neg'] = max(dis / chg, 0.0)
-    if not scale:
-        return actual_rows
-    # Apply scaling
-    out = []
-    for r in actual_rows:
-        p = float(r.get('power_kw', 0) or 0)
-        if r.get('mode') != 'DOWNTIME' and p != 0:
-            s = scale.get(r['battery_id'], {'pos':1.0,'neg':1.0})
-            if p > 0:
-                p = p * s['pos']
-            else:
-                p = p * s['neg']
-            r = dict(r)
-            r['power_kw'] = int(round(p))
-        out.append(r)
-    return out
-
-def write(name, obj):
-    path = os.path.join(OUT_DIR, f'revenue-{name}.json')
-    with open(path, 'w') as f:
-        json.dump(obj, f)
-    print('Wrote', path)
+
+    def __init__(self, make_rows, dt_min=5, chunk_size=CHUNK_ROWS):
+        self.make_rows = make_rows
+        self.dt_min = dt_min
+        self.chunk_size = chunk_size
+        self.rows = None
+
+    def __len__(self):
+        return self.rows
+
+    def chunks(self):
+        rebalancer = EnergyRebalancer(self.dt_min)
+        for chunk in _chunks(self.make_rows(), self.chunk_size):
+            rebalancer.add(*_power_columns(chunk))
+        self.rows = rebalancer.rows
+        for chunk in _chunks(self.make_rows(), self.chunk_size):
+            yield _apply_rebalance(rebalancer, chunk)
+
+def write(name, obj, out_dir=OUT_DIR):
+    """
+    Write revenue-<name>.json (via a temporary file, so readers never see a partial file).
+    StreamedRows values are written chunk by chunk; the bytes are the same as json.dump().
+    """
+    path = os.path.join(out_dir, f'revenue-{name}.json')
+    with open(path + '.tmp', 'w') as f:
+        if not any(isinstance(v, StreamedRows) for v in obj.values()):
+            f.write(json.dumps(obj))
+        else:
+            f.write('{')
+            for i, (key, value) in enumerate(obj.items()):
+                f.write((', ' if i else '') + json.dumps(key) + ': ')
+                if not isinstance(value, StreamedRows):
+                    f.write(json.dumps(value))
+                    continue
+                f.write('[')
+                first = True
+                for chunk in value.chunks():
+                    f.write(('' if first else ', ') + ', '.join(map(json.dumps, chunk)))
+                    first = False
+                f.write(']')
+            f.write('}')
+    os.replace(path + '.tmp', path)
+    return path
 
 START = '2025-09-15T00:00:00Z'
 END   = '2025-09-22T00:00:00Z'
 
-# Deterministic pseudo-random helpers (stable across runs)
-def rand01(key: str) -> float:
-    h = hashlib.sha256(key.encode('utf-8')).digest()
-    x = int.from_bytes(h[:8], 'big')
-    return x / float(2**64)
+# Legacy scalar helpers (battery sizing of synthetic projects uses them in every noise mode)
+rand01, jitter, hour_jitter = LEGACY.rand01, LEGACY.jitter, LEGACY.hour_jitter
 
-def jitter(key: str, scale: float) -> float:
-    return (rand01(key) * 2.0 - 1.0) * scale
+def jitter_of(u, scale):
+    """jitter() from an already drawn uniform value"""
+    return (u * 2.0 - 1.0) * scale
 
-def hour_jitter(base_hour: int, key: str, max_shift: int = 1) -> int:
-    # shift base hour by -max_shift..+max_shift
-    shift = int(round(jitter(key, max_shift)))
-    return max(0, min(23, base_hour + shift))
-
-# P-001 Hamburg
+# P-001 Hamburg (also the profile of synthetic projects, under their own key)
 bat1 = [
     { 'battery_id':'B1', 'capacity_kwh':20000, 'power_kw':5000 },
     { 'battery_id':'B2', 'capacity_kwh':20000, 'power_kw':5000 },
 ]
-def price1(t):
+def price1(t, u):
     h = t.hour; dow = t.weekday()
     base=70; peak = 60 if 17<=h<21 else (40 if 8<=h<12 else 0); night=-20 if h<6 else 0; weekend=-10 if dow>=5 else 0
     # add deterministic noise up to +/- 6 EUR/MWh varying by 15-min slot
     p = base+peak+night+weekend
-    return max(0, p + jitter(f"P001:{t.isoformat()}", 6.0))
-def pred1(start,end,bats):
+    return max(0, p + jitter_of(u, 6.0))
+def pred1(start,end,bats,noise=LEGACY,key='P001'):
     pred=[]; d=start
     while d<end:
         yyyy = d.strftime('%Y-%m-%d')
         for b in bats:
             # Vary charge/discharge hours slightly per battery/day
-            c_start = hour_jitter(0, f"P001:{b['battery_id']}:{yyyy}:c_start")
-            c_len = 5 + int(round(rand01(f"P001:{b['battery_id']}:{yyyy}:c_len")*2))  # 5-7h
-            d_start = hour_jitter(17, f"P001:{b['battery_id']}:{yyyy}:d_start")
-            d_len = 3 + int(round(rand01(f"P001:{b['battery_id']}:{yyyy}:d_len")))    # 3-4h
-            c_pow = int(b['power_kw'] * (0.55 + rand01(f"P001:{b['battery_id']}:{yyyy}:c_pow")*0.15))
-            d_pow = int(b['power_kw'] * (0.65 + rand01(f"P001:{b['battery_id']}:{yyyy}:d_pow")*0.15))
+            c_start = noise.hour_jitter(0, f"{key}:{b['battery_id']}:{yyyy}:c_start")
+            c_len = 5 + int(round(noise.rand01(f"{key}:{b['battery_id']}:{yyyy}:c_len")*2))  # 5-7h
+            d_start = noise.hour_jitter(17, f"{key}:{b['battery_id']}:{yyyy}:d_start")
+            d_len = 3 + int(round(noise.rand01(f"{key}:{b['battery_id']}:{yyyy}:d_len")))    # 3-4h
+            c_pow = int(b['power_kw'] * (0.55 + noise.rand01(f"{key}:{b['battery_id']}:{yyyy}:c_pow")*0.15))
+            d_pow = int(b['power_kw'] * (0.65 + noise.rand01(f"{key}:{b['battery_id']}:{yyyy}:d_pow")*0.15))
             pred.append({ 'battery_id':b['battery_id'], 'start_ts': f'{yyyy}T{c_start:02d}:00:00Z', 'end_ts': f'{yyyy}T{(c_start+c_len)%24:02d}:00:00Z', 'mode':'CHARGE', 'power_kw': -c_pow })
             pred.append({ 'battery_id':b['battery_id'], 'start_ts': f'{yyyy}T{d_start:02d}:00:00Z', 'end_ts': f'{yyyy}T{(d_start+d_len)%24:02d}:00:00Z', 'mode':'DISCHARGE', 'power_kw': d_pow })
         d += dt.timedelta(days=1)
     return pred
-def actual1(start,end,bats,pred):
+def actual1(start,end,bats,pred,step_min=5,outages=NORMAL,noise=LEGACY,key='P001'):
     # helper to check if ts in pred block
-    def pred_at(bid, ts):
-        for p in pred:
-            if p['battery_id']==bid:
-                ps = dt.datetime.fromisoformat(p['start_ts'].replace('Z','+00:00'))
-                pe = dt.datetime.fromisoformat(p['end_ts'].replace('Z','+00:00'))
-                if ps <= ts < pe:
-                    return p
-        return { 'mode':'IDLE', 'power_kw':0 }
+    pred_at = pred_lookup(pred)
     # make deterministic outage episodes per battery
-    outages = {}
-    for b in bats:
-        episodes = []
-        base_key = f"P001:{b['battery_id']}"
-        # 1-2 weekly episodes + small daily hiccup at varying minute
-        count = 1 + int(rand01(base_key)*2)
-        for i in range(count):
-            day_off = int(rand01(base_key+f":ep{i}")*7)
-            start_min = int(rand01(base_key+f":ep{i}:min")*24*60)
-            dur = 20 + int(rand01(base_key+f":ep{i}:dur")*80)
-            episodes.append((day_off, start_min, dur))
-        outages[b['battery_id']] = episodes
-    rows=[]; t=start
+    # 1-2 weekly episodes + small daily hiccup at varying minute
+    episodes = { b['battery_id']: outage_episodes(f"{key}:{b['battery_id']}", f"{key}:{b['battery_id']}", 1, 2, 20, 80, start, end, outages, noise)
+                 for b in bats }
+    # per-battery noise for the whole window: daily hiccup minute, hourly derate
+    hours, days = periods(start, end, HOUR_S), periods(start, end, DAY_S)
+    hiccup_u = { b['battery_id']: noise.uniform(f"{key}:{b['battery_id']}", days, DAY_FMT, ':hiccup').tolist() for b in bats }
+    derate_u = { b['battery_id']: noise.uniform(f"{key}:{b['battery_id']}", hours, HOUR_FMT).tolist() for b in bats }
+    t=start
     while t<end:
+        day, hour = period_index(t, start, DAY_S), period_index(t, start, HOUR_S)
         for b in bats:
             day_idx = (t - start).days
             mins = t.hour*60 + t.minute
-            hiccup_min = int(rand01(f"P001:{b['battery_id']}:{t.strftime('%Y-%m-%d')}:hiccup")*60)  # 0-59 past hour 03
-            is_hiccup = (t.hour==3 and hiccup_min<=mins<min(hiccup_min+10, 60))
-            is_episode = any(day_idx==d and (m<=mins<min(m+dur, 24*60)) for d,m,dur in outages[b['battery_id']])
+            hiccup_min = int(hiccup_u[b['battery_id']][day]*60)  # 0-59 past hour 03
+            is_hiccup = outages['hiccups'] and (t.hour==3 and hiccup_min<=mins<min(hiccup_min+10, 60))
+            is_episode = in_episode(episodes[b['battery_id']], day_idx, mins)
             if is_hiccup or is_episode:
-                rows.append({ 'battery_id':b['battery_id'], 'ts': iso(t), 'mode':'DOWNTIME', 'power_kw':0, 'soc_pct':50 })
+                yield { 'battery_id':b['battery_id'], 'ts': iso(t), 'mode':'DOWNTIME', 'power_kw':0, 'soc_pct':50 }
                 continue
             p = pred_at(b['battery_id'], t)
             mode = p['mode']
             # derate varies smoothly per hour
-            derate = 0.9 + jitter(f"P001:{b['battery_id']}:{t.strftime('%Y-%m-%dT%H')}", 0.05)
+            derate = 0.9 + jitter_of(derate_u[b['battery_id']][hour], 0.05)
             power = 0 if mode=='IDLE' else int(round(p['power_kw']*derate))
-            rows.append({ 'battery_id':b['battery_id'], 'ts': iso(t), 'mode': mode, 'power_kw': power, 'soc_pct':50 })
-        t += dt.timedelta(minutes=5)
-    # Rebalance energy per battery to avoid impossible RTE (>100%)
-    return _rebalance_energy(rows, dt_min=5)
-write('P-001', gen_week(START, END, bat1, price1, pred1, actual1))
+            yield { 'battery_id':b['battery_id'], 'ts': iso(t), 'mode': mode, 'power_kw': power, 'soc_pct':50 }
+        t += dt.timedelta(minutes=step_min)
 
 # P-002 Stockholm
 bat2 = [
@@ -175,56 +411,45 @@ bat2 = [
     { 'battery_id':'S2', 'capacity_kwh':26000, 'power_kw':6000 },
     { 'battery_id':'S3', 'capacity_kwh':26000, 'power_kw':6000 },
 ]
-def price2(t):
+def price2(t, u):
     h=t.hour; dow=t.weekday(); base=85; peak=70 if 17<=h<21 else (35 if 8<=h<12 else 0); night=-25 if h<6 else 0; weekend=-12 if dow>=5 else 0
-    return max(0, base+peak+night+weekend + jitter(f"P002:{t.isoformat()}", 7.0))
-def pred2(start,end,bats):
+    return max(0, base+peak+night+weekend + jitter_of(u, 7.0))
+def pred2(start,end,bats,noise=LEGACY):
     bl=[]; d=start
     while d<end:
         yyyy=d.strftime('%Y-%m-%d')
         # Add small per-day offsets and power variance
         bl+= [
-            { 'battery_id':'S1', 'start_ts': f'{yyyy}T{hour_jitter(2,f"P002:S1:{yyyy}:c"):02d}:00:00Z', 'end_ts': f'{yyyy}T{hour_jitter(5,f"P002:S1:{yyyy}:c_end"):02d}:00:00Z', 'mode':'CHARGE', 'power_kw': -int(2800 + rand01(f"P002:S1:{yyyy}:cp")*600) },
-            { 'battery_id':'S1', 'start_ts': f'{yyyy}T{hour_jitter(16,f"P002:S1:{yyyy}:d"):02d}:00:00Z', 'end_ts': f'{yyyy}T{hour_jitter(22,f"P002:S1:{yyyy}:d_end"):02d}:00:00Z', 'mode':'DISCHARGE', 'power_kw': int(4000 + rand01(f"P002:S1:{yyyy}:dp")*600) },
-            { 'battery_id':'S2', 'start_ts': f'{yyyy}T{hour_jitter(0,f"P002:S2:{yyyy}:c"):02d}:00:00Z', 'end_ts': f'{yyyy}T{hour_jitter(6,f"P002:S2:{yyyy}:c_end"):02d}:00:00Z', 'mode':'CHARGE', 'power_kw': -int(3300 + rand01(f"P002:S2:{yyyy}:cp")*500) },
-            { 'battery_id':'S2', 'start_ts': f'{yyyy}T{hour_jitter(17,f"P002:S2:{yyyy}:d"):02d}:00:00Z', 'end_ts': f'{yyyy}T{hour_jitter(21,f"P002:S2:{yyyy}:d_end"):02d}:00:00Z', 'mode':'DISCHARGE', 'power_kw': int(3400 + rand01(f"P002:S2:{yyyy}:dp")*500) },
+            { 'battery_id':'S1', 'start_ts': f'{yyyy}T{noise.hour_jitter(2,f"P002:S1:{yyyy}:c"):02d}:00:00Z', 'end_ts': f'{yyyy}T{noise.hour_jitter(5,f"P002:S1:{yyyy}:c_end"):02d}:00:00Z', 'mode':'CHARGE', 'power_kw': -int(2800 + noise.rand01(f"P002:S1:{yyyy}:cp")*600) },
+            { 'battery_id':'S1', 'start_ts': f'{yyyy}T{noise.hour_jitter(16,f"P002:S1:{yyyy}:d"):02d}:00:00Z', 'end_ts': f'{yyyy}T{noise.hour_jitter(22,f"P002:S1:{yyyy}:d_end"):02d}:00:00Z', 'mode':'DISCHARGE', 'power_kw': int(4000 + noise.rand01(f"P002:S1:{yyyy}:dp")*600) },
+            { 'battery_id':'S2', 'start_ts': f'{yyyy}T{noise.hour_jitter(0,f"P002:S2:{yyyy}:c"):02d}:00:00Z', 'end_ts': f'{yyyy}T{noise.hour_jitter(6,f"P002:S2:{yyyy}:c_end"):02d}:00:00Z', 'mode':'CHARGE', 'power_kw': -int(3300 + noise.rand01(f"P002:S2:{yyyy}:cp")*500) },
+            { 'battery_id':'S2', 'start_ts': f'{yyyy}T{noise.hour_jitter(17,f"P002:S2:{yyyy}:d"):02d}:00:00Z', 'end_ts': f'{yyyy}T{noise.hour_jitter(21,f"P002:S2:{yyyy}:d_end"):02d}:00:00Z', 'mode':'DISCHARGE', 'power_kw': int(3400 + noise.rand01(f"P002:S2:{yyyy}:dp")*500) },
             # Add missing nightly charge for S3 to avoid net discharge only
-            { 'battery_id':'S3', 'start_ts': f'{yyyy}T{hour_jitter(1,f"P002:S3:{yyyy}:c"):02d}:00:00Z', 'end_ts': f'{yyyy}T{hour_jitter(3,f"P002:S3:{yyyy}:c_end"):02d}:00:00Z', 'mode':'CHARGE', 'power_kw': -int(2000 + rand01(f"P002:S3:{yyyy}:cp")*400) },
-            { 'battery_id':'S3', 'start_ts': f'{yyyy}T{hour_jitter(18,f"P002:S3:{yyyy}:d"):02d}:00:00Z', 'end_ts': f'{yyyy}T{hour_jitter(20,f"P002:S3:{yyyy}:d_end"):02d}:00:00Z', 'mode':'DISCHARGE', 'power_kw': int(2300 + rand01(f"P002:S3:{yyyy}:dp")*500) },
+            { 'battery_id':'S3', 'start_ts': f'{yyyy}T{noise.hour_jitter(1,f"P002:S3:{yyyy}:c"):02d}:00:00Z', 'end_ts': f'{yyyy}T{noise.hour_jitter(3,f"P002:S3:{yyyy}:c_end"):02d}:00:00Z', 'mode':'CHARGE', 'power_kw': -int(2000 + noise.rand01(f"P002:S3:{yyyy}:cp")*400) },
+            { 'battery_id':'S3', 'start_ts': f'{yyyy}T{noise.hour_jitter(18,f"P002:S3:{yyyy}:d"):02d}:00:00Z', 'end_ts': f'{yyyy}T{noise.hour_jitter(20,f"P002:S3:{yyyy}:d_end"):02d}:00:00Z', 'mode':'DISCHARGE', 'power_kw': int(2300 + noise.rand01(f"P002:S3:{yyyy}:dp")*500) },
         ]
         d += dt.timedelta(days=1)
     return bl
-def actual2(start,end,bats,pred):
-    def pred_at(bid, ts):
-        for p in pred:
-            if p['battery_id']==bid:
-                ps = dt.datetime.fromisoformat(p['start_ts'].replace('Z','+00:00'))
-                pe = dt.datetime.fromisoformat(p['end_ts'].replace('Z','+00:00'))
-                if ps <= ts < pe:
-                    return p
-        return { 'mode':'IDLE', 'power_kw':0 }
-    out=[]; t=start
+def actual2(start,end,bats,pred,step_min=5,outages=NORMAL,noise=LEGACY):
+    pred_at = pred_lookup(pred)
+    t=start
     # outages: 1-3 weekly episodes, plus daily short 1-8min hiccup at random minute in 01h
-    ep_count = 1 + int(rand01('P002:episodes')*3)
-    episodes = []
-    for i in range(ep_count):
-        day_off = int(rand01(f'P002:ep{i}')*7)
-        start_min = int(rand01(f'P002:ep{i}:min')*24*60)
-        dur = 15 + int(rand01(f'P002:ep{i}:dur')*120)
-        episodes.append((day_off, start_min, dur))
+    episodes = outage_episodes('P002:episodes', 'P002', 1, 3, 15, 120, start, end, outages, noise)
+    hours, days = periods(start, end, HOUR_S), periods(start, end, DAY_S)
+    hiclen_u = { b['battery_id']: noise.uniform(f"P002:{b['battery_id']}", days, DAY_FMT, ':hiclen').tolist() for b in bats }
+    derate_u = { b['battery_id']: noise.uniform(f"P002:{b['battery_id']}", hours, HOUR_FMT).tolist() for b in bats }
     while t<end:
         dow=t.weekday(); mins=t.hour*60+t.minute; day_idx=(t-start).days
+        day, hour = period_index(t, start, DAY_S), period_index(t, start, HOUR_S)
         for b in bats:
-            hic = int(rand01(f"P002:{b['battery_id']}:{t.strftime('%Y-%m-%d')}:hic")*60)
-            ep = any(day_idx==d and (m<=mins<min(m+dur, 24*60)) for d,m,dur in episodes)
-            if (mins>=60 and mins<60+ (1+int(rand01(f"P002:{b['battery_id']}:{t.strftime('%Y-%m-%d')}:hiclen")*7))) or (dow==6 and 12*60<=mins<12*60+30) or ep:
-                out.append({ 'battery_id':b['battery_id'], 'ts':iso(t), 'mode':'DOWNTIME','power_kw':0,'soc_pct':60 })
+            ep = in_episode(episodes, day_idx, mins)
+            hiccup = outages['hiccups'] and ((mins>=60 and mins<60+ (1+int(hiclen_u[b['battery_id']][day]*7))) or (dow==6 and 12*60<=mins<12*60+30))
+            if hiccup or ep:
+                yield { 'battery_id':b['battery_id'], 'ts':iso(t), 'mode':'DOWNTIME','power_kw':0,'soc_pct':60 }
             else:
-                p=pred_at(b['battery_id'],t); mode=p['mode']; der=0.88 + jitter(f"P002:{b['battery_id']}:{t.strftime('%Y-%m-%dT%H')}", 0.06); power=0 if mode=='IDLE' else int(round(p['power_kw']*der))
-                out.append({ 'battery_id':b['battery_id'], 'ts':iso(t), 'mode':mode, 'power_kw':power, 'soc_pct':60 })
-        t += dt.timedelta(minutes=5)
-    return _rebalance_energy(out, dt_min=5)
-write('P-002', gen_week(START, END, bat2, price2, pred2, actual2))
+                p=pred_at(b['battery_id'],t); mode=p['mode']; der=0.88 + jitter_of(derate_u[b['battery_id']][hour], 0.06); power=0 if mode=='IDLE' else int(round(p['power_kw']*der))
+                yield { 'battery_id':b['battery_id'], 'ts':iso(t), 'mode':mode, 'power_kw':power, 'soc_pct':60 }
+        t += dt.timedelta(minutes=step_min)
 
 # P-003 Berlin (red)
 bat3 = [
@@ -234,10 +459,10 @@ bat3 = [
     { 'battery_id':'BL4', 'capacity_kwh':15000, 'power_kw':5000 },
     { 'battery_id':'BL5', 'capacity_kwh':15000, 'power_kw':5000 },
 ]
-def price3(t):
+def price3(t, u):
     h=t.hour; dow=t.weekday(); base=80; peak=80 if 17<=h<21 else (50 if 8<=h<12 else 0); night=-30 if h<6 else 0; weekend=-15 if dow>=5 else 0
-    return max(0, base+peak+night+weekend + jitter(f"P003:{t.isoformat()}", 8.0))
-def pred3(start,end,bats):
+    return max(0, base+peak+night+weekend + jitter_of(u, 8.0))
+def pred3(start,end,bats,noise=LEGACY):
     bl=[]; d=start
     while d<end:
         yyyy=d.strftime('%Y-%m-%d')
@@ -246,49 +471,35 @@ def pred3(start,end,bats):
             bl.append({ 'battery_id':b['battery_id'], 'start_ts':f'{yyyy}T17:00:00Z', 'end_ts':f'{yyyy}T22:00:00Z', 'mode':'DISCHARGE', 'power_kw': int(b['power_kw']*0.65) })
         d += dt.timedelta(days=1)
     return bl
-def actual3(start,end,bats,pred):
-    def pred_at(bid, ts):
-        for p in pred:
-            if p['battery_id']==bid:
-                ps = dt.datetime.fromisoformat(p['start_ts'].replace('Z','+00:00'))
-                pe = dt.datetime.fromisoformat(p['end_ts'].replace('Z','+00:00'))
-                if ps <= ts < pe:
-                    return p
-        return { 'mode':'IDLE', 'power_kw':0 }
-    rows=[]; t=start
+def actual3(start,end,bats,pred,step_min=5,outages=NORMAL,noise=LEGACY):
+    pred_at = pred_lookup(pred)
+    t=start
     # more outages: 3-5 episodes per battery
-    outages = {}
-    for b in bats:
-        eps = []
-        cnt = 3 + int(rand01('P003:'+b['battery_id'])*3)
-        for i in range(cnt):
-            day_off = int(rand01(f'P003:{b["battery_id"]}:ep{i}')*7)
-            start_min = int(rand01(f'P003:{b["battery_id"]}:ep{i}:min')*24*60)
-            dur = 30 + int(rand01(f'P003:{b["battery_id"]}:ep{i}:dur')*180)
-            eps.append((day_off, start_min, dur))
-        outages[b['battery_id']] = eps
+    episodes = { b['battery_id']: outage_episodes('P003:'+b['battery_id'], f'P003:{b["battery_id"]}', 3, 3, 30, 180, start, end, outages, noise)
+                 for b in bats }
+    hours = periods(start, end, HOUR_S)
+    derate_u = { b['battery_id']: noise.uniform(f"P003:{b['battery_id']}", hours, HOUR_FMT).tolist() for b in bats }
     while t<end:
         dow=t.weekday(); mins=t.hour*60+t.minute; day_idx=(t-start).days
+        hour = period_index(t, start, HOUR_S)
         for b in bats:
-            ep = any(day_idx==d and (m<=mins<min(m+dur, 24*60)) for d,m,dur in outages[b['battery_id']])
-            if ep or (dow==2 and 2*60<=mins<3*60):
-                rows.append({ 'battery_id':b['battery_id'], 'ts':iso(t), 'mode':'DOWNTIME','power_kw':0,'soc_pct':55 })
+            ep = in_episode(episodes[b['battery_id']], day_idx, mins)
+            if ep or (outages['hiccups'] and dow==2 and 2*60<=mins<3*60):
+                yield { 'battery_id':b['battery_id'], 'ts':iso(t), 'mode':'DOWNTIME','power_kw':0,'soc_pct':55 }
             else:
-                p=pred_at(b['battery_id'],t); mode=p['mode']; der=0.8 + jitter(f"P003:{b['battery_id']}:{t.strftime('%Y-%m-%dT%H')}", 0.08); power=0 if mode=='IDLE' else int(round(p['power_kw']*der))
-                rows.append({ 'battery_id':b['battery_id'], 'ts':iso(t), 'mode':mode, 'power_kw':power, 'soc_pct':55 })
-        t += dt.timedelta(minutes=5)
-    return _rebalance_energy(rows, dt_min=5)
-write('P-003', gen_week(START, END, bat3, price3, pred3, actual3))
+                p=pred_at(b['battery_id'],t); mode=p['mode']; der=0.8 + jitter_of(derate_u[b['battery_id']][hour], 0.08); power=0 if mode=='IDLE' else int(round(p['power_kw']*der))
+                yield { 'battery_id':b['battery_id'], 'ts':iso(t), 'mode':mode, 'power_kw':power, 'soc_pct':55 }
+        t += dt.timedelta(minutes=step_min)
 
 # P-004 Frankfurt (green)
 bat4 = [
     { 'battery_id':'FF1', 'capacity_kwh':15000, 'power_kw':4000 },
     { 'battery_id':'FF2', 'capacity_kwh':15000, 'power_kw':4000 },
 ]
-def price4(t):
+def price4(t, u):
     h=t.hour; dow=t.weekday(); base=75; peak=55 if 17<=h<21 else (30 if 8<=h<12 else 0); night=-18 if h<6 else 0; weekend=-8 if dow>=5 else 0
-    return max(0, base+peak+night+weekend + jitter(f"P004:{t.isoformat()}", 5.0))
-def pred4(start,end,bats):
+    return max(0, base+peak+night+weekend + jitter_of(u, 5.0))
+def pred4(start,end,bats,noise=LEGACY):
     bl=[]; d=start
     while d<end:
         yyyy=d.strftime('%Y-%m-%d')
@@ -297,37 +508,111 @@ def pred4(start,end,bats):
             bl.append({ 'battery_id':b['battery_id'], 'start_ts':f'{yyyy}T17:00:00Z', 'end_ts':f'{yyyy}T20:00:00Z', 'mode':'DISCHARGE', 'power_kw': int(b['power_kw']*0.7) })
         d += dt.timedelta(days=1)
     return bl
-def actual4(start,end,bats,pred):
-    def pred_at(bid, ts):
-        for p in pred:
-            if p['battery_id']==bid:
-                ps = dt.datetime.fromisoformat(p['start_ts'].replace('Z','+00:00'))
-                pe = dt.datetime.fromisoformat(p['end_ts'].replace('Z','+00:00'))
-                if ps <= ts < pe:
-                    return p
-        return { 'mode':'IDLE', 'power_kw':0 }
-    rows=[]; t=start
+def actual4(start,end,bats,pred,step_min=5,outages=NORMAL,noise=LEGACY):
+    pred_at = pred_lookup(pred)
+    t=start
     # minimal outages: 0-1 small per battery + tiny daily hiccup at 04:00 +/- 5m
-    outages = {}
-    for b in bats:
-        eps = []
-        cnt = int(rand01('P004:'+b['battery_id'])*2)
-        for i in range(cnt):
-            day_off = int(rand01(f'P004:{b["battery_id"]}:ep{i}')*7)
-            start_min = int(rand01(f'P004:{b["battery_id"]}:ep{i}:min')*24*60)
-            dur = 5 + int(rand01(f'P004:{b["battery_id"]}:ep{i}:dur')*20)
-            eps.append((day_off, start_min, dur))
-        outages[b['battery_id']] = eps
+    episodes = { b['battery_id']: outage_episodes('P004:'+b['battery_id'], f'P004:{b["battery_id"]}', 0, 2, 5, 20, start, end, outages, noise)
+                 for b in bats }
+    hours, days = periods(start, end, HOUR_S), periods(start, end, DAY_S)
+    hic_u = { b['battery_id']: noise.uniform(f"P004:{b['battery_id']}", days, DAY_FMT, ':hic').tolist() for b in bats }
+    derate_u = { b['battery_id']: noise.uniform(f"P004:{b['battery_id']}", hours, HOUR_FMT).tolist() for b in bats }
     while t<end:
         mins=t.hour*60+t.minute; day_idx=(t-start).days
+        day, hour = period_index(t, start, DAY_S), period_index(t, start, HOUR_S)
         for b in bats:
-            hic_start = 4*60 + int(jitter(f"P004:{b['battery_id']}:{t.strftime('%Y-%m-%d')}:hic", 5))
-            ep = any(day_idx==d and (m<=mins<min(m+dur, 24*60)) for d,m,dur in outages[b['battery_id']])
-            if (hic_start<=mins<hic_start+5) or ep:
-                rows.append({ 'battery_id':b['battery_id'], 'ts':iso(t), 'mode':'DOWNTIME','power_kw':0,'soc_pct':65 })
+            hic_start = 4*60 + int(jitter_of(hic_u[b['battery_id']][day], 5))
+            ep = in_episode(episodes[b['battery_id']], day_idx, mins)
+            if (outages['hiccups'] and hic_start<=mins<hic_start+5) or ep:
+                yield { 'battery_id':b['battery_id'], 'ts':iso(t), 'mode':'DOWNTIME','power_kw':0,'soc_pct':65 }
             else:
-                p=pred_at(b['battery_id'],t); mode=p['mode']; der=0.95 + jitter(f"P004:{b['battery_id']}:{t.strftime('%Y-%m-%dT%H')}", 0.03); power=0 if mode=='IDLE' else int(round(p['power_kw']*der))
-                rows.append({ 'battery_id':b['battery_id'], 'ts':iso(t), 'mode':mode, 'power_kw':power, 'soc_pct':65 })
-        t += dt.timedelta(minutes=5)
-    return _rebalance_energy(rows, dt_min=5)
-write('P-004', gen_week(START, END, bat4, price4, pred4, actual4))
+                p=pred_at(b['battery_id'],t); mode=p['mode']; der=0.95 + jitter_of(derate_u[b['battery_id']][hour], 0.03); power=0 if mode=='IDLE' else int(round(p['power_kw']*der))
+                yield { 'battery_id':b['battery_id'], 'ts':iso(t), 'mode':mode, 'power_kw':power, 'soc_pct':65 }
+        t += dt.timedelta(minutes=step_min)
+
+PROJECTS = {
+    'P-001': (bat1, price1, pred1, actual1),
+    'P-002': (bat2, price2, pred2, actual2),
+    'P-003': (bat3, price3, pred3, actual3),
+    'P-004': (bat4, price4, pred4, actual4),
+}
+# noise key prefix of every project, e.g. 'P001' (its price noise stream)
+def project_key(project_id):
+    return project_id.replace('-', '')
+
+def synthetic_batteries(project_id, count):
+    """count batteries of 2-7 MW with 2-4 h of storage, sized deterministically from the project id"""
+    key = project_key(project_id)
+    bats = []
+    for n in range(1, count+1):
+        power = 1000 * (2 + int(rand01(f'{key}:B{n}:power')*6))
+        hours = 2 + int(rand01(f'{key}:B{n}:hours')*3)
+        bats.append({ 'battery_id': f'{project_id}-B{n:03d}', 'capacity_kwh': power*hours, 'power_kw': power })
+    return bats
+
+def project_spec(project_id, batteries=4):
+    """(batteries, price_fn, pred_fn, actual_fn) of a built-in project, else a synthetic one on the P-001 profile"""
+    if project_id in PROJECTS:
+        return PROJECTS[project_id]
+    key = project_key(project_id)
+    return (synthetic_batteries(project_id, batteries), price1,
+            lambda start, end, bats, **kw: pred1(start, end, bats, key=key, **kw),
+            lambda start, end, bats, pred, **kw: actual1(start, end, bats, pred, key=key, **kw))
+
+def generate_project(project_id, start=START, end=END, batteries=4, step_min=5, outages='normal', noise='sha256',
+                     stream=False, out_dir=OUT_DIR):
+    """Generate and write one project's dataset; returns (path, number of telemetry rows)"""
+    bats, price_fn, pred_fn, actual_fn = project_spec(project_id, batteries)
+    data = gen_week(start, end, bats, price_fn, pred_fn, actual_fn, step_min=step_min, outages=OUTAGE_PROFILES[outages],
+                    noise=NOISE_SOURCES[noise], key=project_key(project_id), stream=stream)
+    path = write(project_id, data, out_dir)
+    return path, len(data['actual'])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--projects', default=','.join(PROJECTS),
+                        help="comma-separated built-in projects, or 'none' (default: %(default)s)")
+    parser.add_argument('--synthetic', type=int, default=0, metavar='N', help="add N synthetic projects SYN-001..SYN-N")
+    parser.add_argument('--batteries', type=int, default=4, help="batteries per synthetic project (default: %(default)s)")
+    parser.add_argument('--start', default=START, help="window start, ISO 8601 (default: %(default)s)")
+    parser.add_argument('--end', default=END, help="window end, ISO 8601 (default: %(default)s)")
+    parser.add_argument('--interval', type=int, default=5, help="telemetry interval in minutes (default: %(default)s)")
+    parser.add_argument('--outages', choices=OUTAGE_PROFILES, default='normal', help="outage profile (default: %(default)s)")
+    parser.add_argument('--noise', choices=NOISE_SOURCES, default='sha256',
+                        help="noise source: sha256 (legacy, as the original script) or counter (vectorized)")
+    parser.add_argument('--stream', action='store_true',
+                        help="stream telemetry to disk in chunks (flat memory, telemetry is generated twice)")
+    parser.add_argument('--workers', type=int, default=0, help="worker processes (default: CPU count, 1 = in-process)")
+    parser.add_argument('--out-dir', default=OUT_DIR, help="output directory (default: data/static)")
+    args = parser.parse_args(argv)
+
+    projects = [] if args.projects == 'none' else [p.strip() for p in args.projects.split(',') if p.strip()]
+    unknown = [p for p in projects if p not in PROJECTS]
+    if unknown:
+        parser.error(f"unknown projects: {', '.join(unknown)} (built-in: {', '.join(PROJECTS)})")
+    projects += [f'SYN-{n:03d}' for n in range(1, args.synthetic+1)]
+    # Windows given with another offset are generated (and labelled) in UTC
+    args.start, args.end = iso(parse_utc(args.start)), iso(parse_utc(args.end))
+    if args.end <= args.start:
+        parser.error("--end must be after --start")
+    if args.interval <= 0:
+        parser.error("--interval must be a positive number of minutes")
+    os.makedirs(args.out_dir, exist_ok=True)
+
+    options = dict(start=args.start, end=args.end, batteries=args.batteries, step_min=args.interval,
+                   outages=args.outages, noise=args.noise, stream=args.stream, out_dir=args.out_dir)
+    workers = min(args.workers or os.cpu_count() or 1, max(1, len(projects)))
+    if workers == 1:
+        for project_id in projects:
+            path, rows = generate_project(project_id, **options)
+            print('Wrote', path, f'({rows} telemetry rows)')
+        return 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(generate_project, project_id, **options) for project_id in projects]
+        for future in as_completed(futures):
+            path, rows = future.result()
+            print('Wrote', path, f'({rows} telemetry rows)')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Asynchronous optimization jobs for the web service
+Requests are queued and solved by a bounded pool of worker processes; clients poll
+the job (or follow its status events) and finished jobs are kept for a TTL
+"""
+
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Optional
+
+from model import init_solver_worker, run_optimization
+
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+FINISHED = (SUCCEEDED, FAILED)
+
+
+class QueueFullError(RuntimeError):
+    """Raised by JobQueue.submit() when max_pending jobs are already waiting"""
+
+
+class Job:
+    """One queued optimization request and, once finished, its outcome"""
+
+    def __init__(self, request: Dict, meta: Dict = None):
+        self.job_id = uuid.uuid4().hex
+        self.request = request
+        self.meta = meta or {}  # caller's data kept with the job, e.g. the response schema
+        self.status = QUEUED
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.results = None
+        self.error = None
+        self.metrics = None  # run_optimization() instrumentation
+        self.version = 0  # bumped on every status change, for event streams
+        self.future = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED
+
+    def to_dict(self) -> Dict:
+        """Status fields (results are formatted by the caller)"""
+        info = {
+            "job_id": self.job_id,
+            "status": self.status,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+        if self.error is not None:
+            info["error"] = self.error
+        return info
+
+
+class JobQueue:
+    """
+    Job store in front of a process pool of `workers` solver processes.
+    At most `workers` jobs run at once and at most `max_pending` wait; finished jobs
+    are dropped ttl_seconds after they finish. on_finish(job), when set, is called
+    once per finished job (e.g. to record metrics).
+    """
+
+    def __init__(self, workers: int = None, ttl_seconds: float = 3600, max_pending: int = 1000,
+                 on_finish=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.ttl_seconds = ttl_seconds
+        self.max_pending = max_pending
+        self.on_finish = on_finish
+        self._jobs = {}
+        self._changed = threading.Condition()
+        self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=init_solver_worker)
+        return self._executor
+
+    def submit(self, request: Dict, meta: Dict = None) -> Job:
+        """Queue a run_optimization() request and return its job"""
+        with self._changed:
+            self._purge_expired()
+            pending = sum(1 for job in self._jobs.values() if not job.finished)
+            if pending >= self.max_pending:
+                raise QueueFullError(f"{pending} jobs are already pending")
+            job = Job(request, meta)
+            self._jobs[job.job_id] = job
+            try:
+                job.future = self._get_executor().submit(run_optimization, request)
+            except BrokenProcessPool:
+                # A crashed worker breaks the pool for good; start a new one
+                self._executor = None
+                job.future = self._get_executor().submit(run_optimization, request)
+        job.future.add_done_callback(lambda future: self._finish(job, future))
+        return job
+
+    def _finish(self, job: Job, future):
+        try:
+            outcome = future.result()
+        except BrokenProcessPool as e:
+            outcome = {"status": "failed", "error": f"Worker process died: {e}"}
+            with self._changed:
+                self._executor = None
+        except Exception as e:
+            outcome = {"status": "failed", "error": f"{type(e).__name__}: {e}"}
+
+        with self._changed:
+            job.started_at = job.started_at or job.submitted_at
+            job.finished_at = time.time()
+            if outcome["status"] == "success":
+                job.status = SUCCEEDED
+                job.results = outcome["results"]
+            else:
+                job.status = FAILED
+                job.error = outcome["error"]
+            job.metrics = outcome.get("metrics")
+            job.request = None
+            job.version += 1
+            self._changed.notify_all()
+        if self.on_finish is not None:
+            self.on_finish(job)
+
+    def _refresh(self, job: Job):
+        """Mark a job running once the pool has handed it to a worker"""
+        if job.status == QUEUED and job.future is not None and job.future.running():
+            job.status = RUNNING
+            job.started_at = time.time()
+            job.version += 1
+
+    def _purge_expired(self):
+        now = time.time()
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished and now - job.finished_at > self.ttl_seconds]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """The job, or None if it is unknown or has expired"""
+        with self._changed:
+            self._purge_expired()
+            job = self._jobs.get(job_id)
+            if job is not None:
+                self._refresh(job)
+            return job
+
+    def wait(self, job_id: str, version: int, timeout: float) -> Optional[Job]:
+        """
+        Block until the job's version is newer than `version` (or it has finished)
+        or the timeout passes. Returns the job, or None if it is unknown.
+        """
+        deadline = time.time() + timeout
+        with self._changed:
+            while True:
+                job = self._jobs.get(job_id)
+                if job is None:
+                    return None
+                self._refresh(job)
+                remaining = deadline - time.time()
+                if job.version > version or job.finished or remaining <= 0:
+                    return job
+                # The pool has no "started" callback, so re-check for RUNNING regularly
+                self._changed.wait(min(remaining, 0.5))
+
+    def stats(self) -> Dict:
+        """Pool size, TTL and job counts per status"""
+        with self._changed:
+            counts = {QUEUED: 0, RUNNING: 0, SUCCEEDED: 0, FAILED: 0}
+            for job in self._jobs.values():
+                self._refresh(job)
+                counts[job.status] += 1
+            return {"workers": self.workers, "ttl_seconds": self.ttl_seconds, "jobs": counts}
+
+    def shutdown(self):
+        """Stop the worker processes (queued jobs are cancelled)"""
+        with self._changed:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+_default_queue = None
+
+
+def get_job_queue() -> JobQueue:
+    """
+    Process-wide job queue used by app.py, configured from OPTIMIZER_JOB_WORKERS,
+    OPTIMIZER_JOB_TTL and OPTIMIZER_JOB_MAX_PENDING on first use
+    """
+    global _default_queue
+    if _default_queue is None:
+        _default_queue = JobQueue(
+            workers=int(os.environ.get("OPTIMIZER_JOB_WORKERS", 0)) or None,
+            ttl_seconds=float(os.environ.get("OPTIMIZER_JOB_TTL", 3600)),
+            max_pending=int(os.environ.get("OPTIMIZER_JOB_MAX_PENDING", 1000)),
+        )
+    return _default_queue
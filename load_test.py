@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+Load test for the BESS Optimization Web Service
+Drives POST /optimize with a configurable concurrency, arrival rate and payload
+mix (24-slot to multi-week horizons) and writes one JSON report per run with
+throughput, latency percentiles, error rate and the server's CPU/RSS over time.
+
+    python load_test.py --start-server --concurrency 4 --duration 30
+    python load_test.py --rate 5 --mix 24:6,168:3,2016:1 --server-pid 1234
+    python load_test.py --compare load_reports/a.json load_reports/b.json
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import requests
+
+from benchmark import synthetic_prices
+
+
+# Horizon (slots) -> relative weight; 24 slots = one day of hourly prices,
+# 168 slots = one week, 672 slots = four weeks
+DEFAULT_MIX = {24: 6, 168: 3, 672: 1}
+DEFAULT_DURATIONS = [2, 1, 3, 1]
+REPORT_DIR = "load_reports"
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def parse_mix(spec: str) -> Dict[int, float]:
+    """'24:6,168:3,2016:1' -> {24: 6.0, 168: 3.0, 2016: 1.0}"""
+    mix = {}
+    for item in spec.split(","):
+        slots, _, weight = item.partition(":")
+        mix[int(slots)] = float(weight or 1)
+    if not mix or min(mix) <= 0 or min(mix.values()) <= 0:
+        raise ValueError(f"Invalid payload mix '{spec}'")
+    return mix
+
+
+class PayloadFactory:
+    """
+    Draws /optimize payloads from the horizon mix.
+    With unique=True every payload gets its own price series, so the server's
+    result cache cannot answer it; unique=False repeats one payload per horizon.
+    """
+
+    def __init__(self, mix: Dict[int, float], durations: List[int] = None, engine: str = None,
+                 solver: str = None, unique: bool = True, seed: int = 0):
+        self.sizes = sorted(mix)
+        self.weights = [mix[slots] for slots in self.sizes]
+        self.durations = durations or DEFAULT_DURATIONS
+        self.engine = engine
+        self.solver = solver
+        self.unique = unique
+        self._rng = random.Random(seed)
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def next(self) -> Tuple[int, Dict]:
+        with self._lock:
+            slots = self._rng.choices(self.sizes, self.weights)[0]
+            seed = next(self._counter) if self.unique else 0
+        payload = {
+            "electricity_prices": synthetic_prices(slots, seed=2 * seed + 1),
+            "labor_costs": synthetic_prices(slots, seed=2 * seed + 2),
+            "maintenance_durations": self.durations,
+        }
+        if self.engine:
+            payload["engine"] = self.engine
+        if self.solver:
+            payload["solver"] = self.solver
+        return slots, payload
+
+
+def process_tree(pid: int) -> List[int]:
+    """pid and all its descendants (Flask's reloader and solver pools run as children)"""
+    pids, stack = [], [pid]
+    while stack:
+        current = stack.pop()
+        pids.append(current)
+        try:
+            for task in os.listdir(f"/proc/{current}/task"):
+                with open(f"/proc/{current}/task/{task}/children") as f:
+                    stack.extend(int(child) for child in f.read().split())
+        except OSError:
+            continue
+    return pids
+
+
+def read_process_usage(pid: int) -> Optional[Tuple[float, int]]:
+    """(CPU seconds, RSS bytes) of a process tree from /proc, or None if unavailable"""
+    cpu, rss, found = 0.0, 0, False
+    for current in process_tree(pid):
+        try:
+            with open(f"/proc/{current}/stat") as f:
+                # Fields after the command name; utime and stime are fields 14 and 15
+                fields = f.read().rsplit(")", 1)[1].split()
+            with open(f"/proc/{current}/statm") as f:
+                resident = int(f.read().split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        cpu += (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+        rss += resident * PAGE_SIZE
+        found = True
+    return (cpu, rss) if found else None
+
+
+class ServerSampler(threading.Thread):
+    """Samples the server's CPU utilisation and RSS every `interval` seconds"""
+
+    def __init__(self, pid: int, interval: float = 1.0):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.samples = []
+        self._done = threading.Event()
+        self._origin = time.perf_counter()
+
+    def run(self):
+        previous = read_process_usage(self.pid)
+        previous_time = time.perf_counter()
+        stopped = False
+        while not stopped:
+            # One last sample when stopped, so short runs still get a reading
+            stopped = self._done.wait(self.interval)
+            usage = read_process_usage(self.pid)
+            now = time.perf_counter()
+            if usage is not None and previous is not None and now > previous_time:
+                self.samples.append({
+                    "t": round(now - self._origin, 3),
+                    "cpu_percent": round(100 * (usage[0] - previous[0]) / (now - previous_time), 1),
+                    "rss_mib": round(usage[1] / 2 ** 20, 1),
+                })
+            previous, previous_time = usage, now
+
+    def stop(self) -> List[Dict]:
+        self._done.set()
+        self.join()
+        return self.samples
+
+
+def send_request(session: requests.Session, url: str, slots: int, payload: Dict,
+                 scheduled: float, timeout: float) -> Dict:
+    """
+    POST one payload. Latency runs from the scheduled send time, so with a fixed
+    arrival rate time spent waiting for a free client slot counts too.
+    """
+    status, error = None, None
+    try:
+        response = session.post(f"{url}/optimize", json=payload, timeout=timeout)
+        status = response.status_code
+        if status != 200:
+            error = f"HTTP {status}"
+        elif response.json().get("status") != "success":
+            error = response.json().get("error", "optimization failed")
+    except requests.RequestException as e:
+        error = type(e).__name__
+    finished = time.perf_counter()
+    return {"slots": slots, "scheduled": scheduled, "finished": finished,
+            "latency": finished - scheduled, "status": status, "error": error}
+
+
+def run_load(url: str, factory: PayloadFactory, concurrency: int = 4, rate: float = None,
+             duration: float = 30.0, max_requests: int = None, timeout: float = 120.0,
+             seed: int = 0) -> Tuple[List[Dict], float]:
+    """
+    Send requests for `duration` seconds (or until max_requests were sent).
+    rate=None is a closed loop: `concurrency` clients send back to back.
+    With a rate, requests arrive as a Poisson process of `rate` per second and
+    at most `concurrency` are in flight. Returns (samples, elapsed seconds).
+    """
+    results, lock = [], threading.Lock()
+    local = threading.local()
+    started = time.perf_counter()
+    deadline = started + duration
+    sent = itertools.count()
+
+    def session() -> requests.Session:
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        return local.session
+
+    def record(sample):
+        with lock:
+            results.append(sample)
+
+    def budget_left() -> bool:
+        return time.perf_counter() < deadline and (max_requests is None or next(sent) < max_requests)
+
+    if rate is None:
+        def client():
+            while budget_left():
+                slots, payload = factory.next()
+                record(send_request(session(), url, slots, payload, time.perf_counter(), timeout))
+
+        threads = [threading.Thread(target=client) for _ in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    else:
+        rng = random.Random(seed)
+        next_arrival = started
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            while budget_left():
+                delay = next_arrival - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                slots, payload = factory.next()
+                pool.submit(lambda *args: record(send_request(session(), *args)),
+                            url, slots, payload, next_arrival, timeout)
+                next_arrival += rng.expovariate(rate)
+    return results, time.perf_counter() - started
+
+
+def latency_summary(latencies: List[float]) -> Dict:
+    """Count and p50/p95/p99/mean/max in milliseconds"""
+    if not latencies:
+        return {"count": 0}
+    ms = np.asarray(latencies) * 1000
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {"count": len(ms), "p50": round(float(p50), 2), "p95": round(float(p95), 2),
+            "p99": round(float(p99), 2), "mean": round(float(ms.mean()), 2), "max": round(float(ms.max()), 2)}
+
+
+def build_report(samples: List[Dict], elapsed: float, config: Dict,
+                 server_samples: List[Dict] = None) -> Dict:
+    """Aggregate request samples into the report written for each run"""
+    ok = [s for s in samples if s["error"] is None]
+    errors = {}
+    for s in samples:
+        if s["error"] is not None:
+            errors[s["error"]] = errors.get(s["error"], 0) + 1
+
+    by_size = {}
+    for slots in sorted({s["slots"] for s in samples}):
+        group = [s for s in samples if s["slots"] == slots]
+        by_size[str(slots)] = dict(latency_summary([s["latency"] for s in group if s["error"] is None]),
+                                   errors=sum(s["error"] is not None for s in group))
+
+    # Completions per whole second since the start, for throughput over time
+    timeline = {}
+    start = min((s["scheduled"] for s in samples), default=0.0)
+    for s in samples:
+        second = int(s["finished"] - start)
+        bucket = timeline.setdefault(second, {"t": second, "completed": 0, "errors": 0, "latencies": []})
+        bucket["completed"] += 1
+        if s["error"] is None:
+            bucket["latencies"].append(s["latency"])
+        else:
+            bucket["errors"] += 1
+    timeline = [{"t": b["t"], "completed": b["completed"], "errors": b["errors"],
+                 "p95_ms": latency_summary(b["latencies"]).get("p95")}
+                for _, b in sorted(timeline.items())]
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": config,
+        "elapsed_seconds": round(elapsed, 3),
+        "requests": len(samples),
+        "succeeded": len(ok),
+        "error_rate": round(1 - len(ok) / len(samples), 4) if samples else 0.0,
+        "errors": errors,
+        "throughput_rps": round(len(ok) / elapsed, 3) if elapsed > 0 else 0.0,
+        "latency_ms": latency_summary([s["latency"] for s in ok]),
+        "by_horizon": by_size,
+        "timeline": timeline,
+    }
+    if server_samples:
+        report["server"] = {
+            "cpu_percent_mean": round(float(np.mean([s["cpu_percent"] for s in server_samples])), 1),
+            "cpu_percent_max": max(s["cpu_percent"] for s in server_samples),
+            "rss_mib_max": max(s["rss_mib"] for s in server_samples),
+            "samples": server_samples,
+        }
+    return report
+
+
+def print_report(report: Dict):
+    latency = report["latency_ms"]
+    print(f"Requests:    {report['requests']} in {report['elapsed_seconds']:.1f}s "
+          f"({report['throughput_rps']:.2f} successful req/s)")
+    print(f"Error rate:  {report['error_rate']:.2%} {report['errors'] or ''}")
+    if latency["count"]:
+        print(f"Latency ms:  p50 {latency['p50']:.1f}  p95 {latency['p95']:.1f}  "
+              f"p99 {latency['p99']:.1f}  max {latency['max']:.1f}")
+    print(f"{'slots':>8} {'count':>7} {'errors':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for slots, row in report["by_horizon"].items():
+        if row["count"]:
+            print(f"{slots:>8} {row['count']:>7} {row['errors']:>7} "
+                  f"{row['p50']:>9.1f} {row['p95']:>9.1f} {row['p99']:>9.1f}")
+        else:
+            print(f"{slots:>8} {0:>7} {row['errors']:>7}")
+    if "server" in report:
+        server = report["server"]
+        print(f"Server:      CPU mean {server['cpu_percent_mean']:.0f}% "
+              f"(max {server['cpu_percent_max']:.0f}%), RSS max {server['rss_mib_max']:.0f} MiB")
+
+
+def compare_reports(paths: List[str]):
+    """Print the headline figures of several reports side by side"""
+    reports = []
+    for path in paths:
+        with open(path) as f:
+            reports.append(json.load(f))
+    rows = [
+        ("concurrency", lambda r: r["config"]["concurrency"]),
+        ("rate (req/s)", lambda r: r["config"]["rate"] or "closed"),
+        ("requests", lambda r: r["requests"]),
+        ("throughput req/s", lambda r: r["throughput_rps"]),
+        ("error rate", lambda r: r["error_rate"]),
+        ("p50 ms", lambda r: r["latency_ms"].get("p50")),
+        ("p95 ms", lambda r: r["latency_ms"].get("p95")),
+        ("p99 ms", lambda r: r["latency_ms"].get("p99")),
+        ("server CPU % mean", lambda r: r.get("server", {}).get("cpu_percent_mean")),
+        ("server RSS MiB max", lambda r: r.get("server", {}).get("rss_mib_max")),
+    ]
+    print(f"{'':<20}" + "".join(f"{os.path.basename(path)[:22]:>24}" for path in paths))
+    for label, value in rows:
+        print(f"{label:<20}" + "".join(f"{str(value(r)):>24}" for r in reports))
+
+
+def start_server(url: str, wait: float = 30.0) -> subprocess.Popen:
+    """Start app.py in a subprocess (as test_api.py does) and wait until /health answers"""
+    process = subprocess.Popen([sys.executable, "app.py"], stdout=subprocess.DEVNULL,
+                               stderr=subprocess.DEVNULL,
+                               cwd=os.path.dirname(os.path.abspath(__file__)))
+    deadline = time.time() + wait
+    while time.time() < deadline:
+        try:
+            if requests.get(f"{url}/health", timeout=1).status_code == 200:
+                return process
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"Server at {url} did not become healthy within {wait:.0f}s")
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load test for POST /optimize")
+    parser.add_argument("--url", default="http://localhost:5000")
+    parser.add_argument("--start-server", action="store_true", help="run app.py for the test")
+    parser.add_argument("--server-pid", type=int, help="sample CPU/RSS of this running server")
+    parser.add_argument("--concurrency", type=int, default=4, help="clients / requests in flight")
+    parser.add_argument("--rate", type=float, help="arrivals per second (default: closed loop)")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to send requests")
+    parser.add_argument("--requests", type=int, help="stop after this many requests")
+    parser.add_argument("--mix", default=",".join(f"{k}:{v}" for k, v in DEFAULT_MIX.items()),
+                        help="horizon mix as slots:weight,... (default %(default)s)")
+    parser.add_argument("--durations", type=int, nargs="+", default=DEFAULT_DURATIONS)
+    parser.add_argument("--engine")
+    parser.add_argument("--solver")
+    parser.add_argument("--repeat-payloads", action="store_true",
+                        help="reuse one payload per horizon (measures cache hits)")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--sample-interval", type=float, default=1.0)
+    parser.add_argument("--output", help=f"report path (default {REPORT_DIR}/load-<time>.json)")
+    parser.add_argument("--compare", nargs="+", metavar="REPORT", help="compare saved reports and exit")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare_reports(args.compare)
+        return 0
+
+    url = args.url.rstrip("/")
+    server = start_server(url) if args.start_server else None
+    server_pid = server.pid if server is not None else args.server_pid
+    config = {key: getattr(args, key) for key in
+              ("url", "concurrency", "rate", "duration", "requests", "mix", "durations",
+               "engine", "solver", "repeat_payloads", "seed")}
+
+    sampler = ServerSampler(server_pid, args.sample_interval) if server_pid else None
+    try:
+        factory = PayloadFactory(parse_mix(args.mix), args.durations, args.engine, args.solver,
+                                 unique=not args.repeat_payloads, seed=args.seed)
+        if sampler is not None:
+            sampler.start()
+        mode = f"{args.rate}/s arrivals" if args.rate else "closed loop"
+        print(f"Load test: {args.concurrency} concurrent, {mode}, {args.duration:.0f}s, mix {args.mix}")
+        samples, elapsed = run_load(url, factory, concurrency=args.concurrency, rate=args.rate,
+                                    duration=args.duration, max_requests=args.requests,
+                                    timeout=args.timeout, seed=args.seed)
+        server_samples = sampler.stop() if sampler is not None else None
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    report = build_report(samples, elapsed, config, server_samples)
+    output = args.output or os.path.join(REPORT_DIR, time.strftime("load-%Y%m%d-%H%M%S.json"))
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print_report(report)
+    print(f"Report written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,6 +11,7 @@ from model import MaintenanceOptimizer
 import matplotlib
 matplotlib.use('Agg')  # Use non-interactive backend
 import matplotlib.pyplot as plt
+import numpy as np
 from typing import Tuple
 
 
@@ -25,10 +26,11 @@ def plot_results(optimizer: MaintenanceOptimizer, figsize: Tuple[int, int] = (12
     
     fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=figsize)
     
-    hours = [t * optimizer.dt for t in optimizer.T]
-    elec_prices = [optimizer.P_elec.get(t, 0) for t in optimizer.T]
-    labor_prices = [optimizer.P_labor.get(t, 0) for t in optimizer.T]
-    total_prices = [elec_prices[i] + labor_prices[i] for i in range(len(hours))]
+    # Price arrays and per-slot totals come from the optimizer's window-cost table
+    hours = np.asarray(optimizer.T) * optimizer.dt
+    elec_prices = optimizer.elec_prices
+    labor_prices = optimizer.labor_prices
+    total_prices = optimizer.window_costs.slot_costs
     
     # 1. Electricity prices as bar chart
     ax1.bar(hours, elec_prices, width=1.0, color='skyblue', edgecolor='blue', alpha=0.7, label='Electricity Price')
@@ -58,9 +60,7 @@ def plot_results(optimizer: MaintenanceOptimizer, figsize: Tuple[int, int] = (12
     y_offset = -max(total_prices) * 0.05  # Start position below the x-axis
     
     for i, event in enumerate(results['events']):
-        schedule = event.get('service_schedule', {})
-        
-        if any(schedule.get(t, False) for t in optimizer.T):  # Only plot if there's maintenance scheduled
+        if 'start_time' in event:  # Only plot if there's maintenance scheduled
             color = colors[i % len(colors)]
             duration = event.get('duration', 'N/A')
             total_cost = event.get('total_cost', 0)
@@ -70,22 +70,8 @@ def plot_results(optimizer: MaintenanceOptimizer, figsize: Tuple[int, int] = (12
             # All events on the same horizontal line
             y_position = y_offset
             
-            # Find continuous maintenance periods for this event
-            maintenance_periods = []
-            start_time = None
-            
-            for t in optimizer.T:
-                if schedule.get(t, False):  # Maintenance is active
-                    if start_time is None:
-                        start_time = t
-                else:  # Maintenance is not active
-                    if start_time is not None:
-                        maintenance_periods.append((start_time, t - 1))
-                        start_time = None
-            
-            # Handle case where maintenance continues to the end
-            if start_time is not None:
-                maintenance_periods.append((start_time, optimizer.T[-1]))
+            # Each event is one continuous maintenance period
+            maintenance_periods = [(event['start_time'], event['end_time'])]
             
             # Draw rectangles for each maintenance period at the bottom
             for start_t, end_t in maintenance_periods:
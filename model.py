@@ -4,9 +4,438 @@ BESS Maintenance Optimization Model
 MaintenanceOptimizer class for optimal maintenance window scheduling
 """
 
-import pulp
-from typing import Dict, List
+import contextlib
 import os
+import time
+import pulp
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+from cache import ResultCache, get_cache, request_key
+from solvers import get_backend, model_constraints
+
+
+# Available optimization engines:
+#   "milp" - PuLP model solved by CBC (or another installed MILP solver)
+#   "dp"   - exact dynamic programming over slots and already placed events
+#   "heuristic" - greedy placement + local search, checked against the MILP's
+#                 LP-relaxation bound; the MILP only runs when the gap is too large
+ENGINES = ("milp", "dp", "heuristic")
+
+# Largest DP table (time slots x event states) the "dp" engine will allocate
+# before falling back to the MILP engine.
+DP_MAX_TABLE_SIZE = 5_000_000
+
+# Relative gap up to which a solve with a gap target still counts as optimal
+# (the default MIP gap tolerance of HiGHS and CBC)
+OPTIMALITY_GAP = 1e-4
+
+# Proven gap up to which the "heuristic" engine returns its plan without running
+# the MILP (solve(gap=...) overrides it)
+HEURISTIC_GAP = 0.01
+
+
+def _dp_event_groups(durations: List[int]) -> Tuple[List[int], List[int], List[int], int]:
+    """
+    Group events by duration for the DP state space.
+    Events with the same duration are interchangeable, so a DP state only needs to
+    know how many events of each duration are still unplaced. States are encoded
+    as mixed-radix integers: digit g holds the remaining count for lengths[g].
+    Returns (lengths, counts, strides, num_states).
+    """
+    lengths = sorted(set(durations))
+    counts = [durations.count(L) for L in lengths]
+    strides = []
+    num_states = 1
+    for count in counts:
+        strides.append(num_states)
+        num_states *= count + 1
+    return lengths, counts, strides, num_states
+
+
+def dp_table_size(num_slots: int, durations: List[int]) -> int:
+    """Number of cells the DP cost-to-go table needs for this problem"""
+    return (num_slots + 1) * _dp_event_groups(durations)[3]
+
+
+def _price_array(prices, num_slots: int) -> np.ndarray:
+    """
+    Contiguous float array of per-slot prices.
+    Accepts the {slot: price} dicts used throughout the API (missing slots cost 0)
+    or any sequence/array indexed by slot.
+    """
+    if isinstance(prices, dict):
+        return np.fromiter((prices.get(t, 0) for t in range(num_slots)), dtype=float, count=num_slots)
+    values = np.asarray(prices, dtype=float)[:num_slots]
+    if len(values) < num_slots:
+        values = np.concatenate((values, np.zeros(num_slots - len(values))))
+    return values
+
+
+class WindowCostTable:
+    """
+    Cost of running maintenance from every start slot for every event duration.
+    
+    Built once per model from cumulative sums: the window [t, t+L) costs
+    cum[t+L] - cum[t], so every lookup is O(1) and the whole table is O(H) per
+    distinct duration. Index the per-duration arrays by start slot; they have
+    H - L + 1 entries (one per start that still completes inside the horizon).
+    """
+    
+    def __init__(self, elec_prices: np.ndarray, labor_prices: np.ndarray, durations: List[int]):
+        self.elec_prices = np.asarray(elec_prices, dtype=float)
+        self.labor_prices = np.asarray(labor_prices, dtype=float)
+        self.slot_costs = self.elec_prices + self.labor_prices
+        self.num_slots = len(self.slot_costs)
+        
+        cum_elec = np.concatenate(([0.0], np.cumsum(self.elec_prices)))
+        cum_labor = np.concatenate(([0.0], np.cumsum(self.labor_prices)))
+        self.elec = {}
+        self.labor = {}
+        self.total = {}
+        for L in sorted(set(durations)):
+            if L > self.num_slots:
+                empty = np.zeros(0)
+                self.elec[L], self.labor[L], self.total[L] = empty, empty, empty
+                continue
+            self.elec[L] = cum_elec[L:] - cum_elec[:-L]
+            self.labor[L] = cum_labor[L:] - cum_labor[:-L]
+            self.total[L] = self.elec[L] + self.labor[L]
+    
+    def cost(self, start: int, duration: int) -> float:
+        """Total (electricity + labor) cost of a window"""
+        return float(self.total[duration][start])
+    
+    def breakdown(self, start: int, duration: int) -> Tuple[float, float, float]:
+        """(electricity, labor, total) cost of a window"""
+        return (float(self.elec[duration][start]), float(self.labor[duration][start]),
+                float(self.total[duration][start]))
+
+
+def _dp_cost_to_go(slot_costs, durations: List[int], window_costs: Dict[int, np.ndarray] = None,
+                   deferral_costs: List[Optional[float]] = None):
+    """
+    Backward pass of the window DP: f[t][s] is the cheapest way to place the
+    remaining events s inside slots [t, H) (see solve_windows_dp).
+    Returns (f, window_costs, movable) where movable lists per duration group
+    (L, stride, states holding such an event, state after placing one).
+    """
+    costs = np.asarray(slot_costs, dtype=float)
+    H = len(costs)
+    lengths, counts, strides, num_states = _dp_event_groups(durations)
+    if deferral_costs is None:
+        deferral_costs = [None] * len(durations)
+    if window_costs is None:
+        window_costs = WindowCostTable(costs, np.zeros(H), durations).total
+    states = np.arange(num_states)
+    # For each duration group: states that still hold such an event, and the state
+    # reached after placing one of them
+    movable = []
+    for L, count, stride in zip(lengths, counts, strides):
+        has_event = (states // stride) % (count + 1) > 0
+        movable.append((L, stride, states[has_event], states[has_event] - stride))
+    
+    # Cost of the events still unplaced at the end of the horizon: deferring m events
+    # of a group costs its m smallest deferral costs (inf once a mandatory one is left)
+    f = np.full((H + 1, num_states), np.inf)
+    terminal = np.zeros(num_states)
+    for L, count, stride in zip(lengths, counts, strides):
+        group_costs = sorted(float('inf') if deferral_costs[i] is None else deferral_costs[i]
+                             for i, d in enumerate(durations) if d == L)
+        cumulative = np.concatenate(([0.0], np.cumsum(group_costs)))
+        terminal += cumulative[(states // stride) % (count + 1)]
+    f[H] = terminal
+    for t in range(H - 1, -1, -1):
+        best = f[t + 1].copy()  # leave slot t idle
+        for L, stride, src, dst in movable:
+            if t + L <= H:
+                best[src] = np.minimum(best[src], window_costs[L][t] + f[t + L, dst])
+        f[t] = best
+    return f, window_costs, movable
+
+
+def slot_plan_costs(slot_costs, durations: List[int], window_costs: Dict[int, np.ndarray] = None,
+                    deferral_costs: List[Optional[float]] = None) -> Tuple[float, np.ndarray, np.ndarray]:
+    """
+    For every slot, the cost of the cheapest plan that uses it and of the cheapest
+    plan that leaves it idle.
+    
+    Combines the backward cost-to-go f[t][s] with a forward pass g[t][s] (cheapest
+    way to reach slot t with events s still unplaced): a plan idles at slot t at
+    cost min_s g[t][s] + f[t+1][s], and uses the window [t, t+L) at cost
+    min_s g[t][s] + w_L(t) + f[t+L][s'] - every slot in the window gets that cost.
+    Two O(H * states * lengths) passes instead of one re-solve per slot.
+    
+    Returns (optimal cost, cost_use per slot, cost_avoid per slot); inf where
+    no feasible plan uses (avoids) the slot.
+    """
+    H = len(np.asarray(slot_costs))
+    lengths, counts, strides, num_states = _dp_event_groups(durations)
+    full = sum(count * stride for count, stride in zip(counts, strides))
+    f, window_costs, movable = _dp_cost_to_go(slot_costs, durations, window_costs, deferral_costs)
+    
+    g = np.full((H + 1, num_states), np.inf)
+    g[0, full] = 0.0
+    cost_avoid = np.empty(H)
+    cost_use = np.full(H, np.inf)
+    for t in range(H):
+        g[t + 1] = np.minimum(g[t + 1], g[t])
+        cost_avoid[t] = np.min(g[t] + f[t + 1])
+        for L, stride, src, dst in movable:
+            if t + L <= H:
+                via = g[t, src] + window_costs[L][t]
+                g[t + L, dst] = np.minimum(g[t + L, dst], via)
+                window = np.min(via + f[t + L, dst])
+                cost_use[t:t + L] = np.minimum(cost_use[t:t + L], window)
+    return float(f[0, full]), cost_use, cost_avoid
+
+
+def solve_windows_dp(slot_costs, durations: List[int],
+                     window_costs: Dict[int, np.ndarray] = None,
+                     deferral_costs: List[Optional[float]] = None) -> Tuple[float, List[Optional[int]]]:
+    """
+    Exact solver for placing non-overlapping fixed-length maintenance windows.
+    
+    slot_costs: cost of having maintenance active in each slot (P_elec + P_labor)
+    durations: length of each maintenance event in slots
+    window_costs: optional {duration: cost per start slot} (WindowCostTable.total);
+        computed from slot_costs when omitted
+    deferral_costs: optional cost of leaving each event unscheduled
+        (None entries are mandatory events)
+    
+    f[t][s] is the cheapest way to place the remaining events s inside slots
+    [t, H). Each slot is either left idle or starts one of the remaining events,
+    and window costs come from prefix sums, so the solve is O(H * states * lengths).
+    Events left over at the end are deferred; within a duration group the ones
+    with the cheapest deferral costs are deferred first.
+    
+    Returns (total_cost, start slot per event); deferred events have start None.
+    total_cost is inf and all starts are None when the events cannot fit into the horizon.
+    """
+    H = len(np.asarray(slot_costs))
+    lengths, counts, strides, _ = _dp_event_groups(durations)
+    full = sum(count * stride for count, stride in zip(counts, strides))
+    if deferral_costs is None:
+        deferral_costs = [None] * len(durations)
+    
+    def deferral_key(i):
+        return float('inf') if deferral_costs[i] is None else deferral_costs[i]
+    
+    f, window_costs, _ = _dp_cost_to_go(slot_costs, durations, window_costs, deferral_costs)
+    total = f[0, full]
+    if not np.isfinite(total):
+        return float('inf'), [None] * len(durations)
+    
+    # Walk the table forward, handing out event indices in order of appearance
+    # (events that are most expensive to defer are placed first)
+    unassigned = {L: sorted((i for i, d in enumerate(durations) if d == L),
+                            key=lambda i: (-deferral_key(i), i))
+                  for L in lengths}
+    starts = [None] * len(durations)
+    t, s = 0, full
+    while s != 0 and t < H:
+        for L, stride, count in zip(lengths, strides, counts):
+            if t + L <= H and (s // stride) % (count + 1) > 0:
+                if f[t, s] == window_costs[L][t] + f[t + L, s - stride]:
+                    starts[unassigned[L].pop(0)] = t
+                    s -= stride
+                    t += L
+                    break
+        else:
+            t += 1
+    
+    return float(total), starts
+
+
+def solve_windows_kbest(slot_costs, durations: List[int], k: int,
+                        window_costs: Dict[int, np.ndarray] = None,
+                        deferral_costs: List[Optional[float]] = None) -> List[Tuple[float, List[Optional[int]]]]:
+    """
+    The k cheapest distinct plans, cheapest first (k-best version of solve_windows_dp).
+    
+    Plans are distinct when they use different sets of (start, duration) windows;
+    relabelling interchangeable events does not make a new plan. Every plan is a
+    path through the DP's (slot, remaining events) states, so instead of one
+    cost-to-go per state the table keeps the k best, each with the decision and
+    the rank it continues with. One backward pass is O(H * states * lengths * k log k).
+    
+    Returns up to k (total_cost, start slot per event) pairs; fewer when fewer
+    feasible plans exist.
+    """
+    costs = np.asarray(slot_costs, dtype=float)
+    H = len(costs)
+    lengths, counts, strides, num_states = _dp_event_groups(durations)
+    full = sum(count * stride for count, stride in zip(counts, strides))
+    if deferral_costs is None:
+        deferral_costs = [None] * len(durations)
+    
+    def deferral_key(i):
+        return float('inf') if deferral_costs[i] is None else deferral_costs[i]
+    
+    if window_costs is None:
+        window_costs = WindowCostTable(costs, np.zeros(H), durations).total
+    states = np.arange(num_states)
+    movable = []
+    for L, count, stride in zip(lengths, counts, strides):
+        has_event = (states // stride) % (count + 1) > 0
+        movable.append((L, stride, states[has_event], states[has_event] - stride))
+    
+    # f[t, s] holds the k best costs-to-go; choice[t, s, r] = option * k + rank of
+    # the continuation (option 0 = slot t idle, option g + 1 = start a group-g event)
+    f = np.full((H + 1, num_states, k), np.inf)
+    choice = np.zeros((H + 1, num_states, k), dtype=np.int64)
+    f[H, :, 0] = 0.0  # a single way to end: defer what is left
+    for L, count, stride in zip(lengths, counts, strides):
+        group_costs = sorted(deferral_key(i) for i, d in enumerate(durations) if d == L)
+        cumulative = np.concatenate(([0.0], np.cumsum(group_costs)))
+        f[H, :, 0] += cumulative[(states // stride) % (count + 1)]
+    candidates = np.empty((num_states, (len(lengths) + 1) * k))
+    for t in range(H - 1, -1, -1):
+        candidates.fill(np.inf)
+        candidates[:, :k] = f[t + 1]
+        for g, (L, stride, src, dst) in enumerate(movable):
+            if t + L <= H:
+                candidates[src, (g + 1) * k:(g + 2) * k] = window_costs[L][t] + f[t + L, dst]
+        order = np.argsort(candidates, axis=1, kind='stable')[:, :k]
+        f[t] = np.take_along_axis(candidates, order, axis=1)
+        choice[t] = order
+    
+    plans = []
+    for rank in range(k):
+        total = f[0, full, rank]
+        if not np.isfinite(total):
+            break
+        unassigned = {L: sorted((i for i, d in enumerate(durations) if d == L),
+                                key=lambda i: (-deferral_key(i), i))
+                      for L in lengths}
+        starts = [None] * len(durations)
+        t, s, r = 0, full, rank
+        while t < H:
+            option, r = divmod(int(choice[t, s, r]), k)
+            if option == 0:
+                t += 1
+                continue
+            L, stride = lengths[option - 1], strides[option - 1]
+            starts[unassigned[L].pop(0)] = t
+            s -= stride
+            t += L
+        plans.append((float(total), starts))
+    return plans
+
+
+def solve_windows_heuristic(window_costs: Dict[int, np.ndarray], durations: List[int],
+                            num_slots: int, deferral_costs: List[Optional[float]] = None,
+                            max_passes: int = 20) -> Tuple[float, List[Optional[int]]]:
+    """
+    Fast approximate solver for the same problem as solve_windows_dp.
+    
+    Greedy: events are placed longest first, each in the cheapest window that does
+    not overlap the events already placed (or deferred, when deferring is cheaper).
+    If that leaves a mandatory event without room, the start is all events packed
+    back to back from slot 0 instead.
+    Local search then repeats until no move helps:
+      - relocate: move one event to its cheapest free window (or defer it)
+      - swap: give one event the cheapest window it would have on an empty
+        horizon, and re-place the events that were in the way
+    Each move is a vectorized scan of one window-cost array, so a pass costs
+    O(events * slots) numpy work.
+    
+    Returns (total_cost, start slot per event) like solve_windows_dp; total_cost is
+    inf when the mandatory events do not fit into the horizon.
+    """
+    if deferral_costs is None:
+        deferral_costs = [None] * len(durations)
+    occupied = np.zeros(num_slots, dtype=bool)
+    starts = [None] * len(durations)
+    
+    def cheapest(i) -> Tuple[float, Optional[int]]:
+        """Cheapest free window for event i, or (deferral cost, None)"""
+        L = durations[i]
+        costs = window_costs[L]
+        best_cost = float('inf') if deferral_costs[i] is None else deferral_costs[i]
+        best_start = None
+        if len(costs):
+            used = np.concatenate(([0], np.cumsum(occupied)))
+            free = (used[L:] - used[:-L]) == 0
+            if free.any():
+                t = int(np.argmin(np.where(free, costs, np.inf)))
+                if costs[t] < best_cost:
+                    best_cost, best_start = float(costs[t]), t
+        return best_cost, best_start
+    
+    def event_cost(i) -> float:
+        if starts[i] is None:
+            return float('inf') if deferral_costs[i] is None else deferral_costs[i]
+        return float(window_costs[durations[i]][starts[i]])
+    
+    def place(i, start):
+        starts[i] = start
+        if start is not None:
+            occupied[start:start + durations[i]] = True
+    
+    def remove(i):
+        if starts[i] is not None:
+            occupied[starts[i]:starts[i] + durations[i]] = False
+        starts[i] = None
+    
+    order = sorted(range(len(durations)), key=lambda i: (-durations[i], i))
+    for i in order:
+        place(i, cheapest(i)[1])
+    if not np.isfinite(sum(event_cost(i) for i in order)):
+        # Greedy fragmented the horizon: start from the events packed back to back
+        occupied[:] = False
+        t = 0
+        for i in order:
+            fits = t + durations[i] <= num_slots
+            place(i, t if fits else None)
+            t += durations[i] if fits else 0
+    
+    for _ in range(max_passes):
+        improved = False
+        for i in order:
+            # Relocate
+            current = event_cost(i)
+            previous = starts[i]
+            remove(i)
+            cost, start = cheapest(i)
+            if cost < current - 1e-12:
+                place(i, start)
+                improved = True
+                continue
+            place(i, previous)
+            
+            # Swap into the window i would take on an empty horizon
+            costs = window_costs[durations[i]]
+            if not len(costs):
+                continue
+            target = int(np.argmin(costs))
+            end = target + durations[i]
+            blockers = [j for j in range(len(durations)) if j != i and starts[j] is not None
+                        and starts[j] < end and target < starts[j] + durations[j]]
+            if not blockers:
+                continue
+            moved = [i] + blockers
+            before = [starts[j] for j in moved]
+            current = sum(event_cost(j) for j in moved)
+            for j in moved:
+                remove(j)
+            place(i, target)
+            for j in sorted(blockers, key=lambda j: (-durations[j], j)):
+                place(j, cheapest(j)[1])
+            if sum(event_cost(j) for j in moved) < current - 1e-12:
+                improved = True
+            else:
+                for j in moved:
+                    remove(j)
+                for j, start in zip(moved, before):
+                    place(j, start)
+        if not improved:
+            break
+    
+    total = sum(event_cost(i) for i in range(len(durations)))
+    if not np.isfinite(total):
+        return float('inf'), [None] * len(durations)
+    return float(total), starts
 
 
 class MaintenanceOptimizer:
@@ -17,8 +446,17 @@ class MaintenanceOptimizer:
     
     def __init__(self, electricity_prices: Dict[int, float] = None, 
                  labor_costs: Dict[int, float] = None, 
-                 maintenance_durations: List[int] = None):
-        self.H = len(electricity_prices) if electricity_prices else 24  # planning horizon
+                 maintenance_durations: List[int] = None,
+                 engine: str = "milp",
+                 deferral_costs: List[Optional[float]] = None,
+                 cache=None,
+                 symmetry_breaking: bool = True,
+                 verbose: bool = True):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine '{engine}'. Choose one of: {', '.join(ENGINES)}")
+        
+        # planning horizon
+        self.H = len(electricity_prices) if electricity_prices is not None and len(electricity_prices) else 24
         self.dt = 1.0  # time step
         self.T = list(range(int(self.H / self.dt)))  # time slots
         
@@ -30,6 +468,20 @@ class MaintenanceOptimizer:
         
         self.num_maintenance_events = len(self.L_list)  # Number of maintenance events
         
+        # Optional cost of leaving each event unscheduled in this horizon
+        # (None = event is mandatory). Used by rolling-horizon planning.
+        if deferral_costs is not None and len(deferral_costs) != self.num_maintenance_events:
+            raise ValueError("deferral_costs must have one entry per maintenance event")
+        self.deferral_costs = deferral_costs
+        
+        # Model interchangeable events (same duration and deferral cost) as one group in the MILP
+        self.symmetry_breaking = symmetry_breaking
+        
+        # Contiguous price arrays and the window-cost table, built once per model
+        self.elec_prices = None
+        self.labor_prices = None
+        self.window_costs = None
+        
         # Set electricity prices
         if electricity_prices is not None:
             self.P_elec = electricity_prices
@@ -42,10 +494,54 @@ class MaintenanceOptimizer:
         else:
             self.P_labor = {}  # empty dict, must be set later
         
+        # Requested engine and the one build_model() actually selected
+        # ("dp" falls back to "milp" for problems outside its scope)
+        self.engine = engine
+        self.active_engine = None
+        
         # PuLP model
         self.model = None
         self.results = None
         
+        # Solution: start slot per event and its objective value
+        self.solution_starts = None
+        self.objective_value = None
+        
+        # Solution quality: 'optimal', 'feasible' (best incumbent when a time limit
+        # or gap target stopped the search) or None for plans loaded from elsewhere,
+        # with the solver's lower bound and relative gap
+        self.solution_status = None
+        self.objective_bound = None
+        self.mip_gap = None
+        
+        # Result cache: a ResultCache, True for the process-wide cache shared with
+        # the web service, or None to always solve
+        self.cache = get_cache() if cache is True else (cache or None)
+        self.from_cache = False
+        
+        # Progress banners and solver logs (off on the service path)
+        self.verbose = verbose
+        
+        # Instrumentation of the last build/solve: seconds per phase, model size
+        # and solver statistics (see metrics())
+        self.timings = {}
+        self.model_stats = {}
+        self.solver_stats = {}
+        
+    def _log(self, message: str):
+        """Print a progress banner when verbose"""
+        if self.verbose:
+            print(message)
+    
+    @contextlib.contextmanager
+    def _timed(self, phase: str):
+        """Record the wall time of a phase in self.timings (seconds)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[phase] = time.perf_counter() - started
+    
     def set_electricity_prices(self, prices: Dict[int, float]):
         """Set electricity prices for each time slot"""
         self.P_elec = prices
@@ -54,137 +550,740 @@ class MaintenanceOptimizer:
         """Set labor costs for each time slot"""
         self.P_labor = costs
         
+    def dp_supported(self) -> Tuple[bool, str]:
+        """
+        Check whether the DP engine can solve this problem exactly.
+        The DP covers the base formulation (fixed-length, non-overlapping events with
+        additive per-slot costs) as long as its cost-to-go table stays small enough.
+        Returns (supported, reason when not supported).
+        """
+        table_size = dp_table_size(len(self.T), self.L_list)
+        if table_size > DP_MAX_TABLE_SIZE:
+            return False, (f"DP table would need {table_size} cells "
+                           f"(limit {DP_MAX_TABLE_SIZE})")
+        return True, ""
+    
+    def event_groups(self) -> List[List[int]]:
+        """
+        Events that differ only by their label (same duration and deferral cost),
+        as lists of event indices in index order. Every event is in exactly one group;
+        with symmetry_breaking=False each event is a group of its own.
+        """
+        if not self.symmetry_breaking:
+            return [[i] for i in range(self.num_maintenance_events)]
+        groups = {}
+        for i, L in enumerate(self.L_list):
+            deferral = self.deferral_costs[i] if self.deferral_costs is not None else None
+            groups.setdefault((L, deferral), []).append(i)
+        return list(groups.values())
+    
+    def prepare_costs(self) -> WindowCostTable:
+        """Convert prices to arrays and precompute the per-duration window-cost table"""
+        with self._timed('prepare'):
+            num_slots = len(self.T)
+            self.elec_prices = _price_array(self.P_elec, num_slots)
+            self.labor_prices = _price_array(self.P_labor, num_slots)
+            self.window_costs = WindowCostTable(self.elec_prices, self.labor_prices, self.L_list)
+        return self.window_costs
+    
+    def slot_costs(self) -> np.ndarray:
+        """Total cost (electricity + labor) of having maintenance active in each slot"""
+        return self.window_costs.slot_costs
+    
     def build_model(self):
         """
         Build the SIMPLIFIED MILP optimization model for MULTIPLE maintenance events
         Minimizes electricity costs + labor costs!
+        With engine="dp" no MILP is built unless the problem is outside the DP's scope.
         """
         # Validate that prices are set
-        if not self.P_elec:
+        if self.P_elec is None or len(self.P_elec) == 0:
             raise ValueError("Electricity prices must be set before building model. "
                            "Pass prices to constructor or use set_electricity_prices().")
         
-        if not self.P_labor:
+        if self.P_labor is None or len(self.P_labor) == 0:
             raise ValueError("Labor costs must be set before building model. "
                            "Pass costs to constructor or use set_labor_costs().")
         
-        print("Building simplified MILP model for MULTIPLE maintenance events...")
-        print(f"Number of maintenance events: {self.num_maintenance_events}")
-        print(f"Maintenance durations: {self.L_list} hours")
+        self.timings = {}
+        self.solver_stats = {}
+        self.prepare_costs()
+        self.solution_starts = None
+        self.objective_value = None
+        self._set_quality(None)
+        self.from_cache = False
+        
+        if self.engine == "dp":
+            supported, reason = self.dp_supported()
+            if supported:
+                self.active_engine = "dp"
+                self.model = None
+                self.model_stats = {'dp_table_cells': dp_table_size(len(self.T), self.L_list)}
+                self._log("Prepared dynamic programming engine for MULTIPLE maintenance events")
+                self._log(f"Number of maintenance events: {self.num_maintenance_events}")
+                self._log(f"Maintenance durations: {self.L_list} hours")
+                return
+            self._log(f"⚠ DP engine not applicable ({reason}), falling back to MILP")
+        
+        # The heuristic engine also needs the MILP: for its bound and as the fallback
+        self.active_engine = "heuristic" if self.engine == "heuristic" else "milp"
+        with self._timed('build'):
+            self._build_milp()
+        self.model_stats = {
+            'variables': self.model.numVariables(),
+            'constraints': self.model.numConstraints(),
+            'nonzeros': sum(len(constraint) for constraint in model_constraints(self.model)),
+        }
+        
+        self._log(f"Model built with {len(self.T)} time slots and {self.num_maintenance_events} maintenance events")
+        self._log("Objective: Minimize TOTAL electricity costs + labor costs across all maintenance events")
+        self._log("Constraint: No maintenance events can overlap")
+    
+    def _build_milp(self):
+        """Create the PuLP variables, constraints and objective"""
+        self._log("Building simplified MILP model for MULTIPLE maintenance events...")
+        self._log(f"Number of maintenance events: {self.num_maintenance_events}")
+        self._log(f"Maintenance durations: {self.L_list} hours")
         
         # Create PuLP model
         self.model = pulp.LpProblem("MultipleMaintenanceOptimization", pulp.LpMinimize)
         
-        # Variables for each maintenance event
-        # x[i][t] = 1 if maintenance event i starts at time slot t
+        # Interchangeable events (same duration and deferral cost) share one set of
+        # variables: the solver then sees one plan per set of start slots instead of
+        # branching on every relabelling of identical events. Results are still
+        # reported per event (starts of a group are handed out in start order).
+        # With symmetry_breaking=False every event is its own group.
+        self.groups = self.event_groups()
+        
+        # Variables for each group of maintenance events
+        # x[g][t] = 1 if a maintenance event of group g starts at time slot t
         self.x = {}
-        for i in range(self.num_maintenance_events):
-            self.x[i] = pulp.LpVariable.dicts(f"start_event_{i}", self.T, cat='Binary')
+        for g, group in enumerate(self.groups):
+            self.x[g] = pulp.LpVariable.dicts(f"start_event_{group[0]}", self.T, cat='Binary')
         
-        # y[i][t] = 1 if maintenance event i is active at time slot t  
+        # y[g][t] = 1 if a maintenance event of group g is active at time slot t  
         self.y = {}
-        for i in range(self.num_maintenance_events):
-            self.y[i] = pulp.LpVariable.dicts(f"maintenance_event_{i}", self.T, cat='Binary')
+        for g, group in enumerate(self.groups):
+            self.y[g] = pulp.LpVariable.dicts(f"maintenance_event_{group[0]}", self.T, cat='Binary')
         
         # Constraints
         
-        # 1. Link between start and active maintenance for each event
-        # forces to keep maintenance intervals(for the same event) far enough so they don't overlap 
-        # because otherwise y[i][t] would not be equal 1
-        for i in range(self.num_maintenance_events):
-            L = self.L_list[i]
+        # 1. Link between start and active maintenance for each group
+        # forces to keep maintenance intervals(for the same group) far enough so they don't overlap 
+        # because otherwise y[g][t] would not be equal 1
+        # Written as a sliding window so every constraint has at most four terms:
+        #   y[g][t] = y[g][t-1] + x[g][t] - x[g][t-L]
+        # which is equivalent to y[g][t] = sum(x[g][tau] for t-L < tau <= t)
+        # but keeps model construction linear in events * time slots.
+        for g, group in enumerate(self.groups):
+            L = self.L_list[group[0]]
+            x, y = self.x[g], self.y[g]
             for t in self.T:
-                # y[i][t] = 1 if we started maintenance event i within the last L hours
-                start_times = [tau for tau in self.T if 0 <= t - tau < L]
-                self.model += self.y[i][t] == pulp.lpSum([self.x[i][tau] for tau in start_times])
+                # y[g][t] = 1 if we started an event of group g within the last L hours
+                window = pulp.LpAffineExpression([(y[t], 1), (x[t], -1)])
+                if t >= 1:
+                    window[y[t - 1]] = -1
+                if t >= L:
+                    window[x[t - L]] = 1
+                self.model += pulp.LpConstraint(window, pulp.LpConstraintEQ, rhs=0)
         
-        # 2. Must start each maintenance event exactly once
-        for i in range(self.num_maintenance_events):
-            self.model += pulp.lpSum([self.x[i][t] for t in self.T]) == 1
+        # 2. Must start each maintenance event exactly once: a group has as many
+        # starts as events (minus deferred ones, when the events have a deferral cost)
+        self.deferred = {}
+        for g, group in enumerate(self.groups):
+            starts = pulp.LpAffineExpression([(self.x[g][t], 1) for t in self.T])
+            if self.deferral_costs is not None and self.deferral_costs[group[0]] is not None:
+                self.deferred[g] = pulp.LpVariable(f"deferred_event_{group[0]}", lowBound=0,
+                                                   upBound=len(group), cat='Integer')
+                starts[self.deferred[g]] = 1
+            self.model += pulp.LpConstraint(starts, pulp.LpConstraintEQ, rhs=len(group))
         
         # 3. Ensure each maintenance event can complete within time horizon
-        for i in range(self.num_maintenance_events):
-            L = self.L_list[i]
+        for g, group in enumerate(self.groups):
+            L = self.L_list[group[0]]
             for t in self.T:
                 if t + L > len(self.T):  # Not enough time slots remaining
-                    self.model += self.x[i][t] == 0  # Cannot start maintenance at this time
+                    self.model += self.x[g][t] == 0  # Cannot start maintenance at this time
         
         # 4. NEW: No overlap between maintenance events
         # At most one maintenance event can be active at any time slot
         for t in self.T:
-            self.model += pulp.lpSum([self.y[i][t] for i in range(self.num_maintenance_events)]) <= 1
+            active = pulp.LpAffineExpression([(self.y[g][t], 1) for g in range(len(self.groups))])
+            self.model += pulp.LpConstraint(active, pulp.LpConstraintLE, rhs=1)
         
         # UPDATED Objective Function - electricity costs + labor costs for ALL events!
-        electricity_costs = pulp.lpSum([
-            self.y[i][t] * self.P_elec.get(t, 0)
-            for i in range(self.num_maintenance_events)
-            for t in self.T
-        ])
-        
-        labor_costs = pulp.lpSum([
-            self.y[i][t] * self.P_labor.get(t, 0)
-            for i in range(self.num_maintenance_events)
-            for t in self.T
-        ])
-        
-        total_costs = electricity_costs + labor_costs
+        # Charged on the start variables: starting an event of group g at t costs the
+        # whole window [t, t+L), read from the window-cost table. This equals the sum
+        # of active-slot prices because y[g] is the sliding-window sum of x[g].
+        total_costs = pulp.LpAffineExpression([
+            (self.x[g][t], cost)
+            for g, group in enumerate(self.groups)
+            for t, cost in enumerate(self.window_costs.total[self.L_list[group[0]]].tolist())
+        ] + [(var, self.deferral_costs[self.groups[g][0]]) for g, var in self.deferred.items()])
         self.model += total_costs
         
-        print(f"Model built with {len(self.T)} time slots and {self.num_maintenance_events} maintenance events")
-        print("Objective: Minimize TOTAL electricity costs + labor costs across all maintenance events")
-        print("Constraint: No maintenance events can overlap")
-        
-    def solve(self, verbose: bool = True):
+    def solve(self, verbose: bool = None, solver=None, warm_start: bool = False,
+              time_limit: float = None, gap: float = None, initial_starts=None):
         """
         Solve the optimization model
+        
+        verbose: show the solver log (default: the optimizer's verbose setting)
+        solver: name of a registered backend from solvers.py ("highs", "cbc",
+        "pulp_cbc", "glpk") or a SolverBackend instance. None picks the first
+        backend available in this process.
+        warm_start: start the MILP from the previous solution still held by the
+        model variables (used after update_prices()); ignored by backends
+        without MIP-start support.
+        initial_starts: a plan to start the MILP from (start slot per event, None =
+        deferred), e.g. yesterday's plan, or "auto" for the built-in heuristic's
+        plan. It is passed to the solver as a MIP start (CBC) and kept as the
+        answer if the solver stops with nothing better. Used by the MILP engine.
+        time_limit: wall-clock budget for the MILP solver in seconds
+        gap: stop the MILP once the relative gap to the bound is at most this
+        When a limit stops the search, the best incumbent is kept and solve()
+        still returns True with solution_status 'feasible' (see get_results());
+        it returns False only when no plan was found. The DP engine is exact and
+        ignores both limits. With engine="heuristic", gap is the proven gap up to
+        which the heuristic plan is returned without solving the MILP (default
+        HEURISTIC_GAP).
+        With a cache, a stored plan for the same request is reused and new
+        optimal plans are stored.
+        """
+        if time_limit is not None and time_limit <= 0:
+            raise ValueError("time_limit must be a positive number of seconds")
+        if gap is not None and gap < 0:
+            raise ValueError("gap must be a non-negative fraction")
+        if self.from_cache:
+            return True
+        if self.cache is not None and self.load_cached(solver):
+            self._log("✓ Loaded optimal solution from cache")
+            return True
+        
+        if verbose is None:
+            verbose = self.verbose
+        with self._timed('solve'):
+            if self.active_engine == "dp":
+                success = self._solve_dp()
+            elif self.active_engine == "heuristic":
+                success = self._solve_heuristic(verbose, solver, warm_start, time_limit, gap)
+            else:
+                if isinstance(initial_starts, str):
+                    if initial_starts != "auto":
+                        raise ValueError(f"initial_starts must be a plan or 'auto', got '{initial_starts}'")
+                    with self._timed('heuristic'):
+                        initial_starts = self.heuristic_plan()
+                success = self._solve_milp(verbose, solver, warm_start, time_limit, gap, initial_starts)
+        
+        # Incumbents from a time-limited solve are not reused for later requests
+        if success and self.solution_status == 'optimal' and self.cache is not None:
+            self.cache.put(self.cache_key(solver), {
+                'starts': [None if start is None else int(start) for start in self.solution_starts],
+                'engine': self.active_engine,
+            })
+        return success
+    
+    def _solve_milp(self, verbose: bool, solver, warm_start: bool,
+                    time_limit: float = None, gap: float = None,
+                    initial_starts: List[Optional[int]] = None) -> bool:
+        """
+        Solve the built PuLP model with a registered solver backend, optionally
+        from a MIP start (initial_starts)
         """
         if self.model is None:
             raise ValueError("Model not built. Call build_model() first.")
         
-        print("Solving model with CBC...")
+        # Raises ValueError for unknown or unavailable solver names
+        backend = get_backend(solver)
+        if backend is None:
+            self._log("⚠ No available solvers")
+            return False
+        
+        # Raises ValueError for infeasible plans
+        initial_cost = None
+        if initial_starts is not None:
+            initial_cost = self.set_initial_solution(initial_starts)
+            if not backend.supports_warm_start:
+                self._log(f"{backend.label} takes no MIP start; the initial plan is only a fallback")
+        
+        self._log(f"Solving model with {backend.label}...")
         
+        # Solve model (the backend adds nodes, gap and its own phase timings)
+        # warm_start: the previous solution was passed on as a MIP start
+        warm_start = warm_start and self.solution_starts is not None
+        stats = {'backend': backend.name, 'mip_start': initial_cost is not None and backend.supports_warm_start,
+                 'warm_start': warm_start and backend.supports_warm_start}
+        if warm_start and not backend.supports_warm_start:
+            self._log(f"{backend.label} takes no MIP start; solving without the warm start")
         try:
-            # Check for CBC in standard location
-            cbc_path = "/usr/bin/coin.cbc"
-            if os.path.exists(cbc_path):
-                solver = pulp.COIN_CMD(path=cbc_path, msg=verbose)
-            else:
-                solver = pulp.COIN_CMD(msg=verbose)
-            
-            # Check solver availability
-            if not solver.available():
-                print("⚠ CBC solver not available, trying others...")
-                # Try other available solvers
-                for solver_class in [pulp.PULP_CBC_CMD, pulp.GLPK_CMD]:
-                    solver = solver_class(msg=verbose)
-                    if solver.available():
-                        break
-                else:
-                    print("⚠ No available solvers")
-                    return False
-            
-            # Solve model
-            self.model.solve(solver)
+            backend.solve(self.model, msg=verbose, warm_start=initial_cost is not None or warm_start,
+                          stats=stats, time_limit=time_limit, gap=gap)
+            stats['status'] = pulp.LpStatus[self.model.status]
+            self.solver_stats = stats
             
             # Check solution status
             if pulp.LpStatus[self.model.status] == 'Optimal':
-                print("✓ Found optimal solution!")
+                with self._timed('extract'):
+                    self._extract_milp_solution()
+                # An incumbent from a stopped search, or a gap target that was met
+                # with more than the default tolerance, is feasible but not proven optimal
+                proven = self.model.sol_status != pulp.LpSolutionIntegerFeasible
+                if proven and gap is not None:
+                    proven = stats.get('gap') is not None and stats['gap'] <= OPTIMALITY_GAP
+                self._set_quality('optimal' if proven else 'feasible',
+                                  bound=stats.get('bound'), gap=stats.get('gap'))
+                if not proven and initial_cost is not None and initial_cost < self.objective_value - 1e-9:
+                    self._use_initial_plan(initial_starts, initial_cost, stats)
+                if proven:
+                    self._log("✓ Found optimal solution!")
+                else:
+                    stats['status'] = 'Feasible'
+                    gap_text = f"{self.mip_gap:.2%}" if self.mip_gap is not None else "unknown"
+                    self._log(f"✓ Found feasible solution (gap {gap_text})")
+                return True
+            elif initial_cost is not None:
+                self._log(f"⚠ No solution found ({pulp.LpStatus[self.model.status]}), keeping the initial plan")
+                self._use_initial_plan(initial_starts, initial_cost, stats)
                 return True
             else:
-                print(f"⚠ No solution found: {pulp.LpStatus[self.model.status]}")
+                self._log(f"⚠ No solution found: {pulp.LpStatus[self.model.status]}")
                 return False
                 
         except Exception as e:
-            print(f"Error solving: {e}")
+            if initial_cost is None:
+                self._log(f"Error solving: {e}")
+                return False
+            self._log(f"Error solving: {e}, keeping the initial plan")
+            self.solver_stats = stats
+            self._use_initial_plan(initial_starts, initial_cost, stats)
+            return True
+    
+    def _use_initial_plan(self, starts: List[Optional[int]], cost: float, stats: Dict):
+        """Answer with the MIP start when the solver stopped without anything better"""
+        self.solution_starts = list(starts)
+        self.objective_value = cost
+        self._set_quality('feasible', bound=stats.get('bound'))
+        stats['status'] = 'Feasible'
+    
+    def _solve_heuristic(self, verbose: bool, solver, warm_start: bool,
+                         time_limit: float = None, gap: float = None) -> bool:
+        """
+        Greedy + local-search plan, returned when its proven gap to the LP-relaxation
+        bound of the MILP is within `gap` (HEURISTIC_GAP by default). Otherwise the
+        MILP is solved from the heuristic plan as MIP start; the plan is kept if
+        the MILP ends with nothing better (e.g. a time limit without a better incumbent).
+        """
+        threshold = HEURISTIC_GAP if gap is None else gap
+        with self._timed('heuristic'):
+            total, starts = solve_windows_heuristic(self.window_costs.total, self.L_list, len(self.T),
+                                                    self.deferral_costs)
+        if not np.isfinite(total):
+            self._log("⚠ Heuristic found no plan, solving the MILP")
+            return self._solve_milp(verbose, solver, warm_start, time_limit, gap)
+        
+        with self._timed('bound'):
+            bound = self.lp_bound(solver)
+        heuristic_gap = None if bound is None else max((total - bound) / max(abs(total), 1e-9), 0.0)
+        heuristic = {'cost': total, 'bound': bound, 'gap': heuristic_gap}
+        
+        if heuristic_gap is not None and heuristic_gap <= threshold:
+            self.solution_starts = starts
+            self.objective_value = total
+            self._set_quality('optimal' if heuristic_gap <= OPTIMALITY_GAP else 'feasible',
+                              bound=bound, gap=heuristic_gap)
+            self.solver_stats = {'backend': 'heuristic', 'nodes': None, 'bound': bound, 'gap': heuristic_gap,
+                                 'status': 'Optimal' if self.solution_status == 'optimal' else 'Feasible',
+                                 'heuristic': heuristic}
+            self._log(f"✓ Heuristic plan within {heuristic_gap:.2%} of the LP bound")
+            return True
+        
+        gap_text = f"{heuristic_gap:.2%}" if heuristic_gap is not None else "unknown"
+        self._log(f"Heuristic gap {gap_text} is above {threshold:.2%}, solving the MILP")
+        success = self._solve_milp(verbose, solver, warm_start, time_limit, gap, initial_starts=starts)
+        self.solver_stats['heuristic'] = heuristic
+        if success and self.solution_status != 'optimal' and bound is not None:
+            # The LP bound may be tighter than what the stopped search reported
+            self._set_quality('feasible', bound=max(bound, self.objective_bound or -np.inf))
+        return success
+    
+    def lp_bound(self, solver=None) -> Optional[float]:
+        """
+        Optimal cost of the LP relaxation of the built MILP: a lower bound on the
+        cost of every plan. None when no backend is available or the LP fails.
+        Leaves the relaxed (fractional) values in the model variables.
+        """
+        if self.model is None:
+            raise ValueError("Model not built. Call build_model() first.")
+        backend = get_backend(solver)
+        if backend is None:
+            return None
+        try:
+            backend.solve(self.model, relax=True)
+        except Exception as e:
+            self._log(f"Error solving the LP relaxation: {e}")
+            return None
+        if pulp.LpStatus[self.model.status] != 'Optimal':
+            return None
+        return pulp.value(self.model.objective)
+    
+    def cache_key(self, solver=None) -> str:
+        """
+        Content hash of this request (prices, durations, engine, solver) for the result
+        cache. The solver is keyed by the backend it resolves to, so solver=None and
+        an explicit name of the default backend share entries.
+        """
+        if self.window_costs is None:
+            self.prepare_costs()
+        backend = get_backend(solver)
+        return request_key(self.elec_prices, self.labor_prices, self.L_list,
+                           engine=self.engine, solver=backend.name if backend is not None else None,
+                           deferral_costs=self.deferral_costs)
+    
+    def load_cached(self, solver=None) -> bool:
+        """
+        Load the plan for this request from the cache. On a hit the optimizer is
+        solved (get_results() works) and build_model()/solve() can be skipped.
+        """
+        if self.cache is None or not len(self.P_elec) or not len(self.P_labor):
             return False
+        self.prepare_costs()
+        entry = self.cache.get(self.cache_key(solver))
+        if entry is None:
+            return False
+        self.load_solution(entry['starts'])
+        self._set_quality('optimal')
+        self.active_engine = entry['engine']
+        self.from_cache = True
+        self.solver_stats = {'backend': 'cache', 'status': 'Optimal'}
+        return True
     
-    def get_results(self) -> Dict:
+    def _solve_dp(self) -> bool:
+        """Solve with the dynamic programming engine"""
+        self._log("Solving model with dynamic programming...")
+        total, starts = solve_windows_dp(self.slot_costs(), self.L_list, self.window_costs.total,
+                                         self.deferral_costs)
+        self.solver_stats = {'backend': 'dp', 'status': 'Optimal' if np.isfinite(total) else 'Infeasible',
+                             'gap': 0.0 if np.isfinite(total) else None}
+        if not np.isfinite(total):
+            self._log("⚠ No solution found: Infeasible")
+            return False
+        self.solution_starts = starts
+        self.objective_value = total
+        self._set_quality('optimal')
+        self._log("✓ Found optimal solution!")
+        return True
+    
+    def _extract_milp_solution(self):
         """
-        Extract optimization results for multiple maintenance events
+        Read start slots and objective value from the solved PuLP model.
+        The starts of a group go to its events in index order; events left over
+        are deferred (None).
+        """
+        starts = [None] * self.num_maintenance_events
+        for g, group in enumerate(self.groups):
+            start_times = [t for t in self.T if self.x[g][t].varValue and self.x[g][t].varValue > 0.5]
+            for i, t in zip(group, start_times):
+                starts[i] = t
+        self.solution_starts = starts
+        self.objective_value = pulp.value(self.model.objective)
+    
+    def load_solution(self, starts: List[Optional[int]]):
+        """
+        Use an externally computed plan (start slot per event) as this optimizer's
+        solution, e.g. a plan stitched together by rolling-horizon planning.
+        Raises ValueError if the plan leaves the horizon or has overlapping events.
+        """
+        total = self.plan_cost(starts)
+        self.solution_starts = list(starts)
+        self.objective_value = total
+        self._set_quality(None)
+    
+    def plan_cost(self, starts: List[Optional[int]]) -> float:
+        """
+        Total cost of a plan (start slot per event, None = deferred).
+        Raises ValueError if the plan leaves the horizon, has overlapping events
+        or defers a mandatory event.
+        """
+        if len(starts) != self.num_maintenance_events:
+            raise ValueError("starts must have one entry per maintenance event")
+        if self.window_costs is None:
+            self.prepare_costs()
+        
+        occupied = np.zeros(len(self.T), dtype=int)
+        total = 0.0
+        for i, (start, L) in enumerate(zip(starts, self.L_list)):
+            if start is None:
+                if self.deferral_costs is None or self.deferral_costs[i] is None:
+                    raise ValueError(f"Event {i} must be scheduled")
+                total += self.deferral_costs[i]
+                continue
+            if start < 0 or start + L > len(self.T):
+                raise ValueError(f"Event {i} does not fit into the horizon at slot {start}")
+            occupied[start:start + L] += 1
+            total += self.window_costs.cost(start, L)
+        if np.any(occupied > 1):
+            raise ValueError("Maintenance events overlap")
+        return total
+    
+    def set_initial_solution(self, starts: List[Optional[int]]) -> float:
+        """
+        Load a plan (start slot per event, None = deferred) into the MILP variables
+        as the MIP start of the next solve. Every start and active variable gets a
+        value, so nothing left over from an earlier (e.g. relaxed) solve leaks in.
+        Returns the plan's cost; raises ValueError for infeasible plans.
         """
         if self.model is None:
+            raise ValueError("Model not built. Call build_model() first.")
+        cost = self.plan_cost(starts)
+        num_slots = len(self.T)
+        for g, group in enumerate(self.groups):
+            L = self.L_list[group[0]]
+            group_starts = [starts[i] for i in group if starts[i] is not None]
+            x_values = np.zeros(num_slots)
+            y_values = np.zeros(num_slots)
+            for t in group_starts:
+                x_values[t] = 1
+                y_values[t:t + L] = 1
+            x, y = self.x[g], self.y[g]
+            for t in self.T:
+                x[t].setInitialValue(x_values[t])
+                y[t].setInitialValue(y_values[t])
+            if g in self.deferred:
+                self.deferred[g].setInitialValue(len(group) - len(group_starts))
+        return cost
+    
+    def heuristic_plan(self) -> Optional[List[Optional[int]]]:
+        """Greedy + local-search plan (see solve_windows_heuristic), or None if none was found"""
+        if self.window_costs is None:
+            self.prepare_costs()
+        total, starts = solve_windows_heuristic(self.window_costs.total, self.L_list, len(self.T),
+                                                self.deferral_costs)
+        return starts if np.isfinite(total) else None
+    
+    def get_alternatives(self, k: int, solver=None) -> List[Dict]:
+        """
+        The k cheapest distinct plans, cheapest first, for staff to choose from
+        (e.g. to fit technician availability). Plans are distinct when their
+        maintenance windows differ; swapping interchangeable events is not a new plan.
+        
+        Uses k-best dynamic programming (one pass, see solve_windows_kbest) while
+        its table stays within DP_MAX_TABLE_SIZE; beyond that the MILP is re-solved
+        k times, each time with a cut excluding the plans found so far.
+        The optimizer's own solution is left untouched.
+        
+        Returns [{'rank', 'total_cost', 'extra_cost' (over the cheapest plan),
+        'starts', 'events'}]; fewer than k entries when fewer plans exist.
+        """
+        if k < 1:
+            raise ValueError(f"k must be at least 1, got {k}")
+        if self.window_costs is None:
+            self.prepare_costs()
+        with self._timed('alternatives'):
+            if dp_table_size(len(self.T), self.L_list) * k <= DP_MAX_TABLE_SIZE:
+                plans = solve_windows_kbest(self.slot_costs(), self.L_list, k, self.window_costs.total,
+                                            self.deferral_costs)
+            else:
+                self._log(f"⚠ k-best DP table too large for k={k}, re-solving the MILP with cuts")
+                plans = self._alternatives_milp(k, solver)
+        
+        alternatives = []
+        for rank, (total, starts) in enumerate(plans, start=1):
+            events = []
+            for i, start in enumerate(starts):
+                if start is None:
+                    events.append({})
+                    continue
+                L = self.L_list[i]
+                events.append({'start_time': start, 'end_time': start + L - 1, 'duration': L,
+                               'total_cost': self.window_costs.cost(start, L)})
+            alternatives.append({'rank': rank, 'total_cost': total, 'extra_cost': total - plans[0][0],
+                                 'starts': starts, 'events': events})
+        return alternatives
+    
+    def price_sensitivity(self) -> List[Dict]:
+        """
+        For every slot, how far its price (electricity or labor: both add to the
+        slot cost) can move before the optimal plan changes, without re-solving.
+        
+        A slot in the plan only matters when it gets dearer: the plan changes once
+        the increase exceeds (cheapest plan avoiding the slot) - optimum. A slot
+        outside the plan only matters when it gets cheaper, by (cheapest plan using
+        the slot) - optimum. Both come from one forward/backward DP pass
+        (slot_plan_costs), so the DP table must fit within DP_MAX_TABLE_SIZE.
+        
+        Returns [{'slot', 'in_plan', 'increase', 'decrease'}]; None means no move
+        in that direction changes the plan, 0 means a tie with another plan.
+        """
+        if self.window_costs is None:
+            self.prepare_costs()
+        supported, reason = self.dp_supported()
+        if not supported:
+            raise ValueError(f"Price sensitivity needs the DP tables: {reason}")
+        with self._timed('sensitivity'):
+            optimum, cost_use, cost_avoid = slot_plan_costs(self.slot_costs(), self.L_list,
+                                                            self.window_costs.total, self.deferral_costs)
+        if not np.isfinite(optimum):
+            raise ValueError("No feasible plan")
+        
+        # Thresholds are relative to the reported plan when it is optimal (ties)
+        starts = self.solution_starts if self.solution_status == 'optimal' else None
+        if starts is None:
+            starts = solve_windows_dp(self.slot_costs(), self.L_list, self.window_costs.total,
+                                      self.deferral_costs)[1]
+        in_plan = np.zeros(len(self.T), dtype=bool)
+        for i, start in enumerate(starts):
+            if start is not None:
+                in_plan[start:start + self.L_list[i]] = True
+        
+        def margin(cost):
+            return max(float(cost) - optimum, 0.0) if np.isfinite(cost) else None
+        
+        return [{'slot': t,
+                 'in_plan': bool(in_plan[t]),
+                 'increase': margin(cost_avoid[t]) if in_plan[t] else None,
+                 'decrease': None if in_plan[t] else margin(cost_use[t])}
+                for t in range(len(self.T))]
+    
+    def _alternatives_milp(self, k: int, solver=None) -> List[Tuple[float, List[Optional[int]]]]:
+        """
+        Up to k cheapest distinct plans from repeated MILP solves. After each solve a
+        no-good cut on the plan's (start, duration) windows excludes it:
+            sum(z over its windows) - sum(z over all other windows) <= |windows| - 1
+        where z sums the start variables of all groups with that duration.
+        The cuts are removed again afterwards.
+        """
+        if self.model is None:
+            with self._timed('build'):
+                self._build_milp()
+        backend = get_backend(solver)
+        if backend is None:
+            self._log("⚠ No available solvers")
+            return []
+        
+        saved = (self.solution_starts, self.objective_value)
+        plans, cuts = [], []
+        try:
+            for rank in range(k):
+                backend.solve(self.model, msg=False, stats={})
+                if self.model.status != pulp.LpStatusOptimal:
+                    break
+                self._extract_milp_solution()
+                plans.append((self.objective_value, self.solution_starts))
+                windows = {(t, self.L_list[i]) for i, t in enumerate(self.solution_starts) if t is not None}
+                cut = pulp.LpAffineExpression([
+                    (self.x[g][t], 1 if (t, self.L_list[group[0]]) in windows else -1)
+                    for g, group in enumerate(self.groups) for t in self.T
+                ])
+                name = f"alternative_cut_{rank}"
+                self.model += pulp.LpConstraint(cut, pulp.LpConstraintLE, rhs=len(windows) - 1, name=name)
+                cuts.append(name)
+        finally:
+            for name in cuts:
+                del self.model.constraints[name]
+            self.solution_starts, self.objective_value = saved
+            if self.solution_starts is not None:
+                self.set_initial_solution(self.solution_starts)
+        return plans
+    
+    def _set_quality(self, status: Optional[str], bound: float = None, gap: float = None):
+        """
+        Record how good the current plan is. A proven optimum is its own bound;
+        for an incumbent the gap is derived from the bound when the solver gave none.
+        """
+        if status == 'optimal':
+            bound = self.objective_value if bound is None else bound
+            gap = 0.0 if gap is None else gap
+        elif status == 'feasible' and gap is None and bound is not None and self.objective_value is not None:
+            gap = (self.objective_value - bound) / max(abs(self.objective_value), 1e-9)
+        self.solution_status = status
+        self.objective_bound = bound
+        self.mip_gap = gap
+    
+    def update_prices(self, electricity_prices=None, labor_costs=None) -> Dict:
+        """
+        Apply re-issued price forecasts to an already built model.
+        
+        Only the objective coefficients of start variables whose window covers a
+        changed slot are rewritten; constraints are untouched. When every change
+        either lowers the price of a slot the current plan uses or raises the price
+        of a slot it does not use, no other plan can become cheaper, so an optimal
+        incumbent stays optimal and its cost (and bound) is updated without a
+        re-solve. A plan that was not proven optimal (e.g. from a time-limited
+        search) always needs a re-solve.
+        
+        Returns {'changed_slots', 'updated_coefficients', 'resolve_needed'}.
+        Call solve(warm_start=True) when resolve_needed is True.
+        """
+        if self.window_costs is None:
+            raise ValueError("Model not built. Call build_model() first.")
+        # A cached plan was for the old prices; the next solve() must not return it as is
+        self.from_cache = False
+        
+        num_slots = len(self.T)
+        old_elec, old_labor = self.elec_prices, self.labor_prices
+        new_elec = old_elec if electricity_prices is None else _price_array(electricity_prices, num_slots)
+        new_labor = old_labor if labor_costs is None else _price_array(labor_costs, num_slots)
+        
+        delta = (new_elec + new_labor) - (old_elec + old_labor)
+        changed = (new_elec != old_elec) | (new_labor != old_labor)
+        changed_slots = np.flatnonzero(changed)
+        
+        if electricity_prices is not None:
+            self.P_elec = electricity_prices
+        if labor_costs is not None:
+            self.P_labor = labor_costs
+        self.elec_prices, self.labor_prices = new_elec, new_labor
+        self.window_costs = WindowCostTable(new_elec, new_labor, self.L_list)
+        
+        # Rewrite coefficients only for starts whose window [t, t+L) covers a changed slot
+        updated = 0
+        if self.model is not None and len(changed_slots):
+            changed_prefix = np.concatenate(([0], np.cumsum(changed)))
+            for g, group in enumerate(self.groups):
+                L = self.L_list[group[0]]
+                if L > num_slots:
+                    continue
+                touched = np.flatnonzero(changed_prefix[L:] - changed_prefix[:-L])
+                costs = self.window_costs.total[L]
+                for t in touched.tolist():
+                    self.model.objective[self.x[g][t]] = float(costs[t])
+                updated += len(touched)
+        
+        resolve_needed = True
+        if (self.solution_status == 'optimal' and self.solution_starts is not None
+                and None not in self.solution_starts):
+            used = np.zeros(num_slots, dtype=bool)
+            for start, L in zip(self.solution_starts, self.L_list):
+                used[start:start + L] = True
+            d = delta[changed_slots]
+            u = used[changed_slots]
+            if np.all((u & (d <= 0)) | (~u & (d >= 0))):
+                resolve_needed = False
+                self.objective_value = sum(self.window_costs.cost(start, L)
+                                           for start, L in zip(self.solution_starts, self.L_list))
+                self._set_quality('optimal')  # the bound moves with the new cost
+        
+        return {
+            'changed_slots': changed_slots.tolist(),
+            'updated_coefficients': updated,
+            'resolve_needed': resolve_needed,
+        }
+    
+    def get_results(self, schedules: bool = True) -> Dict:
+        """
+        Extract optimization results for multiple maintenance events
+        schedules=False leaves out the per-slot 'service_schedule' and
+        'combined_schedule' maps (O(events * slots)) for callers that only need
+        start/end slots and costs, e.g. the v2 API schema.
+        """
+        if self.active_engine is None and self.solution_starts is None:
             return {}
         
+        with self._timed('results'):
+            return self._collect_results(schedules)
+    
+    def _collect_results(self, schedules: bool) -> Dict:
+        starts = self.solution_starts or [None] * self.num_maintenance_events
+        
         results = {}
         
         # Results for each maintenance event
@@ -193,8 +1292,9 @@ class MaintenanceOptimizer:
         for i in range(self.num_maintenance_events):
             event_result = {}
             
-            # Find maintenance start time for this event
-            start_times = [t for t in self.T if self.x[i][t].varValue and self.x[i][t].varValue > 0.5]
+            # Maintenance start time for this event
+            start = starts[i]
+            start_times = [start] if start is not None else []
             if start_times:
                 event_result['start_time'] = start_times[0]
                 event_result['start_hour'] = start_times[0] * self.dt
@@ -203,15 +1303,17 @@ class MaintenanceOptimizer:
                 event_result['end_hour'] = (start_times[0] + self.L_list[i] - 1) * self.dt
             
             # Maintenance schedule for this event
-            service_schedule = {t: self.y[i][t].varValue and self.y[i][t].varValue > 0.5 for t in self.T}
-            event_result['service_schedule'] = service_schedule
+            if schedules:
+                if start_times:
+                    end = start + self.L_list[i]
+                    service_schedule = {t: start <= t < end for t in self.T}
+                else:
+                    service_schedule = {t: False for t in self.T}
+                event_result['service_schedule'] = service_schedule
             
             # Calculate costs for this event
             if start_times:
-                service_times = [t for t in self.T if service_schedule[t]]
-                elec_cost = sum(self.P_elec.get(t, 0) for t in service_times)
-                labor_cost = sum(self.P_labor.get(t, 0) for t in service_times)
-                total_cost = elec_cost + labor_cost
+                elec_cost, labor_cost, total_cost = self.window_costs.breakdown(start, self.L_list[i])
                 
                 event_result['electricity_cost'] = elec_cost
                 event_result['labor_cost'] = labor_cost
@@ -220,7 +1322,12 @@ class MaintenanceOptimizer:
             results['events'].append(event_result)
         
         # Total cost across all events
-        results['total_cost'] = pulp.value(self.model.objective)
+        results['total_cost'] = self.objective_value
+        
+        # Solution quality ('feasible' plans are the best found within the limits)
+        results['solution_status'] = self.solution_status
+        results['objective_bound'] = self.objective_bound
+        results['mip_gap'] = self.mip_gap
         
         # Breakdown of total costs
         total_elec = sum(event.get('electricity_cost', 0) for event in results['events'])
@@ -228,16 +1335,34 @@ class MaintenanceOptimizer:
         results['total_electricity_cost'] = total_elec
         results['total_labor_cost'] = total_labor
         
+        if self.deferral_costs is not None:
+            results['deferred_events'] = [i for i in range(self.num_maintenance_events) if starts[i] is None]
+        
         # Combined schedule showing all events
-        combined_schedule = {}
-        for t in self.T:
-            active_events = [i for i in range(self.num_maintenance_events) 
-                           if self.y[i][t].varValue and self.y[i][t].varValue > 0.5]
-            combined_schedule[t] = active_events  # List of active event indices
-        results['combined_schedule'] = combined_schedule
+        if schedules:
+            combined_schedule = {t: [] for t in self.T}
+            for i, event in enumerate(results['events']):
+                for t in self.T:
+                    if event['service_schedule'][t]:
+                        combined_schedule[t].append(i)  # List of active event indices
+            results['combined_schedule'] = combined_schedule
         
         return results
     
+    def metrics(self) -> Dict:
+        """
+        Instrumentation of the last build/solve:
+        {'engine', 'timings': {phase: seconds}, 'model': size counters
+        (variables, constraints, nonzeros; dp_table_cells for the DP),
+        'solver': {backend, status, nodes, gap, phases, mip_start, warm_start}}
+        """
+        return {
+            'engine': self.active_engine,
+            'timings': dict(self.timings),
+            'model': dict(self.model_stats),
+            'solver': dict(self.solver_stats),
+        }
+    
     def print_results(self):
         """Print optimization results for multiple maintenance events"""
         results = self.get_results()
@@ -274,8 +1399,8 @@ class MaintenanceOptimizer:
                     print(f"Active slots: {active_slots}")
                     for t in active_slots:
                         hour = t * self.dt
-                        elec_price = self.P_elec.get(t, 0)
-                        labor_price = self.P_labor.get(t, 0)
+                        elec_price = self.elec_prices[t]
+                        labor_price = self.labor_prices[t]
                         total_price = elec_price + labor_price
                         print(f"  Slot {t:2d} ({hour:4.1f}h): Elec ${elec_price:.3f}/kWh + Labor ${labor_price:.3f}/h = ${total_price:.3f}/h")
             else:
@@ -292,11 +1417,371 @@ class MaintenanceOptimizer:
                 hour = t * self.dt
                 events = active_times[t]
                 event_labels = [f"Event{i+1}" for i in events]
-                elec_price = self.P_elec.get(t, 0)
-                labor_price = self.P_labor.get(t, 0)
+                elec_price = self.elec_prices[t]
+                labor_price = self.labor_prices[t]
                 total_price = elec_price + labor_price
                 print(f"  Slot {t:2d} ({hour:4.1f}h): {', '.join(event_labels)} | "
                       f"Elec: ${elec_price:.3f}/kWh, Labor: ${labor_price:.3f}/h, Total: ${total_price:.3f}/h")
         else:
             print("No maintenance scheduled")
+
+
+def prices_from_forecast(forecast: Dict) -> Dict[int, float]:
+    """
+    Slot-indexed prices from a price forecast message
+    (schema in docs/maintenance-request/Readme.md: {"forecast_run_id", "prices": [{"start", "price"}]})
+    """
+    entries = sorted(forecast['prices'], key=lambda p: p['start'])
+    return {t: float(p['price']) for t, p in enumerate(entries)}
+
+
+class MaintenanceSession:
+    """
+    Persistent optimizer for re-planning as price forecasts are re-issued.
+    
+    The model is built and solved once; each update() patches only the affected
+    objective coefficients, skips the solve when the change cannot alter the
+    optimum and otherwise warm-starts from the previous incumbent.
+    Without a solver the session picks the first available backend that takes
+    MIP starts (CBC), so the warm start is not lost on the in-process default;
+    metrics()['solver']['warm_start'] of the optimizer tells whether it was used.
+    """
+    
+    def __init__(self, electricity_prices: Dict[int, float], labor_costs: Dict[int, float],
+                 maintenance_durations: List[int], engine: str = "milp", solver=None,
+                 forecast_run_id: str = None):
+        self.maintenance_durations = maintenance_durations
+        self.engine = engine
+        if solver is None:
+            backend = get_backend(warm_start=True)
+            solver = backend.name if backend is not None else None
+        self.solver = solver
+        self.forecast_run_id = forecast_run_id
+        self.last_update = None
+        self._rebuild(electricity_prices, labor_costs)
+    
+    def _rebuild(self, electricity_prices, labor_costs):
+        self.optimizer = MaintenanceOptimizer(
+            electricity_prices=electricity_prices,
+            labor_costs=labor_costs,
+            maintenance_durations=self.maintenance_durations,
+            engine=self.engine
+        )
+        self.optimizer.build_model()
+        self.success = self.optimizer.solve(verbose=False, solver=self.solver)
+    
+    def update(self, electricity_prices=None, labor_costs=None, forecast_run_id: str = None) -> Dict:
+        """
+        Re-plan for new prices (either may be omitted to keep the current ones).
+        Returns the update summary with 'reoptimized' telling whether a solve ran.
+        """
+        num_slots = len(self.optimizer.T)
+        for prices in (electricity_prices, labor_costs):
+            if prices is not None and len(prices) != num_slots:
+                # A different horizon changes the model itself, not just its objective
+                self._rebuild(electricity_prices if electricity_prices is not None else self.optimizer.P_elec,
+                              labor_costs if labor_costs is not None else self.optimizer.P_labor)
+                self.forecast_run_id = forecast_run_id or self.forecast_run_id
+                self.last_update = {'changed_slots': list(range(num_slots)), 'updated_coefficients': None,
+                                    'resolve_needed': True, 'reoptimized': True}
+                return self.last_update
+        
+        update = self.optimizer.update_prices(electricity_prices, labor_costs)
+        update['reoptimized'] = update['resolve_needed']
+        if update['resolve_needed']:
+            self.success = self.optimizer.solve(verbose=False, solver=self.solver, warm_start=True)
+        if forecast_run_id is not None:
+            self.forecast_run_id = forecast_run_id
+        self.last_update = update
+        return update
     
+    def update_from_forecast(self, forecast: Dict, labor_costs=None) -> Dict:
+        """Re-plan from a price forecast message, tracking its forecast_run_id"""
+        return self.update(prices_from_forecast(forecast), labor_costs,
+                           forecast_run_id=forecast.get('forecast_run_id'))
+    
+    def get_results(self) -> Dict:
+        """Results of the current plan (empty when the last solve failed)"""
+        if not self.success:
+            return {}
+        results = self.optimizer.get_results()
+        results['forecast_run_id'] = self.forecast_run_id
+        return results
+
+
+# Full-horizon comparison runs only when the monolithic MILP stays this small
+# (events x slots); the DP engine is used whenever its table fits.
+FULL_HORIZON_COMPARE_LIMIT = 50_000
+
+
+def solve_rolling_horizon(electricity_prices, labor_costs, maintenance_durations: List[int],
+                          window: int, step: int = None, engine: str = "milp", solver=None,
+                          compare_full: bool = True) -> Dict:
+    """
+    Receding-horizon (MPC) planning for long horizons.
+    
+    Solves overlapping windows of `window` slots, advancing by `step` slots
+    (default: half a window). In each window the remaining events may be deferred
+    at a terminal cost taken from the cheapest non-overlapping windows of their
+    duration after the current one, so the solver only places events that are
+    worth doing now. Events starting in the
+    window's head [pos, pos + step) are committed; the rest are carried forward.
+    The last window must place everything that is left.
+    
+    Returns get_results() for the stitched plan plus a 'rolling_horizon' entry with
+    window statistics and, when the full-horizon optimum is computable, its cost
+    and the relative gap.
+    """
+    start_time = time.perf_counter()
+    num_slots = len(electricity_prices)
+    if window <= 0:
+        raise ValueError("window must be a positive number of slots")
+    step = step or max(1, window // 2)
+    if not 0 < step <= window:
+        raise ValueError("step must be between 1 and window")
+    
+    plan = MaintenanceOptimizer(electricity_prices, labor_costs, maintenance_durations, engine=engine)
+    table = plan.prepare_costs()
+    durations = plan.L_list
+    
+    def future_window_costs(L: int, count: int, after: int) -> List[float]:
+        """
+        Costs of the `count` cheapest non-overlapping windows of length L starting at
+        or after `after`: the terminal cost of deferring that many events of length L
+        beyond a planning window (inf when fewer windows exist)
+        """
+        costs = table.total[L][after:]
+        taken = np.zeros(num_slots - after + L, dtype=bool)
+        picked = []
+        for start in np.argsort(costs, kind='stable').tolist():
+            if len(picked) == count:
+                break
+            if not taken[start:start + L].any():
+                taken[start:start + L] = True
+                picked.append(float(costs[start]))
+        return picked + [float('inf')] * (count - len(picked))
+    
+    committed = [None] * len(durations)
+    remaining = list(range(len(durations)))
+    pos = 0
+    windows_solved = 0
+    while remaining:
+        end = min(pos + window, num_slots)
+        final = end >= num_slots
+        sub_durations = [durations[i] for i in remaining]
+        
+        deferral = None
+        if not final:
+            deferral = [None] * len(remaining)
+            for L in set(sub_durations):
+                group = [k for k, d in enumerate(sub_durations) if d == L]
+                for k, cost in zip(group, future_window_costs(L, len(group), end)):
+                    deferral[k] = cost if np.isfinite(cost) else None
+            # Everything deferred must still fit after this window: the longest
+            # events become mandatory first
+            room = num_slots - end
+            for k in sorted(range(len(remaining)), key=lambda k: sub_durations[k]):
+                if deferral[k] is not None:
+                    if sub_durations[k] <= room:
+                        room -= sub_durations[k]
+                    else:
+                        deferral[k] = None
+        
+        sub = MaintenanceOptimizer(
+            electricity_prices=plan.elec_prices[pos:end],
+            labor_costs=plan.labor_prices[pos:end],
+            maintenance_durations=sub_durations,
+            engine=engine,
+            deferral_costs=deferral,
+            verbose=False
+        )
+        sub.build_model()
+        success = sub.solve(solver=solver)
+        windows_solved += 1
+        if not success:
+            raise ValueError(f"Rolling-horizon window [{pos}, {end}) has no feasible plan")
+        
+        head_end = num_slots if final else pos + step
+        still_remaining = []
+        for k, i in enumerate(remaining):
+            local_start = sub.solution_starts[k]
+            if local_start is not None and pos + local_start < head_end:
+                committed[i] = pos + local_start
+            else:
+                still_remaining.append(i)
+        remaining = still_remaining
+        if final:
+            break
+        
+        # Next window starts after the head and after every committed event
+        busy_until = max([committed[i] + durations[i] for i in range(len(durations))
+                          if committed[i] is not None] + [0])
+        pos = max(pos + step, busy_until)
+        if pos >= num_slots and remaining:
+            raise ValueError("Rolling-horizon planning ran out of horizon for the remaining events")
+    
+    plan.load_solution(committed)
+    results = plan.get_results()
+    
+    full_cost = None
+    if compare_full:
+        dp_ok = dp_table_size(num_slots, durations) <= DP_MAX_TABLE_SIZE
+        if dp_ok or len(durations) * num_slots <= FULL_HORIZON_COMPARE_LIMIT:
+            full = MaintenanceOptimizer(electricity_prices, labor_costs, maintenance_durations,
+                                        engine="dp" if dp_ok else "milp", verbose=False)
+            full.build_model()
+            if full.solve(solver=solver):
+                full_cost = full.objective_value
+    
+    gap = None
+    if full_cost is not None:
+        gap = (results['total_cost'] - full_cost) / abs(full_cost) if full_cost else 0.0
+    
+    results['rolling_horizon'] = {
+        'window': window,
+        'step': step,
+        'windows_solved': windows_solved,
+        'full_horizon_cost': full_cost,
+        'gap': gap,
+        'solve_seconds': time.perf_counter() - start_time,
+    }
+    return results
+
+
+def run_optimization(request: Dict) -> Dict:
+    """
+    Build, solve and extract one optimization request.
+    
+    request: {"electricity_prices", "labor_costs", "maintenance_durations",
+              optional "engine", "solver", "schema_version", "time_limit",
+              "mip_gap", "initial_starts", "alternatives"} with prices as
+              {slot: price} (JSON string keys are accepted) or slot-indexed lists.
+              schema_version 2 requests get results without per-slot schedules.
+    Plans are reused from the shared result cache (cache.get_cache()) when the same
+    request was solved before.
+    Returns {"status": "success", "results": get_results(), "metrics": metrics()} or
+    {"status": "failed", "error": message}; it never raises, so one bad request
+    cannot take down a batch.
+    """
+    def normalize(prices):
+        if isinstance(prices, dict):
+            return {int(k): float(v) for k, v in prices.items()}
+        return prices
+    
+    try:
+        optimizer = MaintenanceOptimizer(
+            electricity_prices=normalize(request.get('electricity_prices')),
+            labor_costs=normalize(request.get('labor_costs')),
+            maintenance_durations=request.get('maintenance_durations', [1]),
+            engine=request.get('engine', 'milp'),
+            cache=True,
+            verbose=False
+        )
+        if isinstance(request.get('initial_starts'), list):
+            optimizer.plan_cost(request['initial_starts'])  # rejects infeasible plans even on cache hits
+        success = optimizer.load_cached(request.get('solver'))
+        if not success:
+            optimizer.build_model()
+            success = optimizer.solve(solver=request.get('solver'), time_limit=request.get('time_limit'),
+                                      gap=request.get('mip_gap'), initial_starts=request.get('initial_starts'))
+        if not success:
+            return {"status": "failed", "error": "Optimization failed to find a solution",
+                    "metrics": optimizer.metrics()}
+        schedules = request.get('schema_version', 1) < 2
+        results = optimizer.get_results(schedules=schedules)
+        if request.get('alternatives'):
+            results['alternatives'] = optimizer.get_alternatives(request['alternatives'], request.get('solver'))
+        return {"status": "success", "results": results, "metrics": optimizer.metrics()}
+    except Exception as e:
+        return {"status": "failed", "error": f"{type(e).__name__}: {e}"}
+
+
+# Long-lived worker pool shared by optimize_batch() calls in this process
+_batch_pool = None
+_batch_pool_workers = None
+
+
+def init_solver_worker():
+    """Worker start-up: import the solver stack and resolve solvers once per process"""
+    from solvers import available_backends
+    available_backends()
+
+
+def get_batch_pool(workers: int = None):
+    """Process pool for batch optimization, created on first use and then reused"""
+    global _batch_pool, _batch_pool_workers
+    from concurrent.futures import ProcessPoolExecutor
+    
+    workers = workers or os.cpu_count() or 1
+    if _batch_pool is not None and _batch_pool_workers != workers:
+        shutdown_batch_pool()
+    if _batch_pool is None:
+        _batch_pool = ProcessPoolExecutor(max_workers=workers, initializer=init_solver_worker)
+        _batch_pool_workers = workers
+    return _batch_pool
+
+
+def shutdown_batch_pool():
+    """Stop the batch worker processes (they are restarted on the next batch)"""
+    global _batch_pool, _batch_pool_workers
+    if _batch_pool is not None:
+        _batch_pool.shutdown(wait=True, cancel_futures=True)
+    _batch_pool = None
+    _batch_pool_workers = None
+
+
+def iter_batch(requests: List[Dict], workers: int = None):
+    """
+    Run independent optimization requests across a pool of worker processes and
+    yield (index, run_optimization() result) pairs as they finish, so callers can
+    stream results without waiting for the slowest request.
+    
+    workers: pool size (default: all CPU cores); workers=0 runs the batch serially
+        in this process
+    A failing request (or a crashed worker) yields a "failed" entry for that
+    request only.
+    """
+    from concurrent.futures import as_completed
+    from concurrent.futures.process import BrokenProcessPool
+    
+    if workers == 0:
+        for index, request in enumerate(requests):
+            yield index, run_optimization(request)
+        return
+    
+    pool = get_batch_pool(workers)
+    futures = {pool.submit(run_optimization, request): index for index, request in enumerate(requests)}
+    broken = False
+    try:
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except BrokenProcessPool as e:
+                broken = True
+                result = {"status": "failed", "error": f"Worker process died: {e}"}
+            except Exception as e:
+                result = {"status": "failed", "error": f"{type(e).__name__}: {e}"}
+            yield futures[future], result
+    finally:
+        # Abandoned iteration (e.g. a disconnected client) should not keep the pool busy
+        for future in futures:
+            future.cancel()
+        # A dead worker breaks the whole executor; start a fresh one next time
+        if broken:
+            shutdown_batch_pool()
+
+
+def optimize_batch(requests: List[Dict], workers: int = None) -> List[Dict]:
+    """
+    Run independent optimization requests across a pool of worker processes.
+    
+    requests: list of run_optimization() request dicts
+    workers: pool size (default: all CPU cores); workers=0 runs the batch serially
+        in this process
+    Returns one run_optimization() result per request, in request order. A failing
+    request (or a crashed worker) yields a "failed" entry for that request only.
+    """
+    results = [None] * len(requests)
+    for index, result in iter_batch(requests, workers):
+        results[index] = result
+    return results
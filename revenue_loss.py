@@ -0,0 +1,744 @@
+#!/usr/bin/env python3
+"""
+BESS revenue loss analysis (docs/revenue-loss-v2/Readme.md) with NumPy
+Port of the browser tool's standardization and loss decomposition
+(docs/revenue-loss-v2/app.js) that works on whole arrays per battery, so a
+fleet-year of 5-minute telemetry is analyzed in seconds instead of looping
+over every interval
+
+    python revenue_loss.py docs/revenue-loss-v2/files   # key metrics as JSON
+
+Timestamps are int64 milliseconds since the epoch (UTC), like JS Date values.
+Missing values (JS null) are NaN in float columns.
+"""
+
+import argparse
+import bisect
+import csv
+import heapq
+import json
+import os
+import sys
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+DISCRETIZATION_INTERVAL_MIN = 5  # Discretization interval in minutes
+DEFAULT_PRICE_INTERVAL_MIN = 15  # Price interval when a record has none
+
+# Input files of the browser tool, by role
+INPUT_FILES = {
+    'batteryMeta': 'battery_meta',
+    'priceData': 'price_15min',
+    'predictedSchedule': 'pred_schedule',
+    'actualEvents': 'actual_events_5min',
+}
+
+MINUTE_MS = 60_000
+
+
+def read_records(path: str) -> List[Dict]:
+    """JSON array or CSV file as a list of records (CSV values that look numeric become floats)"""
+    with open(path) as f:
+        if not path.lower().endswith('.csv'):
+            return json.load(f)
+        records = []
+        for row in csv.DictReader(f):
+            record = {}
+            for key, value in row.items():
+                value = (value or '').strip()
+                try:
+                    record[key.strip()] = float(value) if value else value
+                except ValueError:
+                    record[key.strip()] = value
+            records.append(record)
+        return records
+
+
+def load_input_files(directory: str) -> Dict[str, List[Dict]]:
+    """The four input files (JSON or CSV) from a directory, keyed like app.js rawData"""
+    raw = {}
+    for role, stem in INPUT_FILES.items():
+        for extension in ('.json', '.csv'):
+            path = os.path.join(directory, stem + extension)
+            if os.path.exists(path):
+                raw[role] = read_records(path)
+                break
+        else:
+            raise FileNotFoundError(f"{stem}.json or {stem}.csv not found in {directory}")
+    return raw
+
+
+def _parse_ms(value: str) -> int:
+    ts = datetime.fromisoformat(value)
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return int(ts.timestamp() * 1000)
+
+
+def parse_timestamps(values: Iterable[str]) -> np.ndarray:
+    """
+    ISO 8601 timestamps as int64 milliseconds since the epoch.
+    Timestamps without an offset are taken as UTC. Each distinct string is parsed
+    once, since fleet data repeats every timestamp for every battery.
+    """
+    values = list(values)
+    lookup = {value: _parse_ms(value) for value in set(values)}
+    return np.array(list(map(lookup.__getitem__, values)), dtype=np.int64)
+
+
+def format_timestamp(ms: int) -> str:
+    """Milliseconds since the epoch as JS Date.toISOString() ('2024-01-01T10:00:00.000Z')"""
+    ts = datetime.fromtimestamp(int(ms) / 1000, tz=timezone.utc)
+    return ts.strftime('%Y-%m-%dT%H:%M:%S.') + f"{int(ms) % 1000:03d}Z"
+
+
+def _column(records: List[Dict], key: str) -> np.ndarray:
+    """Float column of a record list (missing or null values are NaN)"""
+    return np.array([r.get(key) for r in records], dtype=float)
+
+
+def _battery_codes(battery_ids) -> Tuple[List[str], np.ndarray]:
+    """Battery ids in order of first appearance and each row's index into them"""
+    if isinstance(battery_ids, np.ndarray) and len(battery_ids):
+        # Fast path for battery-major columns: one contiguous run per battery
+        heads = np.flatnonzero(np.concatenate(([True], battery_ids[1:] != battery_ids[:-1])))
+        ids = battery_ids[heads].tolist()
+        if len(set(ids)) == len(ids):
+            return ids, np.repeat(np.arange(len(ids)), np.diff(np.append(heads, len(battery_ids))))
+        battery_ids = battery_ids.tolist()
+    battery_ids = [str(b) for b in battery_ids]
+    lookup = {b: code for code, b in enumerate(dict.fromkeys(battery_ids))}
+    return list(lookup), np.array(list(map(lookup.__getitem__, battery_ids)), dtype=np.int64)
+
+
+def price_columns(price_data: List[Dict]) -> Dict[str, np.ndarray]:
+    """Price records as arrays: 'ts', 'end_ts' (ts + interval_min, 15 by default), 'price_eur_mwh'"""
+    ts = parse_timestamps(p['ts'] for p in price_data)
+    lengths = np.array([p.get('interval_min') or DEFAULT_PRICE_INTERVAL_MIN for p in price_data], dtype=float)
+    return {'ts': ts, 'end_ts': ts + (lengths * MINUTE_MS).astype(np.int64),
+            'price_eur_mwh': _column(price_data, 'price_eur_mwh')}
+
+
+def schedule_columns(schedule_data: List[Dict]) -> Dict:
+    """Schedule blocks as arrays: 'battery_ids' + per-block 'battery' code, 'start_ts', 'end_ts', 'mode', 'power_kw'"""
+    battery_ids, codes = _battery_codes([s['battery_id'] for s in schedule_data])
+    return {'battery_ids': battery_ids, 'battery': codes,
+            'start_ts': parse_timestamps(s['start_ts'] for s in schedule_data),
+            'end_ts': parse_timestamps(s['end_ts'] for s in schedule_data),
+            'mode': np.array([s.get('mode') or '' for s in schedule_data]),
+            'power_kw': _column(schedule_data, 'power_kw')}
+
+
+def event_columns(events_data: List[Dict]) -> Dict:
+    """Telemetry as arrays: 'battery_ids' + per-event 'battery' code, 'ts', 'mode', 'power_kw', 'soc_pct'"""
+    battery_ids, codes = _battery_codes([e['battery_id'] for e in events_data])
+    return {'battery_ids': battery_ids, 'battery': codes,
+            'ts': parse_timestamps(e['ts'] for e in events_data),
+            'mode': np.array([e.get('mode') or '' for e in events_data]),
+            'power_kw': _column(events_data, 'power_kw'),
+            'soc_pct': _column(events_data, 'soc_pct')}
+
+
+def to_columns(raw: Dict) -> Dict:
+    """
+    Raw inputs with price, schedule and event records converted to arrays once
+    (the standardize functions accept either form)
+    """
+    converters = {'priceData': price_columns, 'predictedSchedule': schedule_columns,
+                  'actualEvents': event_columns}
+    return {role: converters[role](data) if role in converters and isinstance(data, list) else data
+            for role, data in raw.items()}
+
+
+def _as_columns(data, converter) -> Dict:
+    return converter(data) if isinstance(data, list) else data
+
+
+def _num_rows(data) -> int:
+    """Number of records in a record list or a columns dict"""
+    if isinstance(data, list):
+        return len(data)
+    return len(data['ts'] if 'ts' in data else data['start_ts'])
+
+
+def _flatten_blocks(rows: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> Tuple[List, List, List]:
+    """
+    One battery's [start, end) blocks as disjoint segments (starts, ends, block row),
+    each owned by the covering block that comes first in record order
+    """
+    keep = ends > starts  # blocks that end before they start never match
+    rows, starts, ends = rows[keep].tolist(), starts[keep].tolist(), ends[keep].tolist()
+    order = sorted(range(len(rows)), key=starts.__getitem__)
+    bounds = sorted(set(starts) | set(ends))
+    seg_starts, seg_ends, seg_rows = [], [], []
+    active = []  # heap of (row, end) of the blocks started so far; expired ones are dropped lazily
+    next_block = 0
+    for left, right in zip(bounds, bounds[1:]):
+        while next_block < len(order) and starts[order[next_block]] <= left:
+            block = order[next_block]
+            heapq.heappush(active, (rows[block], ends[block]))
+            next_block += 1
+        while active and active[0][1] <= left:
+            heapq.heappop(active)
+        if not active:
+            continue
+        row = active[0][0]
+        if seg_rows and seg_rows[-1] == row and seg_ends[-1] == left:
+            seg_ends[-1] = right
+        else:
+            seg_starts.append(left)
+            seg_ends.append(right)
+            seg_rows.append(row)
+    return seg_starts, seg_ends, seg_rows
+
+
+class ScheduleIndex:
+    """
+    Per-battery interval index over schedule blocks: which block covers a timestamp.
+
+    A lookup returns what a linear scan of the records would: the first block
+    (in record order) of the battery with start_ts <= ts < end_ts. Timestamps are
+    parsed once and the blocks are flattened into disjoint segments, so a lookup
+    is a bisect and lookup_many() is one searchsorted for a whole array.
+    """
+
+    def __init__(self, schedule_data):
+        """schedule_data: schedule records or schedule_columns()"""
+        columns = _as_columns(schedule_data, schedule_columns)
+        self.battery_ids = list(columns['battery_ids'])
+        codes = columns['battery']
+        order = np.argsort(codes, kind='stable')
+        bounds = np.cumsum(np.bincount(codes, minlength=len(self.battery_ids)))
+        self._segments = {}
+        for battery_id, rows in zip(self.battery_ids, np.split(order, bounds[:-1])):
+            self._segments[battery_id] = _flatten_blocks(rows, columns['start_ts'][rows], columns['end_ts'][rows])
+
+    def lookup(self, battery_id: str, ts_ms: int) -> int:
+        """Row of the block covering ts_ms (epoch milliseconds), or -1"""
+        segments = self._segments.get(battery_id)
+        if segments is None:
+            return -1
+        starts, ends, rows = segments
+        i = bisect.bisect_right(starts, ts_ms) - 1
+        return rows[i] if i >= 0 and ts_ms < ends[i] else -1
+
+    def lookup_many(self, battery_id: str, ts_ms: np.ndarray) -> np.ndarray:
+        """Rows of the blocks covering each timestamp (-1 where none does)"""
+        ts_ms = np.asarray(ts_ms, dtype=np.int64)
+        segments = self._segments.get(battery_id)
+        if not segments or not segments[0]:
+            return np.full(len(ts_ms), -1, dtype=np.int64)
+        starts, ends, rows = (np.asarray(values, dtype=np.int64) for values in segments)
+        i = np.searchsorted(starts, ts_ms, side='right') - 1
+        found = (i >= 0) & (ts_ms < ends[np.maximum(i, 0)])
+        return np.where(found, rows[np.maximum(i, 0)], -1)
+
+
+def discretization_intervals(start_ms: int, end_ms: int,
+                             interval_min: int = DISCRETIZATION_INTERVAL_MIN) -> np.ndarray:
+    """Start of every discretization interval in [start, end)"""
+    return np.arange(start_ms, end_ms, interval_min * MINUTE_MS, dtype=np.int64)
+
+
+def determine_analysis_time_range(raw: Dict[str, List[Dict]],
+                                  interval_min: int = DISCRETIZATION_INTERVAL_MIN) -> Tuple[int, int]:
+    """
+    (start, end) covering every price interval, schedule block and event. Like
+    app.js, start is rounded down to an interval boundary and end is rounded up
+    by its minute (seconds are dropped).
+    """
+    timestamps = [np.zeros(0, dtype=np.int64)]
+    for role, converter, keys in (('priceData', price_columns, ('ts', 'end_ts')),
+                                  ('predictedSchedule', schedule_columns, ('start_ts', 'end_ts')),
+                                  ('actualEvents', event_columns, ('ts',))):
+        if raw.get(role) and _num_rows(raw[role]):
+            columns = _as_columns(raw[role], converter)
+            timestamps += [columns[key] for key in keys]
+    timestamps = np.concatenate(timestamps)
+    if len(timestamps) == 0:
+        raise ValueError('No valid timestamps found in input data')
+
+    step = interval_min * MINUTE_MS
+    start = int(timestamps.min()) // step * step
+    end = int(timestamps.max()) // MINUTE_MS * MINUTE_MS
+    end = -(-end // step) * step
+    return start, end
+
+
+def standardize_price_data(price_data, intervals: np.ndarray) -> np.ndarray:
+    """
+    Price (EUR/MWh) for every interval: the earliest price record whose
+    [ts, ts + interval_min) covers the interval start, NaN when none does.
+    price_data: records or price_columns()
+    """
+    if _num_rows(price_data) == 0:
+        return np.full(len(intervals), np.nan)
+    columns = _as_columns(price_data, price_columns)
+    order = np.argsort(columns['ts'], kind='stable')
+    starts, ends, values = columns['ts'][order], columns['end_ts'][order], columns['price_eur_mwh'][order]
+
+    # Among records starting at or before t, the first one still running at t is
+    # the first whose running maximum end passes t
+    started = np.searchsorted(starts, intervals, side='right')
+    first_running = np.searchsorted(np.maximum.accumulate(ends), intervals, side='right')
+    prices = np.full(len(intervals), np.nan)
+    covered = first_running < started
+    prices[covered] = values[first_running[covered]]
+    return prices
+
+
+def standardize_predicted_schedule(schedule_data, intervals: np.ndarray,
+                                   interval_min: int = DISCRETIZATION_INTERVAL_MIN) -> Dict[str, Dict]:
+    """
+    Schedule blocks exploded onto the intervals, per battery:
+    {battery_id: {'scheduled', 'mode', 'power_kw'}} with one entry per interval
+    ('scheduled' is False where no block overlaps it). Where blocks overlap, the
+    one covering most of the interval wins (the earlier record on ties).
+    schedule_data: records or schedule_columns()
+    """
+    if _num_rows(schedule_data) == 0 or len(intervals) == 0:
+        return {}
+    columns = _as_columns(schedule_data, schedule_columns)
+    n = len(intervals)
+    step = interval_min * MINUTE_MS
+    origin = int(intervals[0])
+    battery_ids, codes = columns['battery_ids'], columns['battery']
+    block_start, block_end = columns['start_ts'], columns['end_ts']
+    modes, power = columns['mode'], columns['power_kw']
+
+    # One candidate per (block, overlapped interval)
+    first = np.clip((block_start - origin) // step, 0, n)
+    last = np.clip(-(-(block_end - origin) // step), 0, n)
+    counts = np.maximum(last - first, 0)
+    block = np.repeat(np.arange(len(codes)), counts)
+    offsets = np.cumsum(counts) - counts
+    k = first[block] + np.arange(len(block)) - offsets[block]
+    interval_start = origin + k * step
+    overlap = (np.minimum(interval_start + step, block_end[block])
+               - np.maximum(interval_start, block_start[block]))
+    # Per (battery, interval): largest positive overlap first, then record order
+    order = np.lexsort((block, -np.maximum(overlap, 0), k, codes[block]))
+    key = codes[block][order] * n + k[order]
+    winners = order[np.concatenate(([True], key[1:] != key[:-1]))]
+
+    standardized = {}
+    for code, battery_id in enumerate(battery_ids):
+        mine = winners[codes[block[winners]] == code]
+        scheduled = np.zeros(n, dtype=bool)
+        scheduled[k[mine]] = True
+        mode = np.full(n, '', dtype=modes.dtype)
+        mode[k[mine]] = modes[block[mine]]
+        power_kw = np.full(n, np.nan)
+        power_kw[k[mine]] = power[block[mine]]
+        standardized[battery_id] = {'scheduled': scheduled, 'mode': mode, 'power_kw': power_kw}
+    return standardized
+
+
+def standardize_actual_events(events_data, intervals: np.ndarray,
+                              interval_min: int = DISCRETIZATION_INTERVAL_MIN) -> Dict[str, Dict]:
+    """
+    Events bucketed onto the intervals, per battery: {battery_id: {'mode',
+    'power_kw', 'soc_pct'}} for every interval. Power is averaged over the events
+    in an interval (null power adds 0), mode and SoC come from its latest event;
+    intervals without events are DOWNTIME with 0 kW and no SoC.
+    events_data: records or event_columns()
+    """
+    if _num_rows(events_data) == 0 or len(intervals) == 0:
+        return {}
+    columns = _as_columns(events_data, event_columns)
+    n = len(intervals)
+    step = interval_min * MINUTE_MS
+    origin = int(intervals[0])
+    battery_ids, codes = columns['battery_ids'], columns['battery']
+    ts, modes = columns['ts'], columns['mode']
+    power, soc = columns['power_kw'], columns['soc_pct']
+
+    k = (ts - origin) // step
+    inside = (k >= 0) & (k < n)
+    key = codes * n + k
+    # bincount adds the weights in record order, like the JS reduce (where null adds 0)
+    total = np.bincount(key[inside], weights=np.nan_to_num(power[inside], nan=0.0),
+                        minlength=len(battery_ids) * n)
+    count = np.bincount(key[inside], minlength=len(battery_ids) * n)
+    # Latest event per bucket (the earlier record on equal timestamps)
+    rows = np.flatnonzero(inside)
+    order = rows[np.lexsort((rows, -ts[rows], key[rows]))]
+    latest = order[np.concatenate(([True], key[order][1:] != key[order][:-1]))]
+
+    standardized = {}
+    for code, battery_id in enumerate(battery_ids):
+        window = slice(code * n, (code + 1) * n)
+        has_events = count[window] > 0
+        power_kw = np.zeros(n)
+        power_kw[has_events] = total[window][has_events] / count[window][has_events]
+        mine = latest[codes[latest] == code]
+        mode = np.full(n, 'DOWNTIME', dtype=np.result_type(modes.dtype, '<U8'))
+        mode[k[mine]] = modes[mine]
+        soc_pct = np.full(n, np.nan)
+        soc_pct[k[mine]] = soc[mine]
+        standardized[battery_id] = {'mode': mode, 'power_kw': power_kw, 'soc_pct': soc_pct}
+    return standardized
+
+
+def standardize_input_data(raw: Dict[str, List[Dict]], start_ms: int, end_ms: int,
+                           interval_min: int = DISCRETIZATION_INTERVAL_MIN) -> Dict:
+    """Validate the raw inputs and standardize them onto the intervals of [start, end)"""
+    for role, label in (('batteryMeta', 'Battery metadata'), ('priceData', 'Price data'),
+                        ('predictedSchedule', 'Predicted schedule'), ('actualEvents', 'Actual events data')):
+        if not isinstance(raw.get(role), (list, dict)):
+            raise ValueError(f"{label} is required and must be an array")
+    intervals = discretization_intervals(start_ms, end_ms, interval_min)
+    return {
+        'battery_meta': raw['batteryMeta'],
+        'intervals': intervals,
+        'interval_min': interval_min,
+        'price_eur_mwh': standardize_price_data(raw['priceData'], intervals),
+        'predicted': standardize_predicted_schedule(raw['predictedSchedule'], intervals, interval_min),
+        'actual': standardize_actual_events(raw['actualEvents'], intervals, interval_min),
+        'start': start_ms,
+        'end': end_ms,
+    }
+
+
+def calculate_energy(power_kw, interval_min: float = DISCRETIZATION_INTERVAL_MIN):
+    """Energy (kWh) of running at power_kw for interval_min minutes"""
+    return power_kw * (interval_min / 60)
+
+
+def calculate_revenue(energy_kwh, price_eur_mwh):
+    """Revenue (EUR) of energy_kwh at price_eur_mwh (NaN price -> NaN revenue)"""
+    return energy_kwh * (price_eur_mwh / 1000)
+
+
+def calculate_revenue_analysis(standardized: Dict) -> Dict:
+    """
+    Predicted vs actual revenue for every scheduled (battery, interval).
+
+    Returns {'comparison': columns, 'summary': totals}. The comparison columns
+    match app.js comparisonData (battery_id, ts, pred_mode, pred_power_kw,
+    pred_energy_kwh, rev_pred_eur, act_mode, act_power_kw, act_energy_kwh,
+    rev_act_eur, soc_pct, revenue_loss_eur, price_eur_mwh) as arrays, ordered by
+    battery, then time. As in app.js, zero actual revenue and zero SoC show as
+    missing (NaN) in the comparison. A scheduled battery without any telemetry
+    is NO_DATA with no loss (app.js raises a TypeError there).
+    """
+    intervals = standardized['intervals']
+    interval_min = standardized['interval_min']
+    price = standardized['price_eur_mwh']
+    n = len(intervals)
+    columns = {name: [] for name in ('battery_id', 'ts', 'pred_mode', 'pred_power_kw', 'pred_energy_kwh',
+                                     'rev_pred_eur', 'act_mode', 'act_power_kw', 'act_energy_kwh',
+                                     'rev_act_eur', 'soc_pct', 'revenue_loss_eur', 'price_eur_mwh')}
+    total_actual = 0.0
+    for actual in standardized['actual'].values():
+        rev_act = calculate_revenue(calculate_energy(actual['power_kw'], interval_min), price)
+        total_actual += float(np.nansum(rev_act))
+
+    for battery_id, predicted in standardized['predicted'].items():
+        rows = np.flatnonzero(predicted['scheduled'])
+        pred_power = predicted['power_kw'][rows]
+        # null power adds no energy, like null * x in app.js (the power column keeps the null)
+        pred_energy = calculate_energy(np.nan_to_num(pred_power, nan=0.0), interval_min)
+        rev_pred = calculate_revenue(pred_energy, price[rows])
+        actual = standardized['actual'].get(battery_id)
+        if actual is not None:
+            act_mode = actual['mode'][rows]
+            act_power = actual['power_kw'][rows]
+            act_energy = calculate_energy(act_power, interval_min)
+            rev_act = calculate_revenue(act_energy, price[rows])
+            loss = rev_pred - rev_act
+            soc = actual['soc_pct'][rows]
+        else:
+            act_mode = np.full(len(rows), 'NO_DATA')
+            act_power = act_energy = rev_act = np.zeros(len(rows))
+            loss = np.full(len(rows), np.nan)
+            soc = np.full(len(rows), np.nan)
+        columns['battery_id'].append(np.full(len(rows), battery_id))
+        columns['ts'].append(intervals[rows])
+        columns['pred_mode'].append(predicted['mode'][rows])
+        columns['pred_power_kw'].append(pred_power)
+        columns['pred_energy_kwh'].append(pred_energy)
+        columns['rev_pred_eur'].append(rev_pred)
+        columns['act_mode'].append(act_mode)
+        columns['act_power_kw'].append(np.nan_to_num(act_power, nan=0.0))
+        columns['act_energy_kwh'].append(np.nan_to_num(act_energy, nan=0.0))
+        columns['rev_act_eur'].append(np.where(rev_act == 0, np.nan, rev_act))
+        columns['soc_pct'].append(np.where(soc == 0, np.nan, soc))
+        columns['revenue_loss_eur'].append(loss)
+        columns['price_eur_mwh'].append(price[rows])
+
+    empty = {'battery_id': np.zeros(0, dtype=str), 'ts': np.zeros(0, dtype=np.int64),
+             'pred_mode': np.zeros(0, dtype=str), 'act_mode': np.zeros(0, dtype=str)}
+    comparison = {name: np.concatenate(parts) if parts else empty.get(name, np.zeros(0))
+                  for name, parts in columns.items()}
+    return {
+        'comparison': comparison,
+        'summary': {
+            'totalPredictedRevenue': float(np.nansum(comparison['rev_pred_eur'])),
+            'totalActualRevenue': total_actual,
+            'totalRevenueLoss': float(np.nansum(comparison['revenue_loss_eur'])),
+        },
+        'intervals': n,
+    }
+
+
+def comparison_from_records(records: List[Dict]) -> Dict[str, np.ndarray]:
+    """Comparison columns from app.js-style comparisonData records (missing fields are NaN)"""
+    return {
+        'battery_id': np.array([str(r['battery_id']) for r in records]),
+        'act_mode': np.array([r.get('act_mode') or 'NO_DATA' for r in records]),
+        **{name: _column(records, name) for name in ('pred_power_kw', 'act_power_kw', 'act_energy_kwh',
+                                                     'rev_pred_eur', 'rev_act_eur', 'price_eur_mwh',
+                                                     'revenue_loss_eur')},
+    }
+
+
+def calculate_downtime_loss(comparison: Dict[str, np.ndarray]) -> float:
+    """Predicted revenue of the intervals the battery was in DOWNTIME"""
+    downtime = comparison['act_mode'] == 'DOWNTIME'
+    return float(np.nansum(comparison['rev_pred_eur'][downtime]))
+
+
+def calculate_deviation_loss(total_loss: float, downtime_loss: float) -> float:
+    """Loss not due to downtime"""
+    return total_loss - downtime_loss
+
+
+def _per_battery(comparison: Dict[str, np.ndarray], battery_meta: List[Dict]):
+    """(battery ids, row codes, meta per battery or None)"""
+    battery_ids, codes = _battery_codes(comparison['battery_id'])
+    meta = {str(b['battery_id']): b for b in battery_meta}
+    return battery_ids, codes, [meta.get(b) for b in battery_ids]
+
+
+def _sums(codes: np.ndarray, values: np.ndarray, size: int) -> np.ndarray:
+    return np.bincount(codes, weights=values, minlength=size)
+
+
+def _partial_availability(comparison: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """(|predicted power|, a(t) = min(1, |actual| / |predicted|), 1 without prediction)"""
+    pred = np.abs(np.nan_to_num(comparison['pred_power_kw'], nan=0.0))
+    act = np.abs(np.nan_to_num(comparison['act_power_kw'], nan=0.0))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        partial = np.where(pred > 0, np.minimum(1, act / pred), 1.0)
+    return pred, partial
+
+
+def calculate_utilization(comparison: Dict[str, np.ndarray], battery_meta: List[Dict],
+                          total_time_hours: float) -> Dict[str, Dict]:
+    """Actual energy throughput as a share of rated power * time, per battery"""
+    battery_ids, codes, metas = _per_battery(comparison, battery_meta)
+    dispatched = _sums(codes, np.abs(np.nan_to_num(comparison['act_energy_kwh'], nan=0.0)), len(battery_ids))
+    utilization = {}
+    for code, (battery_id, meta) in enumerate(zip(battery_ids, metas)):
+        if meta is None:
+            utilization[battery_id] = {'error': 'Battery metadata not found'}
+            continue
+        potential = meta['power_kw'] * total_time_hours
+        utilization[battery_id] = {
+            'battery_id': battery_id,
+            'rated_power_kw': meta['power_kw'],
+            'capacity_kwh': meta.get('capacity_kwh'),
+            'total_actual_energy_dispatched_kwh': float(dispatched[code]),
+            'potential_energy_throughput_kwh': potential,
+            'utilization_percent': float(dispatched[code]) / potential * 100 if potential > 0 else 0,
+            'analysis_time_hours': total_time_hours,
+        }
+    return utilization
+
+
+def calculate_time_based_availability(comparison: Dict[str, np.ndarray]) -> Dict[str, Dict]:
+    """A_time: share of intervals not in DOWNTIME, per battery"""
+    battery_ids, codes = _battery_codes(comparison['battery_id'])
+    total = np.bincount(codes, minlength=len(battery_ids))
+    available = np.bincount(codes[comparison['act_mode'] != 'DOWNTIME'], minlength=len(battery_ids))
+    return {
+        battery_id: {
+            'battery_id': battery_id,
+            'total_slices': int(total[code]),
+            'non_downtime_slices': int(available[code]),
+            'downtime_slices': int(total[code] - available[code]),
+            'a_time_percent': int(available[code]) / int(total[code]) * 100 if total[code] > 0 else 0,
+        }
+        for code, battery_id in enumerate(battery_ids)
+    }
+
+
+def calculate_value_based_availability(comparison: Dict[str, np.ndarray], battery_meta: List[Dict],
+                                       p_min_percent: float = 5) -> Dict[str, Dict]:
+    """A_dispatch: mean a(t) over instructed intervals (|predicted power| >= P_min), per battery"""
+    battery_ids, codes, metas = _per_battery(comparison, battery_meta)
+    pred, partial = _partial_availability(comparison)
+    availability = {}
+    for code, (battery_id, meta) in enumerate(zip(battery_ids, metas)):
+        if meta is None:
+            availability[battery_id] = {'error': 'Battery metadata not found'}
+            continue
+        mine = codes == code
+        p_min = meta['power_kw'] * (p_min_percent / 100)
+        instructed = mine & (pred >= p_min)
+        count = int(np.count_nonzero(instructed))
+        total_slices = int(np.count_nonzero(mine))
+        availability[battery_id] = {
+            'battery_id': battery_id,
+            'rated_power_kw': meta['power_kw'],
+            'p_min_kw': p_min,
+            'total_slices': total_slices,
+            'instructed_slices': count,
+            'non_instructed_slices': total_slices - count,
+            'a_dispatch_percent': float(partial[instructed].sum()) / count * 100 if count > 0 else 100,
+        }
+    return availability
+
+
+def calculate_price_weighted_availability(comparison: Dict[str, np.ndarray], battery_meta: List[Dict],
+                                          p_min_percent: float = 5) -> Dict[str, Dict]:
+    """A_econ: a(t) weighted by price * |predicted power| (positive weights only), per battery"""
+    battery_ids, codes, metas = _per_battery(comparison, battery_meta)
+    pred, partial = _partial_availability(comparison)
+    weight = np.nan_to_num(comparison['price_eur_mwh'], nan=0.0) * pred
+    weight = np.where(weight > 0, weight, 0.0)
+    total_weight = _sums(codes, weight, len(battery_ids))
+    weighted = _sums(codes, partial * weight, len(battery_ids))
+    availability = {}
+    for code, (battery_id, meta) in enumerate(zip(battery_ids, metas)):
+        if meta is None:
+            availability[battery_id] = {'error': 'Battery metadata not found'}
+            continue
+        availability[battery_id] = {
+            'battery_id': battery_id,
+            'rated_power_kw': meta['power_kw'],
+            'p_min_kw': meta['power_kw'] * (p_min_percent / 100),
+            'total_weight': float(total_weight[code]),
+            'a_econ_percent': float(weighted[code] / total_weight[code]) * 100 if total_weight[code] > 0 else 100,
+        }
+    return availability
+
+
+def calculate_headroom_cost(comparison: Dict[str, np.ndarray], time_based_availability: Dict[str, Dict],
+                            sla_target_percent: float = 95) -> Dict[str, Dict]:
+    """Net revenue deviation over non-DOWNTIME intervals of batteries whose A_time meets the SLA"""
+    battery_ids, codes = _battery_codes(comparison['battery_id'])
+    up = comparison['act_mode'] != 'DOWNTIME'
+    difference = (np.nan_to_num(comparison['rev_pred_eur'], nan=0.0)
+                  - np.nan_to_num(comparison['rev_act_eur'], nan=0.0))
+    cost = _sums(codes[up], difference[up], len(battery_ids))
+    up_slices = np.bincount(codes[up], minlength=len(battery_ids))
+    headroom = {}
+    for code, battery_id in enumerate(battery_ids):
+        a_time = (time_based_availability.get(battery_id) or {}).get('a_time_percent')
+        sla_met = a_time is not None and a_time >= sla_target_percent
+        headroom[battery_id] = {
+            'battery_id': battery_id,
+            'headroom_cost_eur': float(cost[code]) if sla_met else 0,
+            'qualifying_slices': int(up_slices[code]) if sla_met else 0,
+            'total_non_downtime_slices': int(up_slices[code]),
+            'battery_a_time_percent': a_time or 0,
+            'sla_target_percent': sla_target_percent,
+            'sla_met': sla_met,
+        }
+    return headroom
+
+
+def calculate_key_metrics(revenue_analysis: Dict, battery_meta: List[Dict], start_ms: int, end_ms: int,
+                          p_min_percent: float = 5, sla_target_percent: float = 95) -> Dict:
+    """
+    Loss decomposition, utilization and availability metrics, with the same
+    structure and keys as app.js calculateKeyMetrics()
+    """
+    comparison = revenue_analysis['comparison']
+    total_time_hours = (end_ms - start_ms) / (1000 * 60 * 60)
+
+    total_loss = revenue_analysis['summary']['totalRevenueLoss']
+    downtime_loss = calculate_downtime_loss(comparison)
+    deviation_loss = calculate_deviation_loss(total_loss, downtime_loss)
+    utilization = calculate_utilization(comparison, battery_meta, total_time_hours)
+
+    time_based = calculate_time_based_availability(comparison)
+    value_based = calculate_value_based_availability(comparison, battery_meta, p_min_percent)
+    price_weighted = calculate_price_weighted_availability(comparison, battery_meta, p_min_percent)
+    headroom = calculate_headroom_cost(comparison, time_based, sla_target_percent)
+
+    known = [u for u in utilization.values() if 'utilization_percent' in u]
+    actual_energy = sum(u['total_actual_energy_dispatched_kwh'] for u in known)
+    potential_energy = sum(u['potential_energy_throughput_kwh'] for u in known)
+    total_slices = sum(a['total_slices'] for a in time_based.values())
+    available_slices = sum(a['non_downtime_slices'] for a in time_based.values())
+
+    return {
+        'revenueLoss': {
+            'total_loss_eur': total_loss,
+            'downtime_loss_eur': downtime_loss,
+            'deviation_loss_eur': deviation_loss,
+            'downtime_loss_percent': downtime_loss / abs(total_loss) * 100 if total_loss != 0 else 0,
+            'deviation_loss_percent': deviation_loss / abs(total_loss) * 100 if total_loss != 0 else 0,
+        },
+        'utilization': {
+            'by_battery': utilization,
+            'overall_utilization_percent': actual_energy / potential_energy * 100 if potential_energy > 0 else 0,
+            'total_actual_energy_dispatched_kwh': actual_energy,
+            'total_potential_energy_throughput_kwh': potential_energy,
+        },
+        'availability': {
+            'time_based': {
+                'by_battery': time_based,
+                'overall_a_time_percent': available_slices / total_slices * 100 if total_slices > 0 else 0,
+            },
+            'value_based': {'by_battery': value_based, 'p_min_percent': p_min_percent},
+            'price_weighted': {'by_battery': price_weighted},
+            'headroom_cost': {
+                'by_battery': headroom,
+                'total_headroom_cost_eur': sum(h['headroom_cost_eur'] for h in headroom.values()),
+                'sla_target_percent': sla_target_percent,
+            },
+        },
+        'analysisMetadata': {
+            'analysis_start': format_timestamp(start_ms),
+            'analysis_end': format_timestamp(end_ms),
+            'analysis_duration_hours': total_time_hours,
+            'total_intervals': len(comparison['battery_id']),
+            'batteries_analyzed': len(utilization),
+            'p_min_percent': p_min_percent,
+            'sla_target_percent': sla_target_percent,
+        },
+    }
+
+
+def analyze(raw: Dict[str, List[Dict]], interval_min: int = DISCRETIZATION_INTERVAL_MIN,
+            p_min_percent: float = 5, sla_target_percent: float = 95) -> Dict:
+    """
+    Full pipeline of the browser tool: time range, standardization, revenue
+    analysis and key metrics. Returns {'standardized', 'revenue_analysis', 'key_metrics'}.
+    """
+    raw = to_columns(raw)
+    start, end = determine_analysis_time_range(raw, interval_min)
+    standardized = standardize_input_data(raw, start, end, interval_min)
+    revenue_analysis = calculate_revenue_analysis(standardized)
+    key_metrics = calculate_key_metrics(revenue_analysis, raw['batteryMeta'], start, end,
+                                        p_min_percent, sla_target_percent)
+    return {'standardized': standardized, 'revenue_analysis': revenue_analysis, 'key_metrics': key_metrics}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('directory', help="folder with battery_meta, price_15min, pred_schedule "
+                                          "and actual_events_5min (.json or .csv)")
+    parser.add_argument('--interval', type=int, default=DISCRETIZATION_INTERVAL_MIN,
+                        help="discretization interval in minutes (default: %(default)s)")
+    parser.add_argument('--p-min', type=float, default=5, help="P_min in %% of rated power (default: 5)")
+    parser.add_argument('--sla', type=float, default=95, help="A_time SLA target in %% (default: 95)")
+    args = parser.parse_args(argv)
+
+    result = analyze(load_input_files(args.directory), args.interval, args.p_min, args.sla)
+    json.dump({'summary': result['revenue_analysis']['summary'], **result['key_metrics']},
+              sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Solver backends for the MaintenanceOptimizer
+Registry of MILP solvers that are discovered once per process and selectable per solve
+"""
+
+import functools
+import os
+import re
+import tempfile
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pulp
+
+
+class SolverBackend:
+    """
+    Base class for a MILP solver backend.
+    A backend solves a built PuLP model and writes the solution back into its
+    variables (varValue) and status, so results are read the same way for every backend.
+    Like PuLP's CBC interface, a search stopped by a limit with an incumbent leaves
+    status Optimal with sol_status LpSolutionIntegerFeasible.
+    """
+    name = ""
+    label = ""
+    in_process = False
+    supports_warm_start = False
+
+    def available(self) -> bool:
+        raise NotImplementedError
+
+    def solve(self, model: pulp.LpProblem, msg: bool = False, warm_start: bool = False,
+              stats: Optional[Dict] = None, time_limit: Optional[float] = None,
+              gap: Optional[float] = None, relax: bool = False) -> int:
+        """
+        Solve the model in place and return the PuLP status code.
+        warm_start=True asks the solver to start from the values currently held by
+        the model variables; backends without MIP-start support ignore it.
+        time_limit (seconds) and gap (relative MIP gap) stop the search early.
+        relax=True solves the LP relaxation (integrality dropped), whose objective
+        is a lower bound on the MILP optimum.
+        stats, when given, is filled with what the backend can report: 'phases'
+        (seconds per step), 'nodes', 'gap' and 'bound' (None when unknown).
+        """
+        raise NotImplementedError
+
+
+def parse_cbc_log(text: str) -> Dict:
+    """
+    Final statistics from a CBC log: 'objective' (None without a solution),
+    'bound', 'gap' and 'nodes'. A proven optimum has no bound line, so the
+    bound is the objective and the gap 0.
+    """
+    def number(label):
+        match = re.search(rf"^{label}:\s+(\S+)", text, re.MULTILINE)
+        return float(match.group(1)) if match else None
+
+    objective = number("Objective value")
+    bound = number("Lower bound")
+    gap = number("Gap")
+    nodes = number("Enumerated nodes")
+    if objective is not None and bound is None and "Result - Optimal solution found" in text:
+        bound, gap = objective, 0.0
+    return {
+        'objective': objective,
+        'bound': bound,
+        'gap': gap,
+        'nodes': int(nodes) if nodes is not None else None,
+    }
+
+
+class PulpCommandBackend(SolverBackend):
+    """
+    Solver run by PuLP as a separate process (writes a model file, forks the solver,
+    parses its solution file)
+    """
+
+    def __init__(self, name: str, label: str, solver_class, path: Optional[str] = None,
+                 supports_warm_start: bool = False, cbc_log: bool = False):
+        self.name = name
+        self.label = label
+        self.solver_class = solver_class
+        self.path = path
+        self.supports_warm_start = supports_warm_start
+        # CBC writes nodes, bound and gap to its log; read them when not shown (msg=False)
+        self.cbc_log = cbc_log
+
+    def _make_solver(self, msg: bool, **options):
+        if self.path is not None:
+            options['path'] = self.path
+        return self.solver_class(msg=msg, **options)
+
+    def _limit_options(self, time_limit: Optional[float], gap: Optional[float]) -> Dict:
+        options = {}
+        if time_limit is not None:
+            options['timeLimit'] = time_limit
+        if gap is not None:
+            options['gapRel'] = gap
+        return options
+
+    def available(self) -> bool:
+        try:
+            return bool(self._make_solver(msg=False).available())
+        except Exception:
+            return False
+
+    def solve(self, model: pulp.LpProblem, msg: bool = False, warm_start: bool = False,
+              stats: Optional[Dict] = None, time_limit: Optional[float] = None,
+              gap: Optional[float] = None, relax: bool = False) -> int:
+        options = self._limit_options(time_limit, gap)
+        if relax:
+            options['mip'] = False
+        if warm_start and self.supports_warm_start:
+            options['warmStart'] = True
+        log_path = None
+        if self.cbc_log and not msg and stats is not None:
+            fd, log_path = tempfile.mkstemp(suffix=".log", prefix="cbc-")
+            os.close(fd)
+            options['logPath'] = log_path
+        started = time.perf_counter()
+        try:
+            status = model.solve(self._make_solver(msg=msg, **options))
+            if stats is not None:
+                # PuLP writes the model file, runs the solver and reads its solution
+                # in one call; search statistics only come from the CBC log
+                stats.update(phases={'write_and_solve': time.perf_counter() - started},
+                             nodes=None, gap=None, bound=None)
+                if log_path is not None:
+                    with open(log_path) as f:
+                        log = parse_cbc_log(f.read())
+                    stats.update(nodes=log['nodes'], gap=log['gap'], bound=log['bound'])
+        finally:
+            if log_path is not None:
+                os.remove(log_path)
+        return status
+
+
+class GlpkBackend(PulpCommandBackend):
+    """
+    GLPK through PuLP. glpsol takes the gap as a command-line option, and PuLP maps
+    "INTEGER NON-OPTIMAL" to Optimal, so a solve with limits is reported as an
+    incumbent unless the search is known to have finished.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        super().__init__("glpk", "GLPK", pulp.GLPK_CMD, path=path)
+
+    def _limit_options(self, time_limit: Optional[float], gap: Optional[float]) -> Dict:
+        options = {}
+        if time_limit is not None:
+            options['timeLimit'] = time_limit
+        if gap is not None:
+            options['options'] = ['--mipgap', str(gap)]
+        return options
+
+    def solve(self, model: pulp.LpProblem, msg: bool = False, warm_start: bool = False,
+              stats: Optional[Dict] = None, time_limit: Optional[float] = None,
+              gap: Optional[float] = None, relax: bool = False) -> int:
+        started = time.perf_counter()
+        status = super().solve(model, msg=msg, warm_start=warm_start, stats=stats,
+                               time_limit=time_limit, gap=gap, relax=relax)
+        stopped_early = not relax and (gap is not None or (
+            time_limit is not None and time.perf_counter() - started >= time_limit))
+        if status == pulp.LpStatusOptimal and stopped_early:
+            model.assignStatus(status, pulp.LpSolutionIntegerFeasible)
+        return status
+
+
+class ScipyHighsBackend(SolverBackend):
+    """
+    In-process HiGHS through scipy.optimize.milp.
+    The PuLP model is converted to a sparse constraint matrix and passed to HiGHS
+    as arrays, so no model file is written and no solver process is started.
+    """
+    name = "highs"
+    label = "HiGHS (in-process)"
+    in_process = True
+
+    def available(self) -> bool:
+        try:
+            from scipy.optimize import milp  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def solve(self, model: pulp.LpProblem, msg: bool = False, warm_start: bool = False,
+              stats: Optional[Dict] = None, time_limit: Optional[float] = None,
+              gap: Optional[float] = None, relax: bool = False) -> int:
+        # scipy.optimize.milp has no MIP-start option, so warm_start is ignored
+        from scipy.optimize import Bounds, LinearConstraint, milp
+
+        started = time.perf_counter()
+        arrays = model_to_arrays(model)
+        converted = time.perf_counter()
+        constraints = []
+        if arrays['A'].shape[0]:
+            constraints.append(LinearConstraint(arrays['A'], arrays['row_lb'], arrays['row_ub']))
+
+        options = {'disp': msg}
+        if time_limit is not None:
+            options['time_limit'] = time_limit
+        if gap is not None:
+            options['mip_rel_gap'] = gap
+        integrality = np.zeros_like(arrays['integrality']) if relax else arrays['integrality']
+        result = milp(
+            c=arrays['c'],
+            integrality=integrality,
+            bounds=Bounds(arrays['var_lb'], arrays['var_ub']),
+            constraints=constraints,
+            options=options,
+        )
+        solved = time.perf_counter()
+
+        if result.x is not None:
+            for var, value, integer in zip(arrays['variables'], result.x, integrality):
+                var.varValue = float(round(value)) if integer else float(value)
+
+        if result.status == 0:
+            model.assignStatus(pulp.LpStatusOptimal)
+        elif result.status == 1 and result.x is not None:
+            # Time limit reached with an incumbent
+            model.assignStatus(pulp.LpStatusOptimal, pulp.LpSolutionIntegerFeasible)
+        elif result.status == 2:
+            model.assignStatus(pulp.LpStatusInfeasible)
+        elif result.status == 3:
+            model.assignStatus(pulp.LpStatusUnbounded)
+        else:
+            model.assignStatus(pulp.LpStatusNotSolved)
+
+        if stats is not None:
+            bound = getattr(result, 'mip_dual_bound', None)
+            if bound is not None and np.isfinite(bound):
+                # HiGHS reports the bound of c @ x; add back the objective's constant
+                bound = arrays['sense'] * bound + arrays['constant']
+            stats.update(
+                phases={'convert': converted - started, 'solver': solved - converted,
+                        'load': time.perf_counter() - solved},
+                nodes=getattr(result, 'mip_node_count', None),
+                gap=getattr(result, 'mip_gap', None),
+                bound=bound,
+            )
+        return model.status
+
+
+def model_constraints(model: pulp.LpProblem) -> List:
+    """The model's constraints as a list (a dict in PuLP 2.x, a method from PuLP 3.x)"""
+    constraints = model.constraints
+    return list(constraints()) if callable(constraints) else list(constraints.values())
+
+
+def model_to_arrays(model: pulp.LpProblem) -> Dict:
+    """
+    Convert a PuLP model into the array form used by in-process solvers:
+    minimize c @ x subject to row_lb <= A @ x <= row_ub and var_lb <= x <= var_ub.
+    The model's objective is sense * (c @ x) + constant.
+    """
+    from scipy.sparse import csr_matrix
+
+    variables = model.variables()
+    index = {var.name: j for j, var in enumerate(variables)}
+
+    sense = 1.0 if model.sense == pulp.LpMinimize else -1.0
+    c = np.zeros(len(variables))
+    constant = 0.0
+    if model.objective is not None:
+        constant = float(model.objective.constant)
+        for var, coef in model.objective.items():
+            c[index[var.name]] = sense * coef
+
+    data, cols, indptr = [], [], [0]
+    row_lb, row_ub = [], []
+    for constraint in model_constraints(model):
+        for var, coef in constraint.items():
+            cols.append(index[var.name])
+            data.append(coef)
+        indptr.append(len(cols))
+        rhs = -constraint.constant
+        if constraint.sense == pulp.LpConstraintEQ:
+            row_lb.append(rhs)
+            row_ub.append(rhs)
+        elif constraint.sense == pulp.LpConstraintLE:
+            row_lb.append(-np.inf)
+            row_ub.append(rhs)
+        else:
+            row_lb.append(rhs)
+            row_ub.append(np.inf)
+
+    A = csr_matrix((data, cols, indptr), shape=(len(row_lb), len(variables)))
+    var_lb = np.array([-np.inf if v.lowBound is None else v.lowBound for v in variables], dtype=float)
+    var_ub = np.array([np.inf if v.upBound is None else v.upBound for v in variables], dtype=float)
+    integrality = np.array([1 if v.cat == pulp.LpInteger else 0 for v in variables])
+
+    return {
+        'variables': variables,
+        'sense': sense,
+        'constant': constant,
+        'c': c,
+        'A': A,
+        'row_lb': np.array(row_lb, dtype=float),
+        'row_ub': np.array(row_ub, dtype=float),
+        'var_lb': var_lb,
+        'var_ub': var_ub,
+        'integrality': integrality,
+    }
+
+
+# Registered backends in order of preference for the default choice
+_BACKENDS: "OrderedDict[str, SolverBackend]" = OrderedDict()
+
+
+def register_backend(backend: SolverBackend, preferred: bool = False):
+    """Add a backend to the registry (first in the default order when preferred=True)"""
+    _BACKENDS[backend.name] = backend
+    if preferred:
+        _BACKENDS.move_to_end(backend.name, last=False)
+    available_backends.cache_clear()
+
+
+@functools.lru_cache(maxsize=None)
+def available_backends() -> Tuple[str, ...]:
+    """
+    Names of backends usable in this process, in order of preference.
+    Probing runs once per process; call available_backends.cache_clear() to re-probe.
+    """
+    return tuple(name for name, backend in _BACKENDS.items() if backend.available())
+
+
+def list_backends() -> List[Dict]:
+    """Registry summary (name, label, in-process, availability) for diagnostics"""
+    available = set(available_backends())
+    return [{
+        'name': name,
+        'label': backend.label,
+        'in_process': backend.in_process,
+        'available': name in available,
+    } for name, backend in _BACKENDS.items()]
+
+
+def get_backend(solver: Union[str, SolverBackend, None] = None,
+                warm_start: bool = False) -> Optional[SolverBackend]:
+    """
+    Resolve a backend for one solve.
+    solver=None picks the first available backend (None if nothing is installed),
+    or with warm_start=True the first available one that takes MIP starts, if any;
+    a name must refer to a registered and available backend.
+    """
+    if isinstance(solver, SolverBackend):
+        return solver
+
+    available = available_backends()
+    if solver is None:
+        if warm_start:
+            for name in available:
+                if _BACKENDS[name].supports_warm_start:
+                    return _BACKENDS[name]
+        return _BACKENDS[available[0]] if available else None
+
+    if solver not in _BACKENDS:
+        raise ValueError(f"Unknown solver '{solver}'. Choose one of: {', '.join(_BACKENDS)}")
+    if solver not in available:
+        raise ValueError(f"Solver '{solver}' is not available. Available: {', '.join(available) or 'none'}")
+    return _BACKENDS[solver]
+
+
+# CBC from the system package when present, otherwise whatever COIN_CMD finds on PATH
+_CBC_PATH = "/usr/bin/coin.cbc"
+
+register_backend(ScipyHighsBackend())
+register_backend(PulpCommandBackend("cbc", "CBC", pulp.COIN_CMD,
+                                    path=_CBC_PATH if os.path.exists(_CBC_PATH) else None,
+                                    supports_warm_start=True, cbc_log=True))
+register_backend(PulpCommandBackend("pulp_cbc", "CBC (bundled with PuLP)", pulp.PULP_CBC_CMD,
+                                    supports_warm_start=True, cbc_log=True))
+register_backend(GlpkBackend())
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Tests for the /optimize request/response schemas, the batch endpoint, response
+compression and /metrics
+"""
+
+import gzip
+import json
+
+import pytest
+
+import model
+from app import app
+from metrics import Registry
+
+ELEC = [0.06, 0.05, 0.04, 0.04, 0.05, 0.06, 0.08, 0.12, 0.18, 0.22, 0.16, 0.12]
+LABOR = [0.4, 0.4, 0.4, 0.4, 0.4, 0.3, 0.3, 0.3, 0.1, 0.1, 0.1, 0.1]
+
+
+@pytest.fixture
+def client():
+    return app.test_client()
+
+
+def v1_payload(durations):
+    return {
+        "electricity_prices": {str(t): p for t, p in enumerate(ELEC)},
+        "labor_costs": {str(t): p for t, p in enumerate(LABOR)},
+        "maintenance_durations": durations,
+    }
+
+
+def test_v2_arrays_return_intervals_matching_v1(client):
+    payload = {
+        "schema_version": 2,
+        "start_ts": "2025-05-27T00:00:00Z",
+        "dt": 900,
+        "electricity_prices": ELEC,
+        "labor_costs": LABOR,
+        "maintenance_durations": [2, 1, 3],
+    }
+    v2 = client.post("/optimize", json=payload).get_json()
+    v1 = client.post("/optimize", json=v1_payload([2, 1, 3])).get_json()
+    assert v2["schema_version"] == 2
+    assert v2["results"]["total_cost"] == pytest.approx(v1["results"]["total_cost"])
+    assert "service_schedule" not in v2["results"]["events"][0]
+
+    for event, old in zip(v2["results"]["events"], v1["results"]["events"]):
+        assert (event["start"], event["end"]) == (old["start_time"], old["end_time"] + 1)
+        assert event["cost"] == pytest.approx(old["total_cost"])
+
+    schedule = v2["results"]["schedule"]
+    assert [interval["start"] for interval in schedule] == sorted(i["start"] for i in schedule)
+    first = schedule[0]
+    assert first["start_ts"] == f"2025-05-27T{first['start'] // 4:02d}:{first['start'] % 4 * 15:02d}:00Z"
+
+
+def test_v2_rejects_mismatched_arrays_and_unknown_versions(client):
+    payload = {"schema_version": 2, "electricity_prices": ELEC, "labor_costs": LABOR[:-1]}
+    assert client.post("/optimize", json=payload).status_code == 400
+    assert client.post("/optimize", json=dict(v1_payload([1]), schema_version=3)).status_code == 400
+
+
+def test_solution_quality_is_reported_and_limits_are_validated(client):
+    body = client.post("/optimize", json=dict(v1_payload([2, 1]), time_limit=5, mip_gap=0.01)).get_json()
+    assert body["results"]["solution_status"] in ("optimal", "feasible")
+    assert body["results"]["objective_bound"] <= body["results"]["total_cost"] + 1e-9
+    assert client.post("/optimize", json=dict(v1_payload([1]), time_limit=0)).status_code == 400
+    assert client.post("/optimize", json=dict(v1_payload([1]), mip_gap="x")).status_code == 400
+
+
+def test_alternatives_are_returned_cheapest_first(client):
+    body = client.post("/optimize", json=dict(v1_payload([2, 1]), alternatives=3)).get_json()
+    alternatives = body["results"]["alternatives"]
+    assert [a["rank"] for a in alternatives] == [1, 2, 3]
+    assert alternatives[0]["total_cost"] == pytest.approx(body["results"]["total_cost"])
+    assert alternatives[0]["total_cost"] <= alternatives[1]["total_cost"] <= alternatives[2]["total_cost"]
+    assert client.post("/optimize", json=dict(v1_payload([1]), alternatives=0)).status_code == 400
+
+
+def test_initial_starts_are_validated(client):
+    assert client.post("/optimize", json=dict(v1_payload([2, 1]), initial_starts="auto")).status_code == 200
+    assert client.post("/optimize", json=dict(v1_payload([2, 1]), initial_starts=[0])).status_code == 400
+    # Well-formed but overlapping: rejected by the optimizer
+    assert client.post("/optimize", json=dict(v1_payload([2, 1]), initial_starts=[0, 1])).status_code == 400
+
+
+def test_price_sensitivity_endpoint(client):
+    body = client.post("/optimize/sensitivity", json=v1_payload([2, 1])).get_json()
+    assert len(body["slots"]) == len(ELEC)
+    in_plan = [row for row in body["slots"] if row["in_plan"]]
+    assert len(in_plan) == 3
+    assert all(row["increase"] >= 0 and row["decrease"] is None for row in in_plan)
+
+    for durations in (["x"], [0], [], 2, [True]):
+        response = client.post("/optimize/sensitivity", json=v1_payload(durations))
+        assert response.status_code == 400 and "maintenance_durations" in response.get_json()["error"]
+    assert client.post("/optimize", json=v1_payload([1.5])).status_code == 400
+
+
+def test_large_responses_are_gzipped_on_request(client):
+    plain = client.post("/optimize", json=v1_payload([2, 1, 3, 1, 1]))
+    assert "Content-Encoding" not in plain.headers
+
+    compressed = client.post("/optimize", json=v1_payload([2, 1, 3, 1, 1]),
+                             headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(compressed.data))["results"] == plain.get_json()["results"]
+
+
+def test_batch_streams_every_item_with_its_own_status(client):
+    items = [v1_payload([2, 1]), {"labor_costs": {"0": 1}}, v1_payload([8, 8]),
+             dict(v1_payload([2, 1]), engine="dp")]
+    try:
+        response = client.post("/optimize/batch", json={"requests": items})
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    finally:
+        model.shutdown_batch_pool()
+    assert response.mimetype == "application/x-ndjson"
+    by_index = {line["index"]: line for line in lines}
+    assert sorted(by_index) == [0, 1, 2, 3]
+    assert [by_index[i]["status"] for i in range(4)] == ["success", "failed", "failed", "success"]
+    assert by_index[0]["results"]["total_cost"] == pytest.approx(by_index[3]["results"]["total_cost"])
+
+    assert client.post("/optimize/batch", json={"requests": []}).status_code == 400
+
+
+def test_metrics_endpoint_exports_phase_latencies_and_model_size(client):
+    client.post("/optimize", json=dict(v1_payload([2, 1, 3]), solver="highs"))
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    text = response.get_data(as_text=True)
+    assert 'optimizer_http_requests_total{endpoint="/optimize",method="POST",status="200"}' in text
+    assert 'optimizer_phase_duration_seconds_count{phase="build",engine="milp"}' in text
+    assert 'optimizer_phase_duration_seconds_count{phase="serialize",engine="milp"}' in text
+    assert 'optimizer_model_size_bucket{counter="variables",le="+Inf"}' in text
+    assert 'optimizer_solves_total{engine="milp",backend="highs",status="Optimal"}' in text
+    assert {'optimizer_cache_lookups{result="%s"}' % result for result in ("memory_hit", "disk_hit", "miss")} <= {
+        line.rsplit(" ", 1)[0] for line in text.splitlines()}
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = Registry()
+    histogram = registry.histogram("demo_seconds", "Demo", ("phase",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value, phase="solve")
+    lines = registry.render().splitlines()
+    assert 'demo_seconds_bucket{phase="solve",le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{phase="solve",le="1.0"} 2' in lines
+    assert 'demo_seconds_bucket{phase="solve",le="+Inf"} 3' in lines
+    assert 'demo_seconds_count{phase="solve"} 3' in lines
+    with pytest.raises(ValueError):
+        histogram.observe(1.0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-q"])
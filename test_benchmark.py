@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Tests for the benchmark suite's case runner and baseline regression gate
+"""
+
+import pytest
+
+from benchmark import benchmark_suite, compare_to_baseline, load_baseline, mix_durations, save_baseline
+
+
+def test_mix_durations_cycle_to_the_event_count():
+    assert mix_durations('long', 5) == [6, 8, 12, 6, 8]
+
+
+def test_suite_records_phases_and_flags_regressions(tmp_path):
+    rows = benchmark_suite(horizons=[24], event_counts=[1, 12], mixes=['mixed'], solvers=['pulp_cbc'],
+                           repeats=1)
+    by_case = {row['case']: row for row in rows}
+    solved = by_case['milp/pulp_cbc/slots=24/events=1/mix=mixed']
+    assert solved['status'] == 'Optimal'
+    assert solved['variables'] > 0 and solved['peak_mib'] > 0
+    assert {'build_seconds', 'solve_seconds', 'extract_seconds'} <= set(solved)
+    assert by_case['dp/-/slots=24/events=12/mix=mixed']['status'] == 'skipped'
+
+    path = tmp_path / "baseline.json"
+    save_baseline(rows, str(path))
+    baseline = load_baseline(str(path))
+    assert compare_to_baseline(rows, baseline) == []
+
+    slower = [dict(row, solve_seconds=row['solve_seconds'] * 2 + 1.0) if row['case'] == solved['case'] else row
+              for row in rows]
+    regressions = compare_to_baseline(slower, baseline)
+    assert [(item['case'], item['metric']) for item in regressions] == [(solved['case'], 'solve_seconds')]
+    assert regressions[0]['ratio'] > 2
+
+    # Small absolute differences are noise, not regressions
+    jitter = [dict(row, solve_seconds=row['solve_seconds'] * 1.5) if row['case'] == solved['case'] else row
+              for row in rows]
+    assert compare_to_baseline(jitter, baseline, min_seconds=1.0) == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Tests for the optimization result cache
+"""
+
+import json
+import os
+
+import numpy as np
+
+from cache import ResultCache, request_key
+from model import MaintenanceOptimizer
+from solvers import get_backend
+
+ELEC = {t: 0.05 + 0.01 * (t % 5) for t in range(12)}
+LABOR = {t: 0.4 if t < 6 else 0.1 for t in range(12)}
+
+
+def test_request_key_is_canonical():
+    as_dict = request_key(np.array([0.1, 0.2]), np.array([1.0, 1.0]), [2], engine="milp", solver=None)
+    as_list = request_key([0.1, 0.2], [1, 1], [2], engine="milp")
+    assert as_dict == as_list
+    assert as_dict != request_key([0.1, 0.2], [1, 1], [2], engine="dp")
+    assert as_dict != request_key([0.1, 0.2], [1, 1], [1, 1], engine="milp")
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = ResultCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()['hits'] == 3 and cache.stats()['misses'] == 1
+
+
+def test_disk_tier_survives_memory_and_respects_size(tmp_path):
+    cache = ResultCache(max_entries=1, disk_dir=str(tmp_path), disk_max_bytes=10_000)
+    cache.put("a", {"starts": [1, 2]})
+    cache.put("b", {"starts": [3]})
+    assert cache.get("a") == {"starts": [1, 2]}
+    assert cache.stats()['disk_hits'] == 1
+    assert cache.get("a") == {"starts": [1, 2]}  # promoted to memory
+    assert (cache.stats()['memory_hits'], cache.stats()['disk_hits'], cache.stats()['hits']) == (1, 1, 2)
+    assert json.loads((tmp_path / "b.json").read_text()) == {"starts": [3]}  # plain JSON entries
+
+    small = ResultCache(disk_dir=str(tmp_path), disk_max_bytes=1)
+    small.put("c", "x" * 100)
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".json")]
+    small.put("d", {1, 2})  # not JSON: kept in memory only
+    assert not (tmp_path / "d.json").exists() and small.get("d") == {1, 2}
+
+
+def test_optimizers_share_cached_plan():
+    cache = ResultCache()
+    first = MaintenanceOptimizer(ELEC, LABOR, [2, 1], cache=cache)
+    first.build_model()
+    assert first.solve(verbose=False)
+
+    second = MaintenanceOptimizer([ELEC[t] for t in range(12)], LABOR, [2, 1], cache=cache)
+    assert second.load_cached()
+    assert second.model is None
+    assert second.get_results()['total_cost'] == first.get_results()['total_cost']
+    assert cache.stats()['hits'] == 1
+
+    other_engine = MaintenanceOptimizer(ELEC, LABOR, [2, 1], engine="dp", cache=cache)
+    assert not other_engine.load_cached()
+
+    # solver=None and the name of the backend it resolves to are the same request
+    default = MaintenanceOptimizer(ELEC, LABOR, [2, 1], cache=cache)
+    assert default.cache_key() == default.cache_key(get_backend().name)
+    assert default.load_cached(get_backend().name)
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    test_request_key_is_canonical()
+    test_memory_tier_evicts_least_recently_used()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_disk_tier_survives_memory_and_respects_size(pathlib.Path(tmp))
+    test_optimizers_share_cached_plan()
+    print("✓ All cache tests passed!")
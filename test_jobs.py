@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for the asynchronous job API (POST /jobs, GET /jobs/<id>, events)
+"""
+
+import json
+import time
+
+import pytest
+
+import jobs
+from app import app
+
+PAYLOAD = {
+    "electricity_prices": {str(t): 0.05 + 0.01 * (t % 5) for t in range(12)},
+    "labor_costs": {str(t): 0.4 if t < 6 else 0.1 for t in range(12)},
+    "maintenance_durations": [2, 1],
+}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    queue = jobs.JobQueue(workers=2, ttl_seconds=60)
+    monkeypatch.setattr(jobs, "_default_queue", queue)
+    yield app.test_client()
+    queue.shutdown()
+
+
+def wait_for(client, job_id, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        body = client.get(f"/jobs/{job_id}").get_json()
+        if body["status"] in jobs.FINISHED:
+            return body
+        time.sleep(0.05)
+    raise AssertionError("job did not finish")
+
+
+def test_job_is_queued_then_returns_results(client):
+    response = client.post("/jobs", json=PAYLOAD)
+    assert response.status_code == 202
+    job_id = response.get_json()["job_id"]
+
+    body = wait_for(client, job_id)
+    assert body["status"] == "succeeded"
+    direct = client.post("/optimize", json=PAYLOAD).get_json()["results"]
+    assert body["results"]["total_cost"] == pytest.approx(direct["total_cost"])
+
+
+def test_failed_job_and_unknown_job(client):
+    payload = dict(PAYLOAD, maintenance_durations=[8, 8])
+    job_id = client.post("/jobs", json=payload).get_json()["job_id"]
+    body = wait_for(client, job_id)
+    assert body["status"] == "failed" and body["error"]
+
+    assert client.get("/jobs/no-such-job").status_code == 404
+    assert client.post("/jobs", json={"labor_costs": {"0": 1}}).status_code == 400
+
+
+def test_event_stream_ends_with_result(client):
+    job_id = client.post("/jobs", json=PAYLOAD).get_json()["job_id"]
+    stream = client.get(f"/jobs/{job_id}/events").get_data(as_text=True)
+    events = [block for block in stream.split("\n\n") if block.startswith("event:")]
+    assert events[-1].startswith("event: result")
+    result = json.loads(events[-1].split("data: ", 1)[1])
+    assert result["status"] == "succeeded"
+
+
+def test_finished_jobs_expire_after_ttl(client):
+    job_id = client.post("/jobs", json=PAYLOAD).get_json()["job_id"]
+    wait_for(client, job_id)
+    jobs.get_job_queue().ttl_seconds = 0
+    time.sleep(0.01)
+    assert client.get(f"/jobs/{job_id}").status_code == 404
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-q"])
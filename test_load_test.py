@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests for the load-test harness against an in-process server
+"""
+
+import os
+import threading
+
+import pytest
+from werkzeug.serving import make_server
+
+from app import app
+from load_test import PayloadFactory, ServerSampler, build_report, parse_mix, run_load
+
+
+@pytest.fixture
+def server_url():
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+def test_parse_mix():
+    assert parse_mix("24:6,2016") == {24: 6.0, 2016: 1.0}
+    with pytest.raises(ValueError):
+        parse_mix("24:0")
+
+
+@pytest.mark.parametrize("rate", [None, 50.0])
+def test_load_run_reports_latency_errors_and_server_usage(server_url, rate):
+    factory = PayloadFactory({24: 1, 48: 1}, durations=[2, 1], engine="dp")
+    sampler = ServerSampler(os.getpid(), interval=0.05)
+    sampler.start()
+    samples, elapsed = run_load(server_url, factory, concurrency=2, rate=rate, duration=10, max_requests=8)
+    report = build_report(samples, elapsed, {"rate": rate}, sampler.stop())
+
+    assert report["requests"] == 8 and report["error_rate"] == 0.0
+    latency = report["latency_ms"]
+    assert latency["count"] == 8 and latency["p50"] <= latency["p95"] <= latency["p99"] <= latency["max"]
+    assert set(report["by_horizon"]) <= {"24", "48"}
+    assert sum(second["completed"] for second in report["timeline"]) == 8
+    assert report["server"]["rss_mib_max"] > 0
+
+
+def test_failed_requests_count_as_errors(server_url):
+    factory = PayloadFactory({24: 1}, durations=[20, 20])  # cannot fit in 24 slots
+    samples, elapsed = run_load(server_url, factory, concurrency=1, duration=10, max_requests=2)
+    report = build_report(samples, elapsed, {})
+    assert report["error_rate"] == 1.0 and report["latency_ms"] == {"count": 0}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,540 @@
+#!/usr/bin/env python3
+"""
+Tests for the MaintenanceOptimizer model
+"""
+
+import itertools
+
+import pulp
+import pytest
+
+import model
+from cache import ResultCache
+from model import (MaintenanceOptimizer, MaintenanceSession, WindowCostTable, optimize_batch,
+                   prices_from_forecast, shutdown_batch_pool, solve_rolling_horizon)
+from solvers import SolverBackend, available_backends, get_backend, parse_cbc_log
+
+ELEC = {
+    0: 0.06, 1: 0.05, 2: 0.04, 3: 0.04, 4: 0.05, 5: 0.06,
+    6: 0.08, 7: 0.12, 8: 0.18, 9: 0.22, 10: 0.16, 11: 0.12,
+}
+LABOR = {
+    0: 0.4, 1: 0.4, 2: 0.4, 3: 0.4, 4: 0.4, 5: 0.3,
+    6: 0.3, 7: 0.3, 8: 0.1, 9: 0.1, 10: 0.1, 11: 0.1,
+}
+
+
+def brute_force_cost(elec, labor, durations):
+    """Cheapest non-overlapping placement found by trying every combination of starts"""
+    slots = len(elec)
+    best = None
+    for starts in itertools.product(range(slots), repeat=len(durations)):
+        used = []
+        for start, duration in zip(starts, durations):
+            used.extend(range(start, start + duration))
+        if max(used) >= slots or len(used) != len(set(used)):
+            continue
+        cost = sum(elec[t] + labor[t] for t in used)
+        if best is None or cost < best:
+            best = cost
+    return best
+
+
+def solve(durations, elec=ELEC, labor=LABOR, engine="milp", solver=None):
+    optimizer = MaintenanceOptimizer(elec, labor, durations, engine=engine)
+    optimizer.build_model()
+    assert optimizer.solve(verbose=False, solver=solver)
+    return optimizer.get_results()
+
+
+def test_sliding_window_links_start_and_active_slots():
+    results = solve([2, 1, 3])
+    for event in results['events']:
+        active = [t for t, on in event['service_schedule'].items() if on]
+        assert active == list(range(event['start_time'], event['end_time'] + 1))
+
+
+def test_matches_brute_force_optimum():
+    durations = [2, 1, 3]
+    results = solve(durations)
+    assert abs(results['total_cost'] - brute_force_cost(ELEC, LABOR, durations)) < 1e-6
+
+
+def test_dp_engine_matches_milp():
+    for durations in ([2, 1, 3], [1, 1, 2, 1], [4, 4]):
+        milp = solve(durations)
+        dp = solve(durations, engine="dp")
+        assert abs(milp['total_cost'] - dp['total_cost']) < 1e-6
+        assert set(dp.keys()) == set(milp.keys())
+        for event in dp['events']:
+            assert event['end_time'] - event['start_time'] + 1 == event['duration']
+
+
+def test_dp_engine_falls_back_to_milp_outside_its_scope(monkeypatch):
+    monkeypatch.setattr(model, "DP_MAX_TABLE_SIZE", 10)
+    optimizer = MaintenanceOptimizer(ELEC, LABOR, [2, 1, 3], engine="dp")
+    optimizer.build_model()
+    assert optimizer.active_engine == "milp"
+    assert optimizer.solve(verbose=False)
+
+
+def test_dp_engine_reports_infeasible_horizon():
+    optimizer = MaintenanceOptimizer(ELEC, LABOR, [6, 7], engine="dp")
+    optimizer.build_model()
+    assert not optimizer.solve()
+
+
+def test_solver_backends_agree():
+    durations = [2, 1, 3]
+    costs = [solve(durations, solver=name)['total_cost'] for name in available_backends()]
+    assert costs
+    assert max(costs) - min(costs) < 1e-6
+
+
+def test_unknown_solver_is_rejected():
+    optimizer = MaintenanceOptimizer(ELEC, LABOR, [2])
+    optimizer.build_model()
+    with pytest.raises(ValueError):
+        optimizer.solve(solver="no-such-solver")
+
+
+class StoppedSearchBackend(SolverBackend):
+    """Solves to optimality, then reports the plan as an incumbent of a search stopped by a limit"""
+    name = "stopped"
+    label = "stopped search"
+
+    def available(self):
+        return True
+
+    def solve(self, model, msg=False, warm_start=False, stats=None, time_limit=None, gap=None):
+        status = get_backend().solve(model, stats=stats)
+        model.assignStatus(status, pulp.LpSolutionIntegerFeasible)
+        stats.update(bound=0.9 * pulp.value(model.objective), gap=None)
+        return status
+
+
+def test_time_limited_search_returns_incumbent_with_bound_and_gap():
+    cache = ResultCache()
+    optimizer = MaintenanceOptimizer(ELEC, LABOR, [2, 1, 3], cache=cache, verbose=False)
+    optimizer.build_model()
+    assert optimizer.solve(solver=StoppedSearchBackend(), time_limit=1)
+    results = optimizer.get_results()
+    assert results['solution_status'] == 'feasible'
+    assert results['objective_bound'] == pytest.approx(0.9 * results['total_cost'])
+    assert results['mip_gap'] == pytest.approx(0.1)
+    assert optimizer.metrics()['solver']['status'] == 'Feasible'
+    assert cache.stats()['memory_entries'] == 0  # incumbents are not cached
+
+    with pytest.raises(ValueError):
+        optimizer.solve(time_limit=0)
+
+
+def test_limits_that_do_not_bind_still_prove_optimality():
+    for solver in available_backends():
+        optimizer = MaintenanceOptimizer(ELEC, LABOR, [2, 1, 3], verbose=False)
+        optimizer.build_model()
+        assert optimizer.solve(solver=solver, time_limit=30, gap=0.0)
+        results = optimizer.get_results()
+        assert results['solution_status'] == 'optimal', solver
+        assert results['mip_gap'] == pytest.approx(0.0, abs=1e-6)
+        assert results['objective_bound'] == pytest.approx(results['total_cost'])
+
+
+def test_parse_cbc_log_reads_incumbent_bound_and_gap():
+    stopped = ("Result - Stopped on time limit\n\nObjective value:                12.50000000\n"
+               "Lower bound:                    12.000\nGap:                            0.04\n"
+               "Enumerated nodes:               310\n")
+    assert parse_cbc_log(stopped) == {'objective': 12.5, 'bound': 12.0, 'gap': 0.04, 'nodes': 310}
+    optimal = "Result - Optimal solution found\n\nObjective value:                3.02840000\nEnumerated nodes:               0\n"
+    assert parse_cbc_log(optimal) == {'objective': 3.0284, 'bound': 3.0284, 'gap': 0.0, 'nodes': 0}
+    assert parse_cbc_log("Result - Stopped on time limit\n\nNo feasible solution found\n")['objective'] is None
+
+
+@pytest.mark.parametrize("durations", [[2, 1, 3], [4, 4, 2, 1, 1], [3, 3, 3]])
+def test_heuristic_plan_is_within_its_proven_gap(durations):
+    exact = solve(durations, engine="dp")['total_cost']
+    optimizer = MaintenanceOptimizer(ELEC, LABOR, durations, engine="heuristic", verbose=False)
+    optimizer.build_model()
+    assert optimizer.solve(gap=0.5)
+    results = optimizer.get_results()
+    assert results['objective_bound'] <= exact + 1e-9 <= results['total_cost'] + 2e-9
+    assert results['total_cost'] - exact <= results['mip_gap'] * results['total_cost'] + 1e-9
+    assert results['mip_gap'] <= 0.5
+    assert optimizer.solver_stats['backend'] == 'heuristic'
+
+
+def test_heuristic_falls_back_to_milp_above_the_gap_threshold():
+    durations = [4, 4, 2, 1, 1]
+    optimizer = MaintenanceOptimizer(ELEC, LABOR, durations, engine="heuristic", verbose=False)
+    optimizer.build_model()
+    heuristic_cost, _ = model.solve_windows_heuristic(optimizer.window_costs.total, durations, len(ELEC))
+    assert optimizer.solve(gap=0.0)
+    results = optimizer.get_results()
+    assert results['solution_status'] == 'optimal'
+    assert results['total_cost'] == pytest.approx(solve(durations, engine="dp")['total_cost'])
+    assert optimizer.solver_stats['heuristic']['cost'] == pytest.approx(heuristic_cost)
+
+
+def test_heuristic_defers_events_only_when_cheaper():
+    table = WindowCostTable([1.0] * 6, [0.0] * 6, [2, 2, 3])
+    total, starts = model.solve_windows_heuristic(table.total, [2, 2, 3], 6, deferral_costs=[None, 1.5, 5.0])
+    assert starts[1] is None and None not in (starts[0], starts[2])
+    assert total == pytest.approx(2.0 + 1.5 + 3.0)
+
+
+def test_lp_relaxation_bounds_the_optimum_for_every_backend():
+    durations = [2, 1, 3]
+    exact = solve(durations, engine="dp")['total_cost']
+    for solver in available_backends():
+        optimizer = MaintenanceOptimizer(ELEC, LABOR, durations, verbose=False)
+        optimizer.build_model()
+        assert optimizer.lp_bound(solver) <= exact + 1e-9
+
+
+class NoIncumbentBackend(SolverBackend):
+    """Stops before finding any plan, as a search cut short by its time limit"""
+    name = "no_incumbent"
+    label = "no incumbent"
+
+    def available(self):
+        return True
+
+    def solve(self, model, msg=False, warm_start=False, stats=None, time_limit=None, gap=None):
+        model.assignStatus(pulp.LpStatusNotSolved)
+        stats.update(bound=1.0)
+        return model.status
+
+
+def test_mip_start_from_plan_or_heuristic_reaches_the_optimum():
+    durations = [2, 1, 3]
+    dp = MaintenanceOptimizer(ELEC, LABOR, durations, engine="dp", verbose=False)
+    dp.build_model()
+    assert dp.solve()
+    for solver in available_backends():
+        for initial_starts in (dp.solution_starts, "auto"):
+            optimizer = MaintenanceOptimizer(ELEC, LABOR, durations, verbose=False)
+            optimizer.build_model()
+            assert optimizer.solve(solver=solver, initial_starts=initial_starts)
+            assert optimizer.objective_value == pytest.approx(dp.objective_value)
+            assert optimizer.solver_stats['mip_start'] == get_backend(solver).supports_warm_start
+
+
+def test_mip_start_values_cover_the_plan_and_is_the_fallback():
+    optimizer = MaintenanceOptimizer(ELEC, LABOR, [2, 1], verbose=False)
+    optimizer.build_model()
+    cost = optimizer.set_initial_solution([3, 0])
+    assert [optimizer.y[0][t].varValue for t in range(5)] == [0, 0, 0, 1, 1]
+    assert sum(optimizer.x[1][t].varValue for t in optimizer.T) == 1
+    with pytest.raises(ValueError):
+        optimizer.set_initial_solution([0, 1])  # overlapping
+
+    assert not optimizer.solve(solver=NoIncumbentBackend())
+    assert optimizer.solve(solver=NoIncumbentBackend(), initial_starts=[3, 0])
+    assert optimizer.solution_starts == [3, 0]
+    results = optimizer.get_results()
+    assert results['total_cost'] == pytest.approx(cost)
+    assert results['solution_status'] == 'feasible'
+    assert results['objective_bound'] == 1.0
+
+
+
+class CrashingBackend(SolverBackend):
+    """Solves the LP relaxation, but the MILP solve raises, as a crashed or missing solver binary"""
+    name = "crashing"
+    label = "crashing"
+
+    def available(self):
+        return True
+
+    def solve(self, model, msg=False, warm_start=False, stats=None, time_limit=None, gap=None, relax=False):
+        if relax:
+            return get_backend().solve(model, relax=True)
+        raise pulp.PulpSolverError("solver crashed")
+
+
+def test_initial_plan_is_kept_when_the_solver_raises():
+    optimizer = MaintenanceOptimizer(ELEC, LABOR, [2, 1], verbose=False)
+    optimizer.build_model()
+    assert not optimizer.solve(solver=CrashingBackend())
+    assert optimizer.solve(solver=CrashingBackend(), initial_starts=[3, 0])
+    assert optimizer.solution_starts == [3, 0]
+    assert optimizer.get_results()['solution_status'] == 'feasible'
+
+    heuristic = MaintenanceOptimizer(ELEC, LABOR, [4, 4, 2, 1, 1], engine="heuristic", verbose=False)
+    heuristic.build_model()
+    assert heuristic.solve(solver=CrashingBackend(), gap=0.0)
+    assert heuristic.objective_value == pytest.approx(heuristic.solver_stats['heuristic']['cost'])
+
+
+class BrokenBackend(SolverBackend):
+    """Raises on every solve, the LP relaxation included"""
+    name = "broken"
+    label = "broken"
+
+    def available(self):
+        return True
+
+    def solve(self, model, msg=False, warm_start=False, stats=None, time_limit=None, gap=None, relax=False):
+        raise pulp.PulpSolverError("solver crashed")
+
+
+def test_heuristic_without_a_bound_falls_back_to_its_plan():
+    optimizer = MaintenanceOptimizer(ELEC, LABOR, [4, 4, 2, 1, 1], engine="heuristic", verbose=False)
+    optimizer.build_model()
+    assert optimizer.lp_bound(BrokenBackend()) is None
+    assert optimizer.solve(solver=BrokenBackend())
+    assert optimizer.solver_stats['heuristic']['bound'] is None
+    assert optimizer.objective_value == pytest.approx(optimizer.solver_stats['heuristic']['cost'])
+    assert optimizer.get_results()['solution_status'] == 'feasible'
+
+def test_kbest_dp_enumerates_distinct_plans_in_cost_order():
+    costs = [0.3, 0.1, 0.7, 0.2, 0.2, 0.9, 0.4, 0.1]
+    durations, deferral = [3, 3, 1], [None, 0.5, 2.0]
+    brute = {}
+    options = [list(range(len(costs))) + ([] if d is None else [None]) for d in deferral]
+    for starts in itertools.product(*options):
+        windows = [(t, L) for t, L in zip(starts, durations) if t is not None]
+        slots = [s for t, L in windows for s in range(t, t + L)]
+        if any(t + L > len(costs) for t, L in windows) or len(slots) != len(set(slots)):
+            continue
+        cost = sum(costs[s] for s in slots) + sum(d for t, d in zip(starts, deferral) if t is None)
+        key = frozenset(windows)
+        brute[key] = min(brute.get(key, float('inf')), cost)
+
+    plans = model.solve_windows_kbest(costs, durations, 1000, deferral_costs=deferral)
+    assert [cost for cost, _ in plans] == pytest.approx(sorted(brute.values()))
+    assert len({frozenset((t, L) for t, L in zip(starts, durations) if t is not None)
+                for _, starts in plans}) == len(plans)
+    assert plans[0][0] == pytest.approx(model.solve_windows_dp(costs, durations, deferral_costs=deferral)[0])
+
+
+def test_alternatives_from_dp_and_milp_cuts_agree(monkeypatch):
+    optimizer = MaintenanceOptimizer(ELEC, LABOR, [2, 1, 3], verbose=False)
+    optimizer.build_model()
+    assert optimizer.solve()
+    solution = (list(optimizer.solution_starts), optimizer.objective_value)
+    alternatives = optimizer.get_alternatives(5)
+    assert [a['rank'] for a in alternatives] == [1, 2, 3, 4, 5]
+    assert alternatives[0]['total_cost'] == pytest.approx(optimizer.objective_value)
+    for alternative in alternatives:
+        assert alternative['total_cost'] == pytest.approx(optimizer.plan_cost(alternative['starts']))
+
+    monkeypatch.setattr(model, "DP_MAX_TABLE_SIZE", 1)
+    with_cuts = optimizer.get_alternatives(5)
+    assert [a['total_cost'] for a in with_cuts] == pytest.approx([a['total_cost'] for a in alternatives])
+    assert (optimizer.solution_starts, optimizer.objective_value) == solution
+    assert not any(name.startswith("alternative_cut") for name in optimizer.model.constraints)
+
+
+def test_price_sensitivity_matches_re_solving_with_shifted_prices():
+    durations = [2, 1, 3]
+    optimizer = MaintenanceOptimizer(ELEC, LABOR, durations, engine="dp", verbose=False)
+    optimizer.build_model()
+    assert optimizer.solve()
+    report = optimizer.price_sensitivity()
+    assert len(report) == len(ELEC)
+
+    def cost_of_plan_after(slot, delta):
+        prices = dict(ELEC)
+        prices[slot] += delta
+        return solve(durations, elec=prices, engine="dp")['total_cost']
+
+    for row in report:
+        if row['in_plan']:
+            delta = row['increase']
+            # Below the threshold the plan pays the whole increase; above it, it moves
+            assert cost_of_plan_after(row['slot'], delta - 1e-3) == pytest.approx(optimizer.objective_value + delta - 1e-3)
+            assert cost_of_plan_after(row['slot'], delta + 1e-3) == pytest.approx(optimizer.objective_value + delta)
+        elif row['decrease'] is not None:
+            delta = row['decrease']
+            assert cost_of_plan_after(row['slot'], -delta + 1e-3) == pytest.approx(optimizer.objective_value)
+            assert cost_of_plan_after(row['slot'], -delta - 1e-3) < optimizer.objective_value - 1e-4
+
+
+def test_window_cost_table_matches_slot_sums():
+    elec = [ELEC[t] for t in range(len(ELEC))]
+    labor = [LABOR[t] for t in range(len(LABOR))]
+    table = WindowCostTable(elec, labor, [1, 3, 12, 13])
+    for start in range(len(elec) - 2):
+        elec_cost, labor_cost, total = table.breakdown(start, 3)
+        assert abs(elec_cost - sum(elec[start:start + 3])) < 1e-9
+        assert abs(labor_cost - sum(labor[start:start + 3])) < 1e-9
+        assert abs(total - elec_cost - labor_cost) < 1e-9
+    assert len(table.total[12]) == 1
+    assert len(table.total[13]) == 0
+
+
+def test_event_costs_add_up_to_total():
+    results = solve([2, 1, 3])
+    assert abs(sum(e['total_cost'] for e in results['events']) - results['total_cost']) < 1e-9
+    assert abs(results['total_electricity_cost'] + results['total_labor_cost']
+               - results['total_cost']) < 1e-9
+
+
+def test_session_skips_solve_when_optimum_cannot_change():
+    session = MaintenanceSession(ELEC, LABOR, [2, 1])
+    results = session.get_results()
+    used = {t for t, events in results['combined_schedule'].items() if events}
+    unused = min(set(ELEC) - used)
+
+    # Raising an unused slot cannot make another plan cheaper
+    prices = dict(ELEC)
+    prices[unused] += 1.0
+    update = session.update(electricity_prices=prices, forecast_run_id="run-1")
+    assert update['changed_slots'] == [unused]
+    assert not update['reoptimized']
+    assert abs(session.get_results()['total_cost'] - results['total_cost']) < 1e-9
+    assert session.get_results()['forecast_run_id'] == "run-1"
+
+
+def test_session_reoptimizes_to_fresh_optimum():
+    session = MaintenanceSession(ELEC, LABOR, [2, 1])
+    used = [t for t, events in session.get_results()['combined_schedule'].items() if events]
+    prices = dict(ELEC)
+    prices[used[0]] += 1.0
+    update = session.update(electricity_prices=prices)
+    assert update['reoptimized']
+    assert abs(session.get_results()['total_cost'] - solve([2, 1], elec=prices)['total_cost']) < 1e-9
+    # The default session backend takes MIP starts when one is installed
+    assert session.solver == get_backend(warm_start=True).name
+    assert session.optimizer.metrics()['solver']['warm_start'] == get_backend(session.solver).supports_warm_start
+
+
+def test_price_update_after_cache_hit_solves_again():
+    cache = ResultCache()
+    elec, labor = [1.0, 0.5, 0.5, 1.0], [0.0] * 4
+    first = MaintenanceOptimizer(elec, labor, [2], cache=cache, verbose=False)
+    first.build_model()
+    assert first.solve()
+
+    optimizer = MaintenanceOptimizer(elec, labor, [2], cache=cache, verbose=False)
+    optimizer.build_model()
+    assert optimizer.solve() and optimizer.from_cache
+    assert optimizer.solution_starts == [1]
+    assert optimizer.update_prices([1.0, 0.5, 50.0, 50.0])['resolve_needed']
+    assert optimizer.solve(warm_start=True)
+    assert optimizer.solution_starts == [0]
+    assert optimizer.objective_value == pytest.approx(1.5)
+
+
+def test_price_update_skips_solve_only_for_optimal_plans():
+    optimizer = MaintenanceOptimizer(ELEC, LABOR, [2, 1], verbose=False)
+    optimizer.build_model()
+    assert optimizer.solve()
+    used = [t for t, events in optimizer.get_results()['combined_schedule'].items() if events]
+    prices = dict(ELEC)
+    prices[used[0]] -= 0.01
+    assert not optimizer.update_prices(prices)['resolve_needed']
+    results = optimizer.get_results()
+    assert results['objective_bound'] == pytest.approx(results['total_cost'])
+    assert results['mip_gap'] == 0.0
+
+    # An incumbent of a stopped search is re-solved even for a change that cannot help other plans
+    incumbent = MaintenanceOptimizer(ELEC, LABOR, [2, 1], verbose=False)
+    incumbent.build_model()
+    assert incumbent.solve(solver=StoppedSearchBackend(), time_limit=1)
+    prices = dict(ELEC)
+    prices[used[0]] -= 0.01
+    assert incumbent.update_prices(prices)['resolve_needed']
+
+
+def test_prices_from_forecast_orders_by_start():
+    forecast = {
+        "forecast_run_id": "run-0",
+        "prices": [
+            {"start": "2025-05-27T02:00:00Z", "price": 70.8},
+            {"start": "2025-05-27T01:00:00Z", "price": 70.4},
+        ],
+    }
+    assert prices_from_forecast(forecast) == {0: 70.4, 1: 70.8}
+
+
+def test_deferred_events_are_reported():
+    optimizer = MaintenanceOptimizer(ELEC, LABOR, [2, 1], deferral_costs=[0.0, None])
+    optimizer.build_model()
+    assert optimizer.solve(verbose=False)
+    results = optimizer.get_results()
+    assert results['deferred_events'] == [0]
+    assert 'start_time' in results['events'][1]
+
+
+def test_rolling_horizon_plan_is_feasible_and_bounded_by_full_optimum():
+    elec = {t: ELEC[t % 12] + 0.01 * (t // 12) for t in range(48)}
+    labor = {t: LABOR[t % 12] for t in range(48)}
+    durations = [2, 1, 3, 1]
+    for engine in ("dp", "milp"):
+        results = solve_rolling_horizon(elec, labor, durations, window=12, step=6, engine=engine)
+        occupied = [t for t, events in results['combined_schedule'].items() if events]
+        assert len(occupied) == sum(durations)
+        assert all(len(results['combined_schedule'][t]) == 1 for t in occupied)
+        rolling = results['rolling_horizon']
+        assert abs(rolling['full_horizon_cost'] - solve(durations, elec, labor)['total_cost']) < 1e-9
+        assert rolling['gap'] >= -1e-9
+
+
+def test_identical_events_share_variables_and_are_reported_per_event():
+    durations = [2, 1, 3, 1, 1]
+    grouped = MaintenanceOptimizer(ELEC, LABOR, durations)
+    grouped.build_model()
+    assert grouped.groups == [[0], [1, 3, 4], [2]]
+    assert grouped.solve(verbose=False)
+    results = grouped.get_results()
+    assert [e['duration'] for e in results['events']] == durations
+    assert abs(results['total_cost'] - brute_force_cost(ELEC, LABOR, durations)) < 1e-6
+
+    separate = MaintenanceOptimizer(ELEC, LABOR, durations, symmetry_breaking=False)
+    separate.build_model()
+    assert separate.solve(verbose=False)
+    assert len(grouped.model.variables()) < len(separate.model.variables())
+    assert abs(separate.get_results()['total_cost'] - results['total_cost']) < 1e-9
+
+
+def test_identical_deferrable_events_can_be_partly_deferred():
+    optimizer = MaintenanceOptimizer(ELEC, LABOR, [1, 1, 1], deferral_costs=[0.45, 0.45, 0.45])
+    optimizer.build_model()
+    assert optimizer.solve(verbose=False)
+    assert optimizer.get_results()['deferred_events'] == []
+    # Only slots 11 (0.22) and 10 (0.26) are cheaper than deferring at 0.27
+    optimizer = MaintenanceOptimizer(ELEC, LABOR, [1, 1, 1], deferral_costs=[0.27, 0.27, 0.27])
+    optimizer.build_model()
+    assert optimizer.solve(verbose=False)
+    assert optimizer.get_results()['deferred_events'] == [2]
+
+
+def test_optimize_batch_keeps_order_and_isolates_failures():
+    requests = [
+        {'electricity_prices': {str(t): p for t, p in ELEC.items()}, 'labor_costs': LABOR,
+         'maintenance_durations': [2, 1]},
+        {'electricity_prices': ELEC, 'labor_costs': LABOR, 'maintenance_durations': [6, 7]},
+        {'electricity_prices': ELEC, 'labor_costs': LABOR, 'maintenance_durations': [3],
+         'solver': 'no-such-solver'},
+        {'electricity_prices': ELEC, 'labor_costs': LABOR, 'maintenance_durations': [3], 'engine': 'dp'},
+    ]
+    try:
+        results = optimize_batch(requests, workers=2)
+    finally:
+        shutdown_batch_pool()
+    assert [r['status'] for r in results] == ['success', 'failed', 'failed', 'success']
+    assert abs(results[0]['results']['total_cost'] - solve([2, 1])['total_cost']) < 1e-9
+    assert abs(results[3]['results']['total_cost'] - solve([3])['total_cost']) < 1e-9
+    inline = optimize_batch(requests, workers=0)
+    assert [r.get('results') for r in results] == [r.get('results') for r in inline]
+
+
+if __name__ == "__main__":
+    test_sliding_window_links_start_and_active_slots()
+    test_matches_brute_force_optimum()
+    test_dp_engine_matches_milp()
+    test_dp_engine_reports_infeasible_horizon()
+    test_solver_backends_agree()
+    test_window_cost_table_matches_slot_sums()
+    test_event_costs_add_up_to_total()
+    test_session_skips_solve_when_optimum_cannot_change()
+    test_session_reoptimizes_to_fresh_optimum()
+    test_prices_from_forecast_orders_by_start()
+    test_deferred_events_are_reported()
+    test_rolling_horizon_plan_is_feasible_and_bounded_by_full_optimum()
+    test_identical_events_share_variables_and_are_reported_per_event()
+    test_identical_deferrable_events_can_be_partly_deferred()
+    test_optimize_batch_keeps_order_and_isolates_failures()
+    print("✓ All model tests passed!")
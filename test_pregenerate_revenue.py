@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Regression tests for the control-room dataset generator (docs/control-room/scripts/pregenerate_revenue.py)
+"""
+
+import hashlib
+import importlib.util
+import os
+import random
+from collections import defaultdict
+
+import numpy as np
+import pytest
+
+SCRIPT = os.path.join(os.path.dirname(__file__), 'docs', 'control-room', 'scripts', 'pregenerate_revenue.py')
+spec = importlib.util.spec_from_file_location('pregenerate_revenue', SCRIPT)
+gen = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(gen)
+
+# sha256 of the files the original one-shot script wrote for the default week
+BASELINE_SHA256 = {
+    'P-001': '7285c0149f935ed83cb40b1fb437ff8c032002145ae8d82d767d023150f5e897',
+    'P-002': '2a8e55e1dc210f1c232a5ed917a81473a8fd476c854fd4dd2d5e33ff7d37d472',
+    'P-003': '6619cd99c7af86dc346a0bce75ede37535b92c2d2eb0091474074f79e695729c',
+    'P-004': '634ab0e217622c7dd1579e1ebccc866fe126af18d7f881e13790c9d582ba89e2',
+}
+
+
+def legacy_rebalance(rows, dt_min=5):
+    """The original per-row rebalancing loop"""
+    dt_h = dt_min / 60.0
+    totals = defaultdict(lambda: {'chg': 0.0, 'dis': 0.0})
+    for r in rows:
+        p = float(r.get('power_kw', 0) or 0)
+        if r.get('mode') == 'DOWNTIME' or p == 0:
+            continue
+        e = p * dt_h
+        if e > 0:
+            totals[r['battery_id']]['dis'] += e
+        elif e < 0:
+            totals[r['battery_id']]['chg'] += (-e)
+    scale = {bid: {'pos': 1.0, 'neg': 1.0} for bid in totals}
+    for bid, t in totals.items():
+        chg, dis = t['chg'], t['dis']
+        if dis > chg and dis > 0:
+            scale[bid]['pos'] = max(chg / dis, 0.0)
+        elif chg > dis and chg > 0:
+            scale[bid]['neg'] = max(dis / chg, 0.0)
+    out = []
+    for r in rows:
+        p = float(r.get('power_kw', 0) or 0)
+        if r.get('mode') != 'DOWNTIME' and p != 0:
+            s = scale.get(r['battery_id'], {'pos': 1.0, 'neg': 1.0})
+            r = dict(r, power_kw=int(round(p * (s['pos'] if p > 0 else s['neg']))))
+        out.append(r)
+    return out
+
+
+@pytest.mark.parametrize('stream', [False, True])
+def test_default_week_matches_the_original_script(tmp_path, stream):
+    for project_id, digest in BASELINE_SHA256.items():
+        path, _ = gen.generate_project(project_id, stream=stream, out_dir=str(tmp_path))
+        with open(path, 'rb') as f:
+            assert hashlib.sha256(f.read()).hexdigest() == digest, project_id
+
+
+def test_rebalancing_matches_the_per_row_loop():
+    rng = random.Random(3)
+    rows = []
+    for i in range(3000):
+        mode = rng.choice(['CHARGE', 'DISCHARGE', 'IDLE', 'DOWNTIME'])
+        # Half-integer scaled values exercise the half-to-even rounding of round()
+        power = rng.choice([0, None, rng.randint(-5000, 5000), rng.randint(-20, 20) + 0.5])
+        rows.append({'battery_id': f'B{rng.randint(1, 4)}', 'ts': str(i), 'mode': mode, 'power_kw': power})
+    rows.append({'battery_id': 'B9', 'ts': 'x', 'mode': 'DISCHARGE', 'power_kw': 7})  # discharge only
+
+    expected = legacy_rebalance([dict(r) for r in rows])
+    assert gen._rebalance_energy([dict(r) for r in rows]) == expected
+
+    streamed = gen.StreamedRows(lambda: (dict(r) for r in rows), chunk_size=97)
+    assert [r for chunk in streamed.chunks() for r in chunk] == expected
+    assert len(streamed) == len(rows)
+
+
+def test_counter_noise_is_pinned_and_independent_of_the_window():
+    noise = gen.CounterNoise()
+    # Fixed values: counter noise must not change across runs, machines or releases
+    assert noise.uniform('P001:B1', [0, 3600, 1757894400], gen.HOUR_FMT).tolist() == [
+        0.4104502683461011, 0.32071530347748567, 0.6527981805333728]
+    assert noise.uniform('P001:B1', [1757894400], gen.DAY_FMT, ':hiccup').tolist() == [0.13562616243316983]
+    assert noise.rand01('P001:B1:ep0') == 0.6623735204513592
+
+    # Overlapping windows draw the same value for the same (stream, timestamp)
+    first = gen.periods(gen.parse_utc('2025-09-15T00:00:00Z'), gen.parse_utc('2025-09-18T00:00:00Z'), gen.HOUR_S)
+    second = gen.periods(gen.parse_utc('2025-09-16T12:30:00Z'), gen.parse_utc('2025-09-20T00:00:00Z'), gen.HOUR_S)
+    shared, i, j = np.intersect1d(first, second, return_indices=True)
+    assert len(shared) == 36
+    assert np.array_equal(noise.uniform('P001:B1', first, gen.HOUR_FMT)[i],
+                          noise.uniform('P001:B1', second, gen.HOUR_FMT)[j])
+
+    week = gen.gen_week('2025-09-15T00:00:00Z', '2025-09-18T00:00:00Z', gen.bat1, gen.price1, gen.pred1,
+                        gen.actual1, noise=noise)
+    shifted = gen.gen_week('2025-09-16T00:00:00Z', '2025-09-20T00:00:00Z', gen.bat1, gen.price1, gen.pred1,
+                           gen.actual1, noise=noise)
+    assert week['price'][96:] == shifted['price'][:96 * 2]
+    assert week['noise'] == 'counter'
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Tests for the revenue-loss engine, ported from the docs/revenue-loss-v2 app.test.js fixtures
+"""
+
+import json
+import os
+
+import numpy as np
+import pytest
+
+import revenue_loss as rl
+from revenue_loss import comparison_from_records, parse_timestamps
+
+SAMPLE_DIR = os.path.join(os.path.dirname(__file__), 'docs', 'revenue-loss-v2', 'files')
+
+
+def ms(ts):
+    return int(parse_timestamps([ts])[0])
+
+
+def intervals(start, end):
+    return rl.discretization_intervals(ms(start), ms(end))
+
+
+def test_discretization_intervals():
+    result = intervals('2024-01-01T10:00:00Z', '2024-01-01T10:15:00Z')
+    assert [rl.format_timestamp(t) for t in result] == [
+        '2024-01-01T10:00:00.000Z', '2024-01-01T10:05:00.000Z', '2024-01-01T10:10:00.000Z']
+
+
+def test_price_data_upsampled_to_intervals():
+    prices = [
+        {'ts': '2024-01-01T10:00:00Z', 'price_eur_mwh': 50, 'interval_min': 15},
+        {'ts': '2024-01-01T10:15:00Z', 'price_eur_mwh': 60, 'interval_min': 15},
+        {'ts': '2024-01-01T10:30:00Z', 'price_eur_mwh': 100, 'interval_min': 20},
+    ]
+    result = rl.standardize_price_data(prices, intervals('2024-01-01T10:00:00Z', '2024-01-01T10:50:00Z'))
+    assert result.tolist() == [50] * 3 + [60] * 3 + [100] * 4
+    # Intervals no price record covers have no price
+    assert np.isnan(rl.standardize_price_data(prices[:1], intervals('2024-01-01T10:00:00Z',
+                                                                    '2024-01-01T10:20:00Z'))[3])
+
+
+def test_schedule_blocks_exploded():
+    schedule = [{'battery_id': 'b-001', 'start_ts': '2024-01-01T10:00:00Z', 'end_ts': '2024-01-01T10:50:00Z',
+                 'mode': 'CHARGE', 'power_kw': -1000}]
+    result = rl.standardize_predicted_schedule(schedule, intervals('2024-01-01T10:00:00Z', '2024-01-01T10:50:00Z'))
+    assert list(result) == ['b-001']
+    assert result['b-001']['scheduled'].all()
+    assert set(result['b-001']['mode']) == {'CHARGE'}
+    assert result['b-001']['power_kw'].tolist() == [-1000] * 10
+
+
+def test_actual_events_averaged_per_interval():
+    events = [
+        {'battery_id': 'b-001', 'ts': '2024-01-01T10:01:00Z', 'mode': 'CHARGE', 'power_kw': -900, 'soc_pct': 45},
+        {'battery_id': 'b-001', 'ts': '2024-01-01T10:03:00Z', 'mode': 'CHARGE', 'power_kw': -1100, 'soc_pct': 46},
+    ]
+    result = rl.standardize_actual_events(events, intervals('2024-01-01T10:00:00Z', '2024-01-01T10:10:00Z'))
+    actual = result['b-001']
+    assert actual['power_kw'].tolist() == [-1000, 0]
+    assert actual['mode'].tolist() == ['CHARGE', 'DOWNTIME']
+    assert actual['soc_pct'][0] == 46  # latest event
+    assert np.isnan(actual['soc_pct'][1])
+
+
+def test_null_power_counts_as_zero():
+    """app.js adds null event power as 0 (still dividing by every event) and null * x is 0"""
+    raw = {
+        'batteryMeta': [{'battery_id': 'b-001', 'power_kw': 1000, 'capacity_kwh': 2000}],
+        'priceData': [{'ts': '2024-01-01T10:00:00Z', 'price_eur_mwh': 150, 'interval_min': 5}],
+        'predictedSchedule': [{'battery_id': 'b-001', 'start_ts': '2024-01-01T10:00:00Z',
+                               'end_ts': '2024-01-01T10:05:00Z', 'mode': 'DISCHARGE', 'power_kw': 1000}],
+        'actualEvents': [{'battery_id': 'b-001', 'ts': f'2024-01-01T10:0{minute}:00Z', 'mode': 'DISCHARGE',
+                          'power_kw': power, 'soc_pct': 80} for minute, power in ((1, None), (2, 900), (3, 800))],
+    }
+    comparison = rl.analyze(raw)['revenue_analysis']['comparison']
+    assert comparison['act_power_kw'][0] == pytest.approx(1700 / 3)
+    assert round(comparison['rev_act_eur'][0], 2) == 7.08
+    assert round(comparison['revenue_loss_eur'][0], 2) == 5.42
+
+    # A null predicted power earns nothing, so the loss is minus the actual revenue
+    raw['predictedSchedule'][0]['power_kw'] = None
+    analysis = rl.analyze(raw)['revenue_analysis']
+    assert (analysis['comparison']['pred_energy_kwh'][0], analysis['comparison']['rev_pred_eur'][0]) == (0, 0)
+    assert round(analysis['summary']['totalRevenueLoss'], 2) == -7.08
+
+
+def test_analysis_time_range():
+    raw = {
+        'priceData': [{'ts': '2024-01-01T10:00:00Z', 'price_eur_mwh': 50, 'interval_min': 15},
+                      {'ts': '2024-01-01T11:00:00Z', 'price_eur_mwh': 60, 'interval_min': 15}],
+        'predictedSchedule': [{'battery_id': 'b-001', 'start_ts': '2024-01-01T09:30:00Z',
+                               'end_ts': '2024-01-01T10:30:00Z', 'mode': 'CHARGE', 'power_kw': -500}],
+        'actualEvents': [{'battery_id': 'b-001', 'ts': '2024-01-01T09:45:00Z', 'mode': 'CHARGE',
+                          'power_kw': -450, 'soc_pct': 50}],
+    }
+    start, end = rl.determine_analysis_time_range(raw)
+    assert rl.format_timestamp(start) == '2024-01-01T09:30:00.000Z'
+    assert rl.format_timestamp(end) == '2024-01-01T11:15:00.000Z'
+    # Converted columns give the same range
+    assert rl.determine_analysis_time_range(rl.to_columns(raw)) == (start, end)
+
+
+def test_standardize_input_data_requires_all_inputs():
+    with pytest.raises(ValueError, match="Battery metadata"):
+        rl.standardize_input_data({'priceData': [], 'predictedSchedule': [], 'actualEvents': []}, 0, 0)
+
+
+def test_energy_and_revenue():
+    assert rl.calculate_energy(1000) == 1000 * (5 / 60)
+    assert rl.calculate_energy(600, 10) == 600 * (10 / 60)
+    assert rl.calculate_revenue(100, 50) == 5
+
+
+def test_revenue_analysis_comparison():
+    raw = {
+        'batteryMeta': [{'battery_id': 'b-001', 'power_kw': 1000, 'capacity_kwh': 2000}],
+        'priceData': [{'ts': '2024-01-01T10:00:00Z', 'price_eur_mwh': 100, 'interval_min': 5}],
+        'predictedSchedule': [{'battery_id': 'b-001', 'start_ts': '2024-01-01T10:00:00Z',
+                               'end_ts': '2024-01-01T10:05:00Z', 'mode': 'DISCHARGE', 'power_kw': 1000}],
+        'actualEvents': [{'battery_id': 'b-001', 'ts': '2024-01-01T10:00:00Z', 'mode': 'DISCHARGE',
+                          'power_kw': 900, 'soc_pct': 80}],
+    }
+    analysis = rl.analyze(raw)['revenue_analysis']
+    comparison = analysis['comparison']
+    assert comparison['battery_id'].tolist() == ['b-001']
+    assert comparison['pred_power_kw'][0] == 1000
+    assert comparison['act_power_kw'][0] == 900
+    assert round(comparison['rev_pred_eur'][0], 2) == 8.33
+    assert comparison['rev_act_eur'][0] == 7.5
+    assert round(comparison['revenue_loss_eur'][0], 2) == 0.83
+    assert round(analysis['summary']['totalPredictedRevenue'], 2) == 8.33
+    assert analysis['summary']['totalActualRevenue'] == 7.5
+    assert round(analysis['summary']['totalRevenueLoss'], 2) == 0.83
+
+
+def test_downtime_and_deviation_loss():
+    comparison = comparison_from_records([
+        {'battery_id': 'b-001', 'act_mode': 'DISCHARGE', 'rev_pred_eur': 10, 'rev_act_eur': 8},
+        {'battery_id': 'b-001', 'act_mode': 'DOWNTIME', 'rev_pred_eur': 5, 'rev_act_eur': 0},
+        {'battery_id': 'b-001', 'act_mode': 'DOWNTIME', 'rev_pred_eur': 3, 'rev_act_eur': 0},
+    ])
+    assert rl.calculate_downtime_loss(comparison) == 8
+    assert rl.calculate_deviation_loss(10, 6) == 4
+
+
+def test_utilization():
+    comparison = comparison_from_records([
+        {'battery_id': 'b-001', 'act_energy_kwh': 50},
+        {'battery_id': 'b-001', 'act_energy_kwh': -25},
+        {'battery_id': 'b-002', 'act_energy_kwh': 100},
+    ])
+    meta = [{'battery_id': 'b-001', 'power_kw': 1000, 'capacity_kwh': 2000},
+            {'battery_id': 'b-002', 'power_kw': 1500, 'capacity_kwh': 3000}]
+    utilization = rl.calculate_utilization(comparison, meta, 1)
+    assert utilization['b-001']['total_actual_energy_dispatched_kwh'] == 75
+    assert utilization['b-001']['potential_energy_throughput_kwh'] == 1000
+    assert utilization['b-001']['utilization_percent'] == 7.5
+    assert round(utilization['b-002']['utilization_percent'], 2) == 6.67
+
+
+def test_availability_metrics():
+    time_based = rl.calculate_time_based_availability(comparison_from_records(
+        [{'battery_id': 'b-001', 'act_mode': mode} for mode in ('DISCHARGE', 'DOWNTIME', 'CHARGE', 'DOWNTIME')]
+        + [{'battery_id': 'b-002', 'act_mode': 'DISCHARGE'}] * 2))
+    assert (time_based['b-001']['downtime_slices'], time_based['b-001']['a_time_percent']) == (2, 50)
+    assert (time_based['b-002']['total_slices'], time_based['b-002']['a_time_percent']) == (2, 100)
+
+    meta = [{'battery_id': 'b-001', 'power_kw': 1000, 'capacity_kwh': 2000}]
+    value_based = rl.calculate_value_based_availability(comparison_from_records([
+        {'battery_id': 'b-001', 'pred_power_kw': 1000, 'act_power_kw': 800},
+        {'battery_id': 'b-001', 'pred_power_kw': 30, 'act_power_kw': 0},  # below P_min: not instructed
+        {'battery_id': 'b-001', 'pred_power_kw': -600, 'act_power_kw': -600},
+    ]), meta, 5)['b-001']
+    assert (value_based['instructed_slices'], value_based['non_instructed_slices']) == (2, 1)
+    assert value_based['p_min_kw'] == 50
+    assert value_based['a_dispatch_percent'] == 90
+
+    price_weighted = rl.calculate_price_weighted_availability(comparison_from_records([
+        {'battery_id': 'b-001', 'pred_power_kw': 1000, 'act_power_kw': 800, 'price_eur_mwh': 100},
+        {'battery_id': 'b-001', 'pred_power_kw': 1000, 'act_power_kw': 1000, 'price_eur_mwh': 50},
+    ]), meta, 5)['b-001']
+    assert price_weighted['total_weight'] == 150000
+    assert round(price_weighted['a_econ_percent'], 1) == 86.7
+
+
+def test_headroom_cost_only_when_sla_met():
+    comparison = comparison_from_records([
+        {'battery_id': 'b-001', 'act_mode': 'DISCHARGE', 'rev_pred_eur': 10, 'rev_act_eur': 8},
+        {'battery_id': 'b-001', 'act_mode': 'DISCHARGE', 'rev_pred_eur': 5, 'rev_act_eur': 6},
+        {'battery_id': 'b-001', 'act_mode': 'DOWNTIME', 'rev_pred_eur': 3, 'rev_act_eur': 0},
+    ])
+    missed = rl.calculate_headroom_cost(comparison, {'b-001': {'a_time_percent': 66.67}}, 95)['b-001']
+    assert (missed['headroom_cost_eur'], missed['qualifying_slices'], missed['sla_met']) == (0, 0, False)
+    met = rl.calculate_headroom_cost(comparison, {'b-001': {'a_time_percent': 100}}, 95)['b-001']
+    assert (met['headroom_cost_eur'], met['qualifying_slices'], met['sla_met']) == (1, 2, True)
+
+
+def test_key_metrics():
+    analysis = {
+        'comparison': comparison_from_records([
+            {'battery_id': 'b-001', 'act_mode': 'DISCHARGE', 'act_energy_kwh': 50, 'pred_power_kw': 1000,
+             'act_power_kw': 800, 'price_eur_mwh': 100, 'rev_pred_eur': 10, 'rev_act_eur': 8,
+             'revenue_loss_eur': 2},
+            {'battery_id': 'b-001', 'act_mode': 'DOWNTIME', 'act_energy_kwh': 0, 'pred_power_kw': 1000,
+             'act_power_kw': 0, 'price_eur_mwh': 80, 'rev_pred_eur': 5, 'rev_act_eur': 0,
+             'revenue_loss_eur': 5},
+        ]),
+        'summary': {'totalRevenueLoss': 7},
+    }
+    meta = [{'battery_id': 'b-001', 'power_kw': 1000, 'capacity_kwh': 2000}]
+    metrics = rl.calculate_key_metrics(analysis, meta, ms('2024-01-01T10:00:00Z'), ms('2024-01-01T10:10:00Z'))
+
+    loss = metrics['revenueLoss']
+    assert (loss['total_loss_eur'], loss['downtime_loss_eur'], loss['deviation_loss_eur']) == (7, 5, 2)
+    assert round(loss['downtime_loss_percent'], 1) == 71.4
+    assert metrics['utilization']['by_battery']['b-001']['total_actual_energy_dispatched_kwh'] == 50
+    assert metrics['availability']['time_based']['overall_a_time_percent'] == 50
+    assert set(metrics['availability']) == {'time_based', 'value_based', 'price_weighted', 'headroom_cost'}
+    assert round(metrics['analysisMetadata']['analysis_duration_hours'], 2) == 0.17
+    assert metrics['analysisMetadata']['total_intervals'] == 2
+    assert metrics['analysisMetadata']['batteries_analyzed'] == 1
+
+
+def test_sample_files_match_app():
+    """Totals app.js reports for the bundled sample files"""
+    result = rl.analyze(rl.load_input_files(SAMPLE_DIR))
+    summary = result['revenue_analysis']['summary']
+    assert summary['totalPredictedRevenue'] == pytest.approx(184.3555, abs=1e-9)
+    assert summary['totalActualRevenue'] == pytest.approx(49.1651875, abs=1e-9)
+    assert summary['totalRevenueLoss'] == pytest.approx(135.1903125, abs=1e-9)
+    assert len(result['revenue_analysis']['comparison']['battery_id']) == 1152
+
+
+def test_cli_prints_key_metrics(capsys):
+    assert rl.main([SAMPLE_DIR]) == 0
+    output = json.loads(capsys.readouterr().out)
+    assert set(output) == {'summary', 'revenueLoss', 'utilization', 'availability', 'analysisMetadata'}
+    assert output['analysisMetadata']['batteries_analyzed'] == 2
+
+
+def test_schedule_index_matches_linear_scan():
+    """First block in record order covering ts wins, like the generator's old scan over every block"""
+    rng = np.random.default_rng(7)
+    base = ms('2024-01-01T00:00:00Z')
+    blocks = []
+    for _ in range(60):
+        start = int(rng.integers(0, 48)) * 15
+        length = int(rng.integers(-30, 240))  # some blocks end before they start and never match
+        blocks.append({'battery_id': f"b-{rng.integers(3)}", 'mode': 'CHARGE', 'power_kw': 1,
+                       'start_ts': rl.format_timestamp(base + start * rl.MINUTE_MS),
+                       'end_ts': rl.format_timestamp(base + (start + length) * rl.MINUTE_MS)})
+    index = rl.ScheduleIndex(blocks)
+    times = base + np.arange(0, 16 * 60, 5) * rl.MINUTE_MS
+    for battery_id in ('b-0', 'b-1', 'b-2', 'b-9'):
+        expected = [next((row for row, b in enumerate(blocks) if b['battery_id'] == battery_id
+                          and ms(b['start_ts']) <= t < ms(b['end_ts'])), -1) for t in times.tolist()]
+        assert [index.lookup(battery_id, t) for t in times.tolist()] == expected
+        assert index.lookup_many(battery_id, times).tolist() == expected